@@ -0,0 +1,40 @@
+"""Donation status
+
+Revision ID: 1b9f6c2d8e40
+Revises:
+Create Date: 2026-10-17 07:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1b9f6c2d8e40"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by create_all since the model declared the column
+    # already have it.
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("donations")}
+    if "status" in columns:
+        return
+    op.add_column(
+        "donations",
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+    )
+    # Donations recorded before statuses existed were credited when they
+    # completed; marking them pending would credit them again.
+    op.execute("UPDATE donations SET status = 'completed'")
+    op.create_index("ix_donations_status", "donations", ["status"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("donations") as batch:
+        batch.drop_index("ix_donations_status")
+        batch.drop_column("status")
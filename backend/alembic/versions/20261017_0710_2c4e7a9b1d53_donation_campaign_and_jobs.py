@@ -0,0 +1,59 @@
+"""Donation campaign and job queue table
+
+Revision ID: 2c4e7a9b1d53
+Revises: 1b9f6c2d8e40
+Create Date: 2026-10-17 07:10:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "2c4e7a9b1d53"
+down_revision: Union[str, None] = "1b9f6c2d8e40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tables() -> set:
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def _columns(table: str) -> set:
+    return {column["name"] for column in sa.inspect(op.get_bind()).get_columns(table)}
+
+
+def upgrade() -> None:
+    # Databases created by create_all since the models declared these
+    # already have them, so only what is missing is added.
+    if "campaign_id" not in _columns("donations"):
+        op.add_column("donations", sa.Column("campaign_id", sa.Integer(), nullable=True))
+        op.create_index("ix_donations_campaign_id", "donations", ["campaign_id"])
+
+    if "jobs" not in _tables():
+        op.create_table(
+            "jobs",
+            sa.Column("id", sa.Integer(), primary_key=True),
+            sa.Column("queue", sa.String(), nullable=False),
+            sa.Column("payload", sa.Text(), nullable=False),
+            sa.Column("status", sa.String(), nullable=False),
+            sa.Column("attempts", sa.Integer(), nullable=False),
+            sa.Column("last_error", sa.Text(), nullable=True),
+            sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+            sa.Column("finished_at", sa.DateTime(timezone=True), nullable=True),
+        )
+        op.create_index("ix_jobs_id", "jobs", ["id"])
+        op.create_index("ix_jobs_queue", "jobs", ["queue"])
+        op.create_index("ix_jobs_status", "jobs", ["status"])
+
+
+def downgrade() -> None:
+    op.drop_table("jobs")
+
+    with op.batch_alter_table("donations") as batch:
+        batch.drop_index("ix_donations_campaign_id")
+        batch.drop_column("campaign_id")
@@ -0,0 +1,44 @@
+"""Job priority, scheduling and visibility timeout
+
+Revision ID: 3d8a5f1c6e92
+Revises: 2c4e7a9b1d53
+Create Date: 2026-10-17 07:20:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3d8a5f1c6e92"
+down_revision: Union[str, None] = "2c4e7a9b1d53"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by create_all since the model declared these
+    # already have them.
+    columns = {column["name"] for column in sa.inspect(op.get_bind()).get_columns("jobs")}
+    if "run_at" in columns:
+        return
+    # SQLite cannot add a column defaulting to the current time in place
+    with op.batch_alter_table("jobs") as batch:
+        batch.add_column(sa.Column("priority", sa.Integer(), nullable=False, server_default="0"))
+        batch.add_column(sa.Column("max_attempts", sa.Integer(), nullable=False, server_default="5"))
+        batch.add_column(
+            sa.Column("run_at", sa.DateTime(), nullable=False, server_default=sa.func.now())
+        )
+        batch.add_column(sa.Column("locked_by", sa.String(), nullable=True))
+        batch.add_column(sa.Column("locked_until", sa.DateTime(), nullable=True))
+        batch.add_column(sa.Column("started_at", sa.DateTime(), nullable=True))
+        batch.create_index("ix_jobs_claim", ["queue", "status", "run_at", "priority"])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("jobs") as batch:
+        batch.drop_index("ix_jobs_claim")
+        for column in ("started_at", "locked_until", "locked_by", "run_at", "max_attempts", "priority"):
+            batch.drop_column(column)
@@ -0,0 +1,51 @@
+"""Campaigns table
+
+Revision ID: 4e1b7c3a9f05
+Revises: 3d8a5f1c6e92
+Create Date: 2026-10-17 07:30:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "4e1b7c3a9f05"
+down_revision: Union[str, None] = "3d8a5f1c6e92"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Campaign was declared on a base no schema was created from, so only
+    # databases created by create_all since then have the table.
+    if "campaigns" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "campaigns",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("cover_image", sa.String(), nullable=True),
+        sa.Column("media_urls", sa.String(), nullable=True),
+        sa.Column("goal_amount", sa.Float(), nullable=False),
+        sa.Column("current_amount", sa.Float(), nullable=True),
+        sa.Column("start_date", sa.DateTime(), nullable=False),
+        sa.Column("end_date", sa.DateTime(), nullable=True),
+        sa.Column("is_active", sa.Boolean(), nullable=True),
+        sa.Column("offers_nft", sa.Boolean(), nullable=True),
+        sa.Column("nft_details", sa.String(), nullable=True),
+        sa.Column("governance_token", sa.Boolean(), nullable=True),
+        sa.Column("token_details", sa.String(), nullable=True),
+        sa.Column("npo_id", sa.String(), sa.ForeignKey("npos.id"), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_campaigns_id", "campaigns", ["id"])
+    op.create_index("ix_campaigns_title", "campaigns", ["title"])
+
+
+def downgrade() -> None:
+    op.drop_table("campaigns")
@@ -0,0 +1,35 @@
+"""Sharded counters table
+
+Revision ID: 5f3c9d2e7b18
+Revises: 4e1b7c3a9f05
+Create Date: 2026-10-17 07:40:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5f3c9d2e7b18"
+down_revision: Union[str, None] = "4e1b7c3a9f05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by create_all since the model was declared already have it
+    if "counter_shards" in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        "counter_shards",
+        sa.Column("owner_type", sa.String(), primary_key=True),
+        sa.Column("owner_id", sa.String(), primary_key=True),
+        sa.Column("shard", sa.Integer(), primary_key=True),
+        sa.Column("value", sa.Float(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("counter_shards")
@@ -0,0 +1,46 @@
+"""Campaign stats and donor tables
+
+Revision ID: 6a2d8e4f1c37
+Revises: 5f3c9d2e7b18
+Create Date: 2026-10-17 07:50:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6a2d8e4f1c37"
+down_revision: Union[str, None] = "5f3c9d2e7b18"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created by create_all since the models were declared already have them
+    tables = set(sa.inspect(op.get_bind()).get_table_names())
+    if "campaign_stats" not in tables:
+        op.create_table(
+            "campaign_stats",
+            sa.Column("campaign_id", sa.Integer(), primary_key=True),
+            sa.Column("total_donations", sa.Integer(), nullable=False),
+            sa.Column("completed_donations", sa.Integer(), nullable=False),
+            sa.Column("total_donors", sa.Integer(), nullable=False),
+            sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if "campaign_donors" not in tables:
+        op.create_table(
+            "campaign_donors",
+            sa.Column("campaign_id", sa.Integer(), primary_key=True),
+            sa.Column("donor_id", sa.String(), primary_key=True),
+            sa.Column("donations", sa.Integer(), nullable=False),
+        )
+    # Existing donations are counted by python -m app.db.rebuild_campaign_stats
+
+
+def downgrade() -> None:
+    op.drop_table("campaign_donors")
+    op.drop_table("campaign_stats")
@@ -0,0 +1,62 @@
+"""Composite and partial indexes for donation and campaign queries
+
+Revision ID: 5c2e8a41d7f3
+Revises: 6a2d8e4f1c37
+Create Date: 2026-10-17 09:00:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c2e8a41d7f3"
+down_revision: Union[str, None] = "6a2d8e4f1c37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PENDING_LEDGER = sa.text("status = 'pending' AND transaction_hash IS NOT NULL")
+
+# name, table, columns, extra create_index arguments
+INDEXES = [
+    ("ix_donations_created_at_id", "donations", ["created_at", "id"], {}),
+    ("ix_donations_npo_created_at_id", "donations", ["npo_id", "created_at", "id"], {}),
+    ("ix_donations_campaign_created_at_id", "donations", ["campaign_id", "created_at", "id"], {}),
+    ("ix_donations_donor_created_at_id", "donations", ["donor_id", "created_at", "id"], {}),
+    (
+        "ix_donations_pending_tx_hash",
+        "donations",
+        ["id", "transaction_hash"],
+        {"postgresql_where": PENDING_LEDGER, "sqlite_where": PENDING_LEDGER},
+    ),
+    ("ix_users_created_at_id", "users", ["created_at", "id"], {}),
+    ("ix_npos_created_at_id", "npos", ["created_at", "id"], {}),
+    ("ix_campaigns_created_at_id", "campaigns", ["created_at", "id"], {}),
+    ("ix_campaigns_npo_created_at_id", "campaigns", ["npo_id", "created_at", "id"], {}),
+    ("ix_campaigns_end_date_start_date", "campaigns", ["end_date", "start_date"], {}),
+    (
+        "ix_campaigns_active_end_date",
+        "campaigns",
+        ["end_date"],
+        {"postgresql_where": sa.text("is_active"), "sqlite_where": sa.text("is_active = 1")},
+    ),
+]
+
+
+def upgrade() -> None:
+    # Build the indexes without locking out writes on large tables. Databases
+    # created by create_all since the models declared them already have them.
+    with op.get_context().autocommit_block():
+        for name, table, columns, kwargs in INDEXES:
+            op.create_index(
+                name, table, columns,
+                if_not_exists=True, postgresql_concurrently=True, **kwargs,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
@@ -0,0 +1,38 @@
+"""Store SQLite created_at timestamps with microseconds
+
+Revision ID: 7c4f2a6d9e11
+Revises: 5c2e8a41d7f3
+Create Date: 2026-10-17 09:10:00.000000+00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c4f2a6d9e11"
+down_revision: Union[str, None] = "5c2e8a41d7f3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Tables paged by keyset cursors on (created_at, id)
+TABLES = ["donations", "npos", "users"]
+
+
+def upgrade() -> None:
+    # SQLite compares timestamps as text. CURRENT_TIMESTAMP defaults stored
+    # 'YYYY-MM-DD HH:MM:SS', which sorts before the cursor SQLAlchemy binds
+    # for the same second ('... HH:MM:SS.000000'), so pages repeated.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    for table in TABLES:
+        op.execute(
+            f"UPDATE {table} SET created_at = created_at || '.000000' "
+            "WHERE length(created_at) = 19"
+        )
+
+
+def downgrade() -> None:
+    # The longer format is what the models write; nothing to undo.
+    pass
@@ -1,25 +1,34 @@
-from typing import Any, List
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api import deps
-from app.services import npo_service, user_service
+from app.api.pagination import PageParams
+from app.database.session import SessionLocal
+from app.services import campaign_service, counter_service, export_service, npo_service, user_service
+from app.workers.reconciliation import reconciliation_worker
 
 router = APIRouter()
 
 @router.get("/npos/pending", response_model=List[schemas.NPO])
 def get_pending_npos(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: PageParams = Depends(),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Get a list of non-profit organizations pending verification.
     """
-    npos = npo_service.get_npos(db, skip=skip, limit=limit, verified_only=False)
+    npos = npo_service.get_npos(
+        db, skip=page.skip, cursor=page.cursor, limit=page.limit, verified_only=False
+    )
+    # The cursor follows the unfiltered page, so no pending NPO is skipped
+    page.set_next_cursor(response, npos)
     return [npo for npo in npos if not npo.is_verified]
 
 @router.post("/npos/{npo_id}/verify", response_model=schemas.NPO)
@@ -89,4 +98,82 @@ def deactivate_user(
         db_obj=user,
         obj_in={"is_active": False}
     )
-    return user 
\ No newline at end of file
+    return user 
+
+@router.get("/reconciliation/stats", response_model=Dict[str, Any])
+def get_reconciliation_stats(
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Get throughput counters of the pending donation reconciliation worker.
+    """
+    return reconciliation_worker.stats.as_dict()
+
+@router.put("/campaigns/{campaign_id}/sharded-counters", response_model=Dict[str, Any])
+def set_campaign_sharded_counters(
+    campaign_id: int,
+    enabled: bool,
+    db: Session = Depends(deps.get_db),
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Switch a hot campaign's totals to sharded counters, or back.
+    """
+    campaign = campaign_service.get_campaign(db, id=campaign_id)
+    if not campaign:
+        raise HTTPException(
+            status_code=404,
+            detail="Campaign not found",
+        )
+    
+    if enabled:
+        counter_service.enable_sharding(db, campaign=campaign)
+    else:
+        counter_service.disable_sharding(db, campaign=campaign)
+    return {"campaign_id": campaign_id, "sharded_counters": enabled}
+
+EXPORT_FORMATS = {
+    "csv": ("text/csv", export_service.iter_csv),
+    "ndjson": ("application/x-ndjson", export_service.iter_ndjson),
+}
+
+@router.get("/donations/export", response_class=StreamingResponse)
+def export_donations(
+    request: Request,
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    npo_id: Optional[str] = None,
+    campaign_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    current_user: models.User = Depends(deps.get_current_active_superuser),
+) -> Any:
+    """
+    Stream every matching donation as CSV or NDJSON, oldest first.
+    
+    The file is written while rows are read from the database, so memory
+    use does not grow with the export. Clients sending
+    ``Accept-Encoding: gzip`` get it gzip-compressed on the fly.
+    """
+    media_type, encode = EXPORT_FORMATS[format]
+    compress = "gzip" in request.headers.get("accept-encoding", "")
+
+    def content() -> Iterator[Any]:
+        # The export outlives the request's dependencies, so it owns its session
+        db = SessionLocal()
+        try:
+            rows = export_service.iter_donation_rows(
+                db, npo_id=npo_id, campaign_id=campaign_id, start=start, end=end
+            )
+            chunks = encode(rows)
+            yield from export_service.gzip_chunks(chunks) if compress else chunks
+        finally:
+            db.close()
+
+    filename = f"donations-{datetime.utcnow():%Y%m%dT%H%M%S}.{format}"
+    headers = {
+        "Content-Disposition": f'attachment; filename="{filename}"',
+        "Vary": "Accept-Encoding",
+    }
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(content(), media_type=media_type, headers=headers)
@@ -1,51 +1,66 @@
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, Body, Depends, HTTPException, status, Query, Response
+from pydantic import ValidationError
+from fastapi.responses import JSONResponse
 from sqlalchemy.orm import Session
 
 from app import schemas
 from app.api import deps
+from app.api.pagination import PageParams
+from app.core.config import settings
 from app.services import donation_service, blockchain_service
+from app.services.aio import donations, npos, run_sync
+from app.models.donation import Donation
 from app.models.user import User
+from app.workers.donation_submitter import enqueue_donation_submission
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[schemas.Donation])
 def list_donations(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: PageParams = Depends(),
     campaign_id: Optional[int] = None,
     npo_id: Optional[int] = None,
     current_user: User = Depends(deps.get_current_user),
 ):
     """
-    Retrieve donations.
+    Retrieve donations, newest first.
     """
     if current_user.is_admin:
         # Admin can see all donations
-        return donation_service.get_donations(
-            db, skip=skip, limit=limit, campaign_id=campaign_id, npo_id=npo_id
+        items = donation_service.get_donations(
+            db, skip=page.skip, cursor=page.cursor, limit=page.limit,
+            campaign_id=campaign_id, npo_id=npo_id
         )
     else:
         # Regular users can only see their own donations
-        return donation_service.get_user_donations(
-            db, user_id=current_user.id, skip=skip, limit=limit,
+        items = donation_service.get_user_donations(
+            db, user_id=current_user.id, skip=page.skip, cursor=page.cursor, limit=page.limit,
             campaign_id=campaign_id, npo_id=npo_id
         )
+    page.set_next_cursor(response, items)
+    return items
 
 
 @router.post("/initiate", response_model=schemas.DonationCreate)
 async def initiate_donation(
     donation_in: schemas.DonationCreate,
-    db: Session = Depends(deps.get_db),
+    db: Any = Depends(deps.get_service_db),
     current_user: User = Depends(deps.get_current_active_user),
+    async_mode: bool = Query(False, alias="async"),
 ):
     """
     Initiate a new donation transaction.
+    
+    With ``?async=true`` the ledger submission is queued and the request
+    returns 202 with a status URL instead of waiting for the ledger.
     """
     # Validate the campaign and NPO
-    campaign = donation_service.get_campaign(db, donation_in.campaign_id)
+    campaign = await donations.get_campaign(db, donation_in.campaign_id)
     if not campaign:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -58,13 +73,36 @@ async def initiate_donation(
             detail="Campaign is not active",
         )
     
+    queued = async_mode and settings.ASYNC_DONATIONS_ENABLED
+    
     # Prepare the donation transaction
-    donation = donation_service.create_donation(
+    donation = await donations.create_donation(
         db, 
         obj_in=donation_in, 
-        donor_id=current_user.id if not donation_in.is_anonymous else None
+        donor_id=current_user.id if not donation_in.is_anonymous else None,
+        commit=not queued,
     )
     
+    # Settle out of band: the submission worker picks the job up. Enqueuing
+    # commits the donation with its job, so neither is stored without the other.
+    if queued:
+        donation_id = donation.id
+        await run_sync(
+            db,
+            enqueue_donation_submission,
+            donation_id=donation_id,
+            from_address=current_user.xrpl_address,
+            to_address=campaign.npo.xrpl_address,
+            amount=donation_in.amount,
+            use_escrow=donation_in.use_escrow,
+        )
+        status_url = f"{settings.API_V1_STR}/donations/{donation_id}/status"
+        return JSONResponse(
+            status_code=status.HTTP_202_ACCEPTED,
+            content={"donation_id": donation_id, "status": "pending", "status_url": status_url},
+            headers={"Location": status_url},
+        )
+    
     # Initiate the blockchain transaction
     try:
         tx_result = await blockchain_service.initiate_xrp_payment(
@@ -80,26 +118,84 @@ async def initiate_donation(
             escrow_id=tx_result.get("escrow_id"),
             status="pending"
         )
-        return donation_service.update_donation(db, db_obj=donation, obj_in=donation_update)
+        return await donations.update_donation(db, db_obj=donation, obj_in=donation_update)
     except Exception as e:
         # Delete the donation if transaction fails
-        donation_service.delete_donation(db, id=donation.id)
+        await donations.delete_donation(db, id=donation.id)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to initiate donation: {str(e)}",
         )
 
 
+@router.post("/import", response_model=schemas.DonationImportResult)
+def import_donations(
+    rows: List[Dict[str, Any]] = Body(...),
+    db: Session = Depends(deps.get_db),
+    current_user: User = Depends(deps.get_current_active_superuser),
+):
+    """
+    Import a batch of offline or partner donations.
+    
+    Every row is validated on its own: invalid rows are reported by their
+    position in the batch and the rest are still imported.
+    """
+    if len(rows) > settings.DONATION_IMPORT_MAX_ROWS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.DONATION_IMPORT_MAX_ROWS} donations per import",
+        )
+    
+    valid, positions, errors = [], [], []
+    for index, row in enumerate(rows):
+        try:
+            valid.append(schemas.DonationImportRow.model_validate(row).model_dump())
+            positions.append(index)
+        except ValidationError as e:
+            errors.append({"index": index, "error": str(e)})
+    
+    result = donation_service.import_donations(db, rows=valid)
+    errors.extend(
+        {"index": positions[error["index"]], "error": error["error"]}
+        for error in result["errors"]
+    )
+    errors.sort(key=lambda error: error["index"])
+    return {"created": len(result["ids"]), "ids": result["ids"], "errors": errors}
+
+
+def _can_view(user: User, donation: Donation) -> bool:
+    """
+    Whether a user may see a donation: admins, the donor and the owner of the
+    receiving NPO may, and anyone may see anonymous donations.
+    """
+    return (
+        user.is_admin
+        or donation.donor_id is None
+        or donation.donor_id == user.id
+        or (user.owned_npo is not None and donation.npo_id == user.owned_npo.id)
+    )
+
+
+async def _is_watched(db: Any, donation: Donation) -> bool:
+    """Whether the live ledger subscription covers the NPO receiving a donation."""
+    if not blockchain_service.ledger_subscriptions.connected.is_set():
+        return False
+    npo = await npos.get_npo(db, id=donation.npo_id)
+    return npo is not None and blockchain_service.ledger_subscriptions.is_subscribed(
+        npo.xrpl_address
+    )
+
+
 @router.get("/{donation_id}", response_model=schemas.Donation)
-def get_donation(
+async def get_donation(
     donation_id: int,
-    db: Session = Depends(deps.get_db),
+    db: Any = Depends(deps.get_service_db),
     current_user: User = Depends(deps.get_current_active_user),
 ):
     """
     Get donation by ID.
     """
-    donation = donation_service.get_donation(db, id=donation_id)
+    donation = await donations.get_donation(db, id=donation_id)
     if not donation:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -107,22 +203,60 @@ def get_donation(
         )
     
     # Check if the user has permission to view this donation
-    if not current_user.is_admin and (
-        (donation.donor_id is not None and donation.donor_id != current_user.id) and
-        (current_user.owned_npo is None or donation.npo_id != current_user.owned_npo.id)
-    ):
+    if not _can_view(current_user, donation):
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not enough permissions to access this donation",
         )
     
-    # Check blockchain status
-    if donation.tx_hash and donation.status == "pending":
-        tx_status = blockchain_service.check_transaction_status(donation.tx_hash)
+    # Check blockchain status, unless the ledger subscription already keeps it current
+    if donation.tx_hash and donation.status == "pending" and not await _is_watched(db, donation):
+        tx_status = await blockchain_service.check_transaction_status(donation.tx_hash)
         if tx_status != donation.status:
-            donation_update = schemas.DonationUpdate(status=tx_status)
-            if tx_status == "completed":
-                donation_update.completed_at = datetime.utcnow()
-            donation = donation_service.update_donation(db, db_obj=donation, obj_in=donation_update)
+            donation = await donations.resolve_donation(
+                db, donation_id=donation.id, status=tx_status
+            ) or donation
+    
+    return donation 
+
+
+@router.get("/{donation_id}/status", response_model=Dict[str, Any])
+async def get_donation_status(
+    donation_id: int,
+    db: Any = Depends(deps.get_service_db),
+    current_user: User = Depends(deps.get_current_active_user),
+    wait: float = Query(0, ge=0, le=30),
+):
+    """
+    Get the settlement status of a donation.
+    
+    Pass ``wait`` to long-poll for up to that many seconds until the
+    donation leaves the pending state.
+    """
+    donation = await donations.get_donation(db, id=donation_id)
+    if not donation:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Donation not found",
+        )
+    
+    if not _can_view(current_user, donation):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions to access this donation",
+        )
+    
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while donation.status == "pending" and loop.time() < deadline:
+        # End the read transaction so the connection goes back to the pool while waiting
+        await run_sync(db, Session.rollback)
+        await asyncio.sleep(min(0.5, deadline - loop.time()))
+        donation = await donations.refresh_donation(db, donation=donation)
     
-    return donation 
\ No newline at end of file
+    return {
+        "donation_id": donation.id,
+        "status": donation.status,
+        "tx_hash": donation.tx_hash,
+        "submitted": donation.tx_hash is not None,
+    }
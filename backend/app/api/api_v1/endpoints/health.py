@@ -1,9 +1,17 @@
-from typing import Dict
+from typing import Any, Dict
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from app.api import deps
-from app.database.session import get_db
+from app.core.cache import cache
+from app.core import logging as app_logging
+from app.core.config import settings
+from app.database.async_session import get_async_engine_if_started
+from app.database.pool import get_pool_metrics
+from app.database.session import engine, get_db
+from app.models.user import User
+from app.services import job_service
+from app.workers.runtime import job_worker
 
 router = APIRouter()
 
@@ -21,4 +29,60 @@ def health_check(db: Session = Depends(get_db)) -> Dict[str, str]:
         db.execute(text("SELECT 1"))
         return {"status": "healthy"}
     except Exception as e:
-        return {"status": "unhealthy", "error": str(e)} 
\ No newline at end of file
+        return {"status": "unhealthy", "error": str(e)}
+
+
+@router.get("/health/queues", response_model=Dict[str, Any])
+def queue_health(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Dict[str, Any]:
+    """
+    Job queue metrics.
+
+    Returns depth and lag of every queue from the database, plus the
+    processing counters of the worker running in this process, if any.
+    """
+    return {
+        "queues": job_service.get_queue_metrics(db),
+        "worker": job_worker.metrics() if settings.JOB_WORKERS_IN_API else None,
+    }
+
+
+@router.get("/health/db-pool", response_model=Dict[str, Any])
+def pool_health(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Dict[str, Any]:
+    """
+    Connection pool telemetry.
+
+    Reports in-use and idle connections, overflow and checkout wait
+    histograms of the sync engine and, once it is in use, the async engine.
+    """
+    pools = {"sync": get_pool_metrics(engine.pool)}
+    async_engine = get_async_engine_if_started()
+    if async_engine is not None:
+        pools["async"] = get_pool_metrics(async_engine.pool)
+    return pools
+
+
+@router.get("/health/cache", response_model=Dict[str, Any])
+def cache_health(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Dict[str, Any]:
+    """
+    Hit/miss counters of the NPO and campaign lookup cache.
+    """
+    return cache.metrics()
+
+
+@router.get("/health/logging", response_model=Dict[str, Any])
+def logging_health(
+    current_user: User = Depends(deps.get_current_active_superuser),
+) -> Dict[str, Any]:
+    """
+    Queue depth and dropped records of the background log writer.
+    """
+    if app_logging.log_sink is None:
+        return {"background": False}
+    return {"background": True, **app_logging.log_sink.metrics()}
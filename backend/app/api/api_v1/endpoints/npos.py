@@ -1,28 +1,35 @@
 from typing import List, Any, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, File, UploadFile
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status, File, UploadFile, Request, Response
 from sqlalchemy.orm import Session
 
 from app import schemas
-from app.api import deps
-from app.services import npo_service
+from app.api import deps, http_cache
+from app.api.pagination import PageParams
+from app.services import blockchain_service, campaign_stats_service, npo_service
 from app.models.user import User
+from app.workers.tasks import enqueue_proof_upload
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[schemas.NPO])
 def read_npos(
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: PageParams = Depends(),
 ) -> Any:
     """
     Retrieve non-profit organizations.
     """
     npos = npo_service.get_npos(
-        db, skip=skip, limit=limit, verified_only=True
+        db, skip=page.skip, cursor=page.cursor, limit=page.limit, verified_only=True
     )
-    return npos
+    page.set_next_cursor(response, npos)
+    not_modified = http_cache.conditional_response(
+        request, response, npos, cache_control=http_cache.PUBLIC_LISTING
+    )
+    return not_modified or npos
 
 
 @router.post("/", response_model=schemas.NPO)
@@ -30,6 +37,7 @@ def create_npo(
     *,
     db: Session = Depends(deps.get_db),
     npo_in: schemas.NPOCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(deps.get_current_active_superuser),
 ):
     """
@@ -49,8 +57,10 @@ def create_npo(
             detail="Non-profit organization with this name already exists",
         )
     
-    # Create the NPO
-    return npo_service.create_npo(db, obj_in=npo_in, owner_id=current_user.id)
+    # Create the NPO and watch its address for donations
+    npo = npo_service.create_npo(db, obj_in=npo_in, owner_id=current_user.id)
+    background_tasks.add_task(blockchain_service.watch_account, npo.xrpl_address)
+    return npo
 
 
 @router.get("/{npo_id}", response_model=schemas.NPO)
@@ -78,6 +88,7 @@ def update_npo(
     db: Session = Depends(deps.get_db),
     npo_id: int,
     npo_in: schemas.NPOUpdate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(deps.get_current_active_superuser),
 ):
     """
@@ -101,7 +112,9 @@ def update_npo(
     if not current_user.is_admin and npo_in.is_verified is not None:
         npo_in.is_verified = npo.is_verified
     
-    return npo_service.update_npo(db, db_obj=npo, obj_in=npo_in)
+    npo = npo_service.update_npo(db, db_obj=npo, obj_in=npo_in)
+    background_tasks.add_task(blockchain_service.watch_account, npo.xrpl_address)
+    return npo
 
 
 @router.post("/{npo_id}/proof", response_model=schemas.NPO)
@@ -129,8 +142,8 @@ def submit_proof(
             detail="Not enough permissions to submit proof for this non-profit organization",
         )
     
-    # Upload proof file to S3
-    proof_url = npo_service.upload_proof_file(proof_file, npo_id)
+    # Spool the proof file and queue its upload to S3
+    proof_url = enqueue_proof_upload(db, proof_file=proof_file, npo_id=npo_id)
     
     # Update NPO with proof information
     return npo_service.add_proof(db, npo=npo, description=proof_description, url=proof_url)
@@ -139,9 +152,10 @@ def submit_proof(
 @router.get("/{npo_id}/campaigns", response_model=List[schemas.Campaign])
 def get_npo_campaigns(
     npo_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: PageParams = Depends(),
     active_only: bool = True,
 ):
     """
@@ -154,9 +168,17 @@ def get_npo_campaigns(
             detail="Non-profit organization not found",
         )
     
-    return npo_service.get_npo_campaigns(
-        db, npo_id=npo_id, skip=skip, limit=limit, active_only=active_only
+    campaigns = npo_service.get_npo_campaigns(
+        db, npo_id=npo_id, skip=page.skip, cursor=page.cursor, limit=page.limit,
+        active_only=active_only
+    )
+    page.set_next_cursor(response, campaigns)
+    not_modified = http_cache.conditional_response(
+        request, response, campaigns,
+        cache_control=http_cache.PUBLIC_LISTING,
+        extra=campaign_stats_service.STATS_ATTRIBUTES,
     )
+    return not_modified or campaigns
 
 
 @router.delete("/{npo_id}", response_model=schemas.NPO)
@@ -1,12 +1,13 @@
 from typing import Any, List
 
-from fastapi import APIRouter, Body, Depends, HTTPException
+from fastapi import APIRouter, Body, Depends, HTTPException, Response
 from fastapi.encoders import jsonable_encoder
 from pydantic import EmailStr
 from sqlalchemy.orm import Session
 
 from app import models, schemas
 from app.api import deps
+from app.api.pagination import PageParams
 from app.core.config import settings
 from app.services import user_service
 
@@ -14,15 +15,16 @@ router = APIRouter()
 
 @router.get("/", response_model=List[schemas.User])
 def read_users(
+    response: Response,
     db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
+    page: PageParams = Depends(),
     current_user: models.User = Depends(deps.get_current_active_superuser),
 ) -> Any:
     """
     Retrieve users.
     """
-    users = user_service.get_users(db, skip=skip, limit=limit)
+    users = user_service.get_users(db, skip=page.skip, cursor=page.cursor, limit=page.limit)
+    page.set_next_cursor(response, users)
     return users
 
 @router.post("/", response_model=schemas.User)
@@ -1,30 +1,28 @@
 from datetime import datetime, timedelta
 from typing import Annotated
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from sqlalchemy.orm import Session
 import uuid
 
+from app.core.concurrency import ConcurrencyLimiter, ConcurrencyLimitExceeded
 from app.core.config import settings
+from app.core.logging import set_log_user
+from app.core.hashing import password_hasher
+from app.core.security import identity_claims
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.user import UserCreate, UserResponse, Token, TokenData
+from app.services import user_service
 
 router = APIRouter()
 
-pwd_context = CryptContext(
-    schemes=["bcrypt"],
-    deprecated="auto"
-)
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password: str) -> str:
-    return pwd_context.hash(password)
+# Logins are expensive (bcrypt), so cap how many one client or account runs at once
+login_ip_limiter = ConcurrencyLimiter(settings.LOGIN_MAX_CONCURRENT_PER_IP)
+login_account_limiter = ConcurrencyLimiter(settings.LOGIN_MAX_CONCURRENT_PER_ACCOUNT)
 
 def create_access_token(data: dict, expires_delta: timedelta | None = None) -> str:
     to_encode = data.copy()
@@ -54,9 +52,13 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
-    user = db.query(User).filter(User.email == token_data.email).first()
-    if user is None:
-        raise credentials_exception
+    if settings.STATELESS_AUTH and "uid" in payload:
+        user = user_service.user_from_claims(db, claims=payload)
+    else:
+        user = user_service.get_identity(db, subject=token_data.email, token=token, by_email=True)
+        if user is None:
+            raise credentials_exception
+    set_log_user(user.id)
     return user
 
 @router.post("/signup", response_model=Token)
@@ -74,7 +76,7 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
         id=str(uuid.uuid4()),
         email=user_data.email,
         full_name=user_data.full_name,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await password_hasher.hash(user_data.password),
         is_nonprofit=user_data.is_nonprofit
     )
     db.add(new_user)
@@ -84,28 +86,44 @@ async def signup(user_data: UserCreate, db: Session = Depends(get_db)):
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": new_user.email}, expires_delta=access_token_expires
+        data={"sub": new_user.email, **identity_claims(new_user)},
+        expires_delta=access_token_expires,
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/login", response_model=Token)
 async def login(
+    request: Request,
     form_data: Annotated[OAuth2PasswordRequestForm, Depends()],
     db: Session = Depends(get_db)
 ):
-    # Authenticate user
-    user = db.query(User).filter(User.email == form_data.username).first()
-    if not user or not verify_password(form_data.password, user.hashed_password):
+    client_ip = request.client.host if request.client else "unknown"
+    try:
+        with login_ip_limiter.hold(client_ip), login_account_limiter.hold(form_data.username.lower()):
+            # Authenticate user
+            user = db.query(User).filter(User.email == form_data.username).first()
+            verified = user is not None and await password_hasher.verify(
+                form_data.password, user.hashed_password
+            )
+    except ConcurrencyLimitExceeded:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many concurrent login attempts",
+            headers={"Retry-After": "1"},
+        )
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    user_service.schedule_rehash(user, form_data.password)
 
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
+        data={"sub": user.email, **identity_claims(user)},
+        expires_delta=access_token_expires,
     )
     return {"access_token": access_token, "token_type": "bearer"}
 
@@ -7,8 +7,10 @@ from pydantic import ValidationError
 from sqlalchemy.orm import Session
 
 from app.database.session import get_db
+from app.database.async_session import get_async_db
 from app.core import security
 from app.core.config import settings
+from app.core.logging import set_log_user
 from app.services import user_service
 from app.models.user import User
 
@@ -16,12 +18,18 @@ oauth2_scheme = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login"
 )
 
+# Session for the ``app.services.aio`` services: async when ASYNC_DB_ENABLED, sync otherwise
+get_service_db = get_async_db if settings.ASYNC_DB_ENABLED else get_db
+
 
 def get_current_user(
     db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> User:
     """
     Validate token and return current user.
+
+    The user comes from the identity cache, or from the token's claims for
+    tokens issued with STATELESS_AUTH.
     """
     try:
         payload = jwt.decode(
@@ -41,12 +49,16 @@ def get_current_user(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    user = user_service.get_user(db, id=user_id)
-    if user is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="User not found",
-        )
+    if settings.STATELESS_AUTH and "uid" in payload:
+        user = user_service.user_from_claims(db, claims=payload)
+    else:
+        user = user_service.get_identity(db, subject=user_id, token=token)
+        if user is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found",
+            )
+    set_log_user(user.id)
     return user
 
 
@@ -0,0 +1,62 @@
+import hashlib
+from typing import Any, Optional, Sequence
+
+from fastapi import Request, Response, status
+
+from app.core.config import settings
+from app.services.entity_cache import snapshot
+
+# Cache-Control policies per kind of route
+PUBLIC_LISTING = (
+    f"public, max-age={settings.HTTP_CACHE_MAX_AGE}, "
+    f"stale-while-revalidate={settings.HTTP_CACHE_STALE_WHILE_REVALIDATE}"
+)
+
+
+def compute_etag(items: Sequence[Any], extra: Sequence[str] = ()) -> str:
+    """
+    Weak ETag of a list of rows.
+
+    Hashes every column of every row, plus ``extra`` attributes, so any
+    change to what the list shows changes the tag, counters included,
+    without building the response body.
+    """
+    digest = hashlib.sha1()
+    for item in items:
+        digest.update(repr(sorted(snapshot(item, extra).items())).encode())
+        digest.update(b"\n")
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison, as required for If-None-Match
+    tags = [tag.strip() for tag in header.split(",")]
+    return "*" in tags or any(tag.removeprefix("W/") == etag.removeprefix("W/") for tag in tags)
+
+
+def conditional_response(
+    request: Request,
+    response: Response,
+    items: Sequence[Any],
+    *,
+    cache_control: str,
+    extra: Sequence[str] = (),
+) -> Optional[Response]:
+    """
+    Set the ETag and Cache-Control for a list, answering 304 if the client's copy is current.
+
+    There is no Last-Modified: the newest ``updated_at`` of the rows does not
+    move when a row is deleted or drops off the page, or when a counter
+    changes, so If-Modified-Since could answer 304 for a changed list.
+
+    Returns:
+        A 304 response to return instead of the list, or None
+    """
+    etag = compute_etag(items, extra)
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None and _etag_matches(if_none_match, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=dict(response.headers))
+    return None
@@ -0,0 +1,46 @@
+from typing import Any, Optional, Sequence
+
+from fastapi import HTTPException, Query, Response, status
+
+from app.services import pagination
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class PageParams:
+    """
+    Paging query parameters shared by the list endpoints.
+
+    Lists are keyset-paged by default: the first page is requested without
+    a cursor and every page returns the cursor of the next one in the
+    ``X-Next-Cursor`` header, which is absent on the last page. ``skip``
+    switches back to offset paging for older clients.
+    """
+
+    def __init__(
+        self,
+        cursor: Optional[str] = Query(None, description="Cursor from X-Next-Cursor"),
+        skip: Optional[int] = Query(None, ge=0, description="Deprecated offset paging"),
+        limit: int = Query(100, ge=1, le=1000),
+    ):
+        if cursor is not None:
+            try:
+                pagination.decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Invalid cursor",
+                )
+        self.cursor = cursor
+        self.skip = skip
+        self.limit = limit
+
+    def set_next_cursor(self, response: Response, items: Sequence[Any]) -> None:
+        """
+        Advertise the cursor of the next page, if there is one.
+        """
+        if self.skip is not None:
+            return
+        cursor = pagination.next_cursor(items, self.limit)
+        if cursor:
+            response.headers[NEXT_CURSOR_HEADER] = cursor
@@ -0,0 +1,33 @@
+"""
+Rate limit budgets of the API routes.
+"""
+from app.core.config import settings
+from app.core.rate_limit import RateLimitPolicies, RateLimitPolicy, RateLimitRule
+
+API = settings.API_V1_STR
+
+POLICIES = [
+    RateLimitPolicy("default", requests=60, window=60),
+    # Per IP, so one client cannot spread password guesses over many accounts
+    RateLimitPolicy("login", requests=10, window=60, key="ip"),
+    RateLimitPolicy("donations", requests=10, window=60),
+    RateLimitPolicy("browsing", requests=300, window=60),
+]
+
+# Most specific first; the first matching rule wins
+RULES = [
+    RateLimitRule(f"{API}/auth/login", "login", frozenset({"POST"})),
+    RateLimitRule(f"{API}/auth/signup", "login", frozenset({"POST"})),
+    RateLimitRule(f"{API}/users/open", "login", frozenset({"POST"})),
+    RateLimitRule(f"{API}/donations/initiate", "donations", frozenset({"POST"})),
+    # Expensive endpoints use several units of the default budget
+    RateLimitRule(f"{API}/npos/{{npo_id}}/proof", "default", frozenset({"POST"}), cost=10),
+    RateLimitRule(f"{API}/donations/import", "default", frozenset({"POST"}), cost=20),
+    RateLimitRule(f"{API}/admin/donations/export", "default", frozenset({"GET"}), cost=20),
+    RateLimitRule(f"{API}/npos", "browsing", frozenset({"GET", "HEAD"})),
+]
+
+
+def create_policies() -> RateLimitPolicies:
+    """Create the policies of the API."""
+    return RateLimitPolicies(POLICIES, RULES, default="default")
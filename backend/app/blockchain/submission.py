@@ -0,0 +1,385 @@
+import time
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from xrpl.asyncio.clients.async_client import AsyncClient
+from xrpl.models.requests import AccountInfo, Fee, Ledger, SubmitOnly, Tx
+from xrpl.models.transactions import AccountSet
+from xrpl.models.transactions.transaction import Transaction
+from xrpl.transaction import sign
+from xrpl.wallet import Wallet
+
+from app.blockchain.subscriptions import TransactionDispatcher
+
+
+# Submit result classes meaning the transaction did not consume its sequence number
+SEQUENCE_UNUSED_PREFIXES = ("tem", "tef", "tel")
+
+
+class SubmissionException(Exception):
+    """Raised when a transaction cannot be submitted."""
+    pass
+
+
+class SequenceAllocator:
+    """Hands out account sequence numbers locally instead of autofilling per transaction."""
+
+    def __init__(self, client: AsyncClient):
+        """
+        Initialize the allocator.
+
+        Args:
+            client: Async client used to read the account's current sequence
+        """
+        self.client = client
+        self._next: Dict[str, int] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _lock(self, account: str) -> asyncio.Lock:
+        if account not in self._locks:
+            self._locks[account] = asyncio.Lock()
+        return self._locks[account]
+
+    async def _fetch(self, account: str) -> int:
+        """Read the next sequence number from the ledger, including queued transactions."""
+        response = await self.client.request(
+            AccountInfo(account=account, ledger_index="current")
+        )
+        if not response.is_successful():
+            raise SubmissionException(f"Failed to read sequence for {account}")
+        return int(response.result["account_data"]["Sequence"])
+
+    async def reserve(self, account: str) -> int:
+        """Reserve the next sequence number for an account."""
+        async with self._lock(account):
+            if account not in self._next:
+                self._next[account] = await self._fetch(account)
+            sequence = self._next[account]
+            self._next[account] = sequence + 1
+            return sequence
+
+    async def release(self, account: str, sequence: int) -> bool:
+        """
+        Give back a sequence number that was never consumed.
+
+        Only the most recently reserved number can be returned; anything
+        older leaves a gap that has to be filled on the ledger.
+
+        Returns:
+            True if the number was returned to the allocator
+        """
+        async with self._lock(account):
+            if self._next.get(account) == sequence + 1:
+                self._next[account] = sequence
+                return True
+            return False
+
+    async def resync(self, account: str) -> None:
+        """Reload the next sequence number from the ledger."""
+        async with self._lock(account):
+            self._next[account] = await self._fetch(account)
+
+
+class PendingSubmission:
+    """A signed transaction waiting for validation."""
+
+    def __init__(
+        self,
+        transaction: Transaction,
+        wallet: Wallet,
+        signed: Transaction,
+        future: asyncio.Future,
+    ):
+        self.transaction = transaction
+        self.wallet = wallet
+        self.signed = signed
+        self.future = future
+        self.attempts = 1
+        self.submitted_at = datetime.utcnow()
+
+    @property
+    def tx_hash(self) -> str:
+        return self.signed.get_hash()
+
+    @property
+    def account(self) -> str:
+        return self.signed.account
+
+    @property
+    def sequence(self) -> int:
+        return self.signed.sequence
+
+    @property
+    def last_ledger_sequence(self) -> int:
+        return self.signed.last_ledger_sequence
+
+
+class SubmissionPipeline:
+    """
+    Submits many transactions from the same wallet back-to-back.
+
+    Sequence numbers are reserved locally, so a transaction does not wait for
+    the previous one to validate. Validation is tracked in the background.
+    A transaction whose ``LastLedgerSequence`` passes without validation is
+    re-signed and resubmitted with the same sequence; once it runs out of
+    attempts the sequence is filled with a no-op ``AccountSet`` so later
+    transactions from the wallet are not stuck behind the gap.
+
+    Re-signing changes the transaction hash, so ``on_resubmit`` is called
+    with the old and new hash, and ``on_result`` with the final outcome, for
+    callers that track the transaction by hash.
+    """
+
+    def __init__(
+        self,
+        client: AsyncClient,
+        dispatcher: Optional[TransactionDispatcher] = None,
+        ledger_offset: int = 20,
+        max_attempts: int = 3,
+        max_fee_drops: int = 2000,
+        poll_interval: float = 1.0,
+        on_resubmit: Optional[Callable[[str, str], Awaitable[None]]] = None,
+        on_result: Optional[Callable[[Dict[str, Any]], Awaitable[None]]] = None,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            client: Async client connected to the ledger
+            dispatcher: Optional dispatcher checked before polling for validation
+            ledger_offset: Ledgers after the latest validated one before a transaction expires
+            max_attempts: Submissions per transaction before it is abandoned
+            max_fee_drops: Upper bound for the per-transaction fee
+            poll_interval: Seconds between validation checks
+            on_resubmit: Optional callback given the old and new hash of a resubmitted transaction
+            on_result: Optional callback given the result of a validated or abandoned transaction
+        """
+        self.client = client
+        self.dispatcher = dispatcher
+        self.ledger_offset = ledger_offset
+        self.max_attempts = max_attempts
+        self.max_fee_drops = max_fee_drops
+        self.poll_interval = poll_interval
+        self.on_resubmit = on_resubmit
+        self.on_result = on_result
+        self.sequences = SequenceAllocator(client)
+        self.pending: Dict[str, PendingSubmission] = {}
+        self._tracker: Optional[asyncio.Task] = None
+        self._submit_locks: Dict[str, asyncio.Lock] = {}
+        self._cache: Dict[str, Tuple[float, Any]] = {}
+
+    async def _cached(self, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Reuse network values for one poll interval so bursts don't refetch them."""
+        now = time.monotonic()
+        if key in self._cache and now - self._cache[key][0] < self.poll_interval:
+            return self._cache[key][1]
+        value = await loader()
+        self._cache[key] = (now, value)
+        return value
+
+    async def _load_validated_ledger_index(self) -> int:
+        response = await self.client.request(Ledger(ledger_index="validated"))
+        if not response.is_successful():
+            raise SubmissionException("Failed to read the validated ledger index")
+        return int(response.result["ledger_index"])
+
+    async def _load_fee(self) -> str:
+        response = await self.client.request(Fee())
+        if not response.is_successful():
+            raise SubmissionException("Failed to read the network fee")
+        drops = int(response.result["drops"]["open_ledger_fee"])
+        return str(min(drops, self.max_fee_drops))
+
+    async def _validated_ledger_index(self) -> int:
+        return await self._cached("ledger_index", self._load_validated_ledger_index)
+
+    async def _fee(self) -> str:
+        return await self._cached("fee", self._load_fee)
+
+    async def _sign_and_submit(
+        self, transaction: Transaction, wallet: Wallet, sequence: int
+    ) -> Tuple[Transaction, str]:
+        """Sign a transaction with an explicit sequence and submit it without waiting."""
+        fields = transaction.to_dict()
+        fields.update(
+            sequence=sequence,
+            fee=await self._fee(),
+            last_ledger_sequence=await self._validated_ledger_index() + self.ledger_offset,
+        )
+        signed = sign(type(transaction).from_dict(fields), wallet)
+        response = await self.client.request(SubmitOnly(tx_blob=signed.blob()))
+        if not response.is_successful():
+            raise SubmissionException(f"Submission failed: {response.result}")
+        return signed, response.result.get("engine_result", "")
+
+    async def submit(self, transaction: Transaction, wallet: Wallet) -> PendingSubmission:
+        """
+        Sign and submit a transaction, returning as soon as the node accepts it.
+
+        Args:
+            transaction: The unsigned transaction; sequence, fee and
+                LastLedgerSequence are filled in by the pipeline
+            wallet: The wallet signing the transaction
+
+        Returns:
+            The pending submission; await ``wait`` for the validated result
+        """
+        account = wallet.classic_address
+        if account not in self._submit_locks:
+            self._submit_locks[account] = asyncio.Lock()
+
+        # Only the submit round trip is serialized per wallet, so transactions
+        # reach the node in sequence order; validation is not waited for.
+        async with self._submit_locks[account]:
+            sequence = await self.sequences.reserve(account)
+            signed, engine_result = await self._sign_and_submit(transaction, wallet, sequence)
+
+            # Our local view of the sequence was stale; resync and try once more
+            if engine_result == "tefPAST_SEQ":
+                await self.sequences.resync(account)
+                sequence = await self.sequences.reserve(account)
+                signed, engine_result = await self._sign_and_submit(transaction, wallet, sequence)
+
+            if engine_result.startswith(SEQUENCE_UNUSED_PREFIXES):
+                await self._recover_sequence(wallet, sequence)
+                raise SubmissionException(f"Transaction rejected: {engine_result}")
+
+        future = asyncio.get_running_loop().create_future()
+        pending = PendingSubmission(transaction, wallet, signed, future)
+        self.pending[pending.tx_hash] = pending
+        self._ensure_tracker()
+        return pending
+
+    async def wait(self, pending: PendingSubmission, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Wait until a submission is validated or abandoned.
+
+        Returns:
+            Result dictionary with a "completed" or "failed" status
+        """
+        return await asyncio.wait_for(asyncio.shield(pending.future), timeout)
+
+    async def _recover_sequence(self, wallet: Wallet, sequence: int) -> None:
+        """Release an unused sequence, or fill it on the ledger if later ones are in flight."""
+        if await self.sequences.release(wallet.classic_address, sequence):
+            return
+        filler = AccountSet(account=wallet.classic_address)
+        try:
+            signed, engine_result = await self._sign_and_submit(filler, wallet, sequence)
+            logger.info(f"Filled sequence gap {sequence} with {signed.get_hash()} ({engine_result})")
+        except Exception as e:
+            logger.error(f"Failed to fill sequence gap {sequence}: {str(e)}")
+            await self.sequences.resync(wallet.classic_address)
+
+    def _ensure_tracker(self) -> None:
+        if self._tracker is None or self._tracker.done():
+            self._tracker = asyncio.create_task(self._track())
+
+    async def _lookup(self, tx_hash: str) -> Optional[Dict[str, Any]]:
+        """Get the validated result of a transaction, or None if not validated yet."""
+        if self.dispatcher is not None:
+            status = self.dispatcher.get_status(tx_hash)
+            if status is not None:
+                return {"status": status}
+
+        response = await self.client.request(Tx(transaction=tx_hash))
+        if response.is_successful() and response.result.get("validated"):
+            result = response.result["meta"]["TransactionResult"]
+            return {
+                "status": "completed" if result == "tesSUCCESS" else "failed",
+                "result": result,
+                "ledger_index": response.result.get("ledger_index"),
+            }
+        return None
+
+    async def _track(self) -> None:
+        """Poll pending submissions until all of them are validated or abandoned."""
+        while self.pending:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                validated_index = await self._load_validated_ledger_index()
+                for pending in list(self.pending.values()):
+                    await self._check(pending, validated_index)
+            except Exception as e:
+                logger.warning(f"Submission tracking failed: {str(e)}")
+
+    async def _notify(self, callback: Optional[Callable[..., Awaitable[None]]], *args: Any) -> None:
+        if callback is None:
+            return
+        try:
+            await callback(*args)
+        except Exception as e:
+            logger.error(f"Submission callback failed: {str(e)}")
+
+    async def _settle(self, pending: PendingSubmission, outcome: Dict[str, Any]) -> None:
+        outcome.update(
+            tx_hash=pending.tx_hash,
+            sequence=pending.sequence,
+            attempts=pending.attempts,
+        )
+        if not pending.future.done():
+            pending.future.set_result(outcome)
+        await self._notify(self.on_result, outcome)
+
+    async def _resubmit(self, pending: PendingSubmission) -> bool:
+        """Re-sign and resubmit an expired transaction with its sequence; True if it is in flight again."""
+        try:
+            signed, engine_result = await self._sign_and_submit(
+                pending.transaction, pending.wallet, pending.sequence
+            )
+        except Exception as e:
+            logger.warning(f"Resubmission of sequence {pending.sequence} failed: {str(e)}")
+            return False
+        if engine_result.startswith(SEQUENCE_UNUSED_PREFIXES):
+            logger.warning(f"Resubmission of sequence {pending.sequence} rejected: {engine_result}")
+            return False
+
+        previous_hash = pending.tx_hash
+        pending.signed = signed
+        pending.attempts += 1
+        self.pending[pending.tx_hash] = pending
+        await self._notify(self.on_resubmit, previous_hash, pending.tx_hash)
+        return True
+
+    async def _check(self, pending: PendingSubmission, validated_index: int) -> None:
+        outcome = await self._lookup(pending.tx_hash)
+        if outcome is not None:
+            self.pending.pop(pending.tx_hash, None)
+            await self._settle(pending, outcome)
+            return
+
+        if validated_index <= pending.last_ledger_sequence:
+            return
+
+        # LastLedgerSequence has passed: the transaction can never validate
+        self.pending.pop(pending.tx_hash, None)
+        if pending.attempts < self.max_attempts and await self._resubmit(pending):
+            return
+
+        await self._recover_sequence(pending.wallet, pending.sequence)
+        await self._settle(pending, {"status": "failed", "error": "expired"})
+
+    def outstanding(self) -> List[Dict[str, Any]]:
+        """Describe submissions still waiting for validation."""
+        return [
+            {
+                "tx_hash": pending.tx_hash,
+                "account": pending.account,
+                "sequence": pending.sequence,
+                "last_ledger_sequence": pending.last_ledger_sequence,
+                "attempts": pending.attempts,
+            }
+            for pending in self.pending.values()
+        ]
+
+    async def close(self) -> None:
+        """Stop tracking validation."""
+        if self._tracker is not None:
+            self._tracker.cancel()
+            try:
+                await self._tracker
+            except asyncio.CancelledError:
+                pass
+            self._tracker = None
@@ -0,0 +1,353 @@
+import json
+import asyncio
+import inspect
+import itertools
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Union
+
+import websockets
+from loguru import logger
+
+
+TransactionEvent = Dict[str, Any]
+TransactionHandler = Callable[[TransactionEvent], Union[Awaitable[None], None]]
+
+
+def parse_transaction_event(message: Dict[str, Any]) -> Optional[TransactionEvent]:
+    """
+    Normalize a validated transaction from a stream message or ``account_tx`` entry.
+
+    Both the API v1 layout (``transaction``/``tx``) and the v2 layout
+    (``tx_json`` plus a top level ``hash``) are accepted.
+
+    Args:
+        message: The raw message received from the ledger node
+
+    Returns:
+        The normalized event, or None if the transaction is not validated
+    """
+    if not message.get("validated"):
+        return None
+
+    tx = message.get("transaction") or message.get("tx") or message.get("tx_json") or {}
+    tx_hash = message.get("hash") or tx.get("hash")
+    if not tx_hash:
+        return None
+
+    meta = message.get("meta") or message.get("metaData") or {}
+    result = meta.get("TransactionResult") or message.get("engine_result")
+    ledger_index = message.get("ledger_index") or tx.get("ledger_index")
+
+    return {
+        "tx_hash": tx_hash,
+        "status": "completed" if result == "tesSUCCESS" else "failed",
+        "result": result,
+        "ledger_index": ledger_index,
+        "account": tx.get("Account"),
+        "destination": tx.get("Destination"),
+        "transaction": tx,
+    }
+
+
+class TransactionDispatcher:
+    """In-process fan-out of validated transaction events to registered handlers."""
+
+    def __init__(self, max_cached: int = 10000):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            max_cached: Number of resolved transaction statuses to remember
+        """
+        self.max_cached = max_cached
+        self._handlers: List[TransactionHandler] = []
+        self._statuses: "OrderedDict[str, str]" = OrderedDict()
+        self._waiters: Dict[str, List[asyncio.Future]] = {}
+
+    def add_handler(self, handler: TransactionHandler) -> None:
+        """Register a sync or async callable invoked for every new event."""
+        self._handlers.append(handler)
+
+    def get_status(self, tx_hash: str) -> Optional[str]:
+        """Get the final status of a transaction if it has been seen."""
+        return self._statuses.get(tx_hash)
+
+    async def wait_for(self, tx_hash: str, timeout: float) -> Optional[str]:
+        """
+        Wait until a transaction is validated.
+
+        Args:
+            tx_hash: The transaction hash to wait for
+            timeout: Maximum number of seconds to wait
+
+        Returns:
+            The final status, or None if it was not seen in time
+        """
+        status = self.get_status(tx_hash)
+        if status is not None:
+            return status
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(tx_hash, []).append(future)
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters = self._waiters.get(tx_hash, [])
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters:
+                self._waiters.pop(tx_hash, None)
+
+    async def dispatch(self, event: TransactionEvent) -> bool:
+        """
+        Deliver an event to all handlers.
+
+        Events for transactions that were already dispatched are ignored, so
+        overlapping backfill and live stream messages are harmless.
+
+        Returns:
+            True if the event was new and has been dispatched
+        """
+        tx_hash = event["tx_hash"]
+        if tx_hash in self._statuses:
+            return False
+
+        self._statuses[tx_hash] = event["status"]
+        if len(self._statuses) > self.max_cached:
+            self._statuses.popitem(last=False)
+
+        for future in self._waiters.pop(tx_hash, []):
+            if not future.done():
+                future.set_result(event["status"])
+
+        for handler in self._handlers:
+            try:
+                result = handler(event)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                logger.error(f"Transaction handler failed for {tx_hash}: {str(e)}")
+        return True
+
+
+class LedgerSubscriptionService:
+    """
+    Long-lived WebSocket subscription to the ledger for a set of accounts.
+
+    Validated transactions touching the subscribed accounts are pushed into a
+    ``TransactionDispatcher``. The connection is re-established with
+    exponential backoff, and transactions missed while disconnected are
+    backfilled with ``account_tx`` from the last seen ledger index. On the
+    first connection, the last ``initial_backfill_ledgers`` ledgers are
+    replayed instead.
+    """
+
+    def __init__(
+        self,
+        ws_url: str,
+        dispatcher: TransactionDispatcher,
+        accounts: Optional[Iterable[str]] = None,
+        min_backoff: float = 1.0,
+        max_backoff: float = 60.0,
+        request_timeout: float = 10.0,
+        initial_backfill_ledgers: int = 0,
+    ):
+        """
+        Initialize the subscription service.
+
+        Args:
+            ws_url: WebSocket URL of the ledger node
+            dispatcher: Dispatcher receiving validated transaction events
+            accounts: Initial XRPL addresses to subscribe to
+            min_backoff: Initial reconnect delay in seconds
+            max_backoff: Maximum reconnect delay in seconds
+            request_timeout: Timeout for individual WebSocket commands
+            initial_backfill_ledgers: Ledgers replayed when connecting for the first time
+        """
+        self.ws_url = ws_url
+        self.dispatcher = dispatcher
+        self.accounts: Set[str] = set(accounts or [])
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.request_timeout = request_timeout
+        self.initial_backfill_ledgers = initial_backfill_ledgers
+        self.last_ledger_index: Optional[int] = None
+        self.connected = asyncio.Event()
+        self.reconnects = 0
+        self._ws = None
+        self._subscribed: Set[str] = set()
+        self._task: Optional[asyncio.Task] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count(1)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the background connection loop is active."""
+        return self._task is not None and not self._task.done()
+
+    def is_subscribed(self, address: str) -> bool:
+        """Whether validated transactions for an account are being received right now."""
+        return self.connected.is_set() and address in self._subscribed
+
+    async def start(self) -> None:
+        """Start the background connection loop."""
+        if not self.is_running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the background connection loop and close the connection."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected.clear()
+
+    async def add_account(self, address: str) -> None:
+        """Subscribe to an additional account, immediately if connected."""
+        if address in self.accounts:
+            return
+        self.accounts.add(address)
+        # Before that, the session picks the account up while connecting
+        if self.connected.is_set():
+            await self._subscribe([address], self.last_ledger_index)
+
+    async def _run(self) -> None:
+        """Connect, consume messages and reconnect with backoff on failure."""
+        backoff = self.min_backoff
+        while True:
+            try:
+                async with websockets.connect(self.ws_url) as ws:
+                    self._ws = ws
+                    await self._session(ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Ledger subscription dropped: {str(e)}")
+            finally:
+                self._ws = None
+                self._subscribed.clear()
+                self._fail_pending()
+
+            # A session that got as far as subscribing resets the backoff
+            if self.connected.is_set():
+                self.connected.clear()
+                backoff = self.min_backoff
+
+            self.reconnects += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, self.max_backoff)
+
+    async def _session(self, ws) -> None:
+        """Subscribe, backfill missed transactions and consume the stream."""
+        reader = asyncio.create_task(self._read(ws))
+        try:
+            resume_from = self.last_ledger_index
+            accounts = sorted(self.accounts)
+            response = await self._request(
+                {"command": "subscribe", "accounts": accounts, "streams": ["ledger"]}
+            )
+            self._subscribed.update(accounts)
+            current_index = response.get("result", {}).get("ledger_index")
+            if resume_from is None and current_index is not None and self.initial_backfill_ledgers:
+                resume_from = max(current_index - self.initial_backfill_ledgers, 1)
+            if self.last_ledger_index is None:
+                self.last_ledger_index = current_index
+
+            # Replay from the last seen ledger inclusive; the dispatcher
+            # drops anything that was already delivered.
+            if resume_from is not None:
+                for account in accounts:
+                    await self._backfill(account, resume_from)
+
+            # Accounts added while subscribing missed the first request
+            while self.accounts - self._subscribed:
+                await self._subscribe(sorted(self.accounts - self._subscribed), resume_from)
+
+            self.connected.set()
+            await reader
+        finally:
+            reader.cancel()
+
+    async def _subscribe(self, accounts: List[str], resume_from: Optional[int]) -> None:
+        """Subscribe to more accounts and replay their transactions since ``resume_from``."""
+        await self._request({"command": "subscribe", "accounts": accounts})
+        self._subscribed.update(accounts)
+        if resume_from is not None:
+            for account in accounts:
+                await self._backfill(account, resume_from)
+
+    async def _read(self, ws) -> None:
+        """Route command responses to their callers and stream messages to the dispatcher."""
+        async for raw in ws:
+            message = json.loads(raw)
+            if "id" in message and message["id"] in self._pending:
+                future = self._pending.pop(message["id"])
+                if not future.done():
+                    future.set_result(message)
+                continue
+
+            if message.get("type") == "ledgerClosed":
+                self._advance(message.get("ledger_index"))
+            elif message.get("type") == "transaction":
+                event = parse_transaction_event(message)
+                if event is not None:
+                    await self.dispatcher.dispatch(event)
+                    self._advance(event["ledger_index"])
+
+    async def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a command over the WebSocket and wait for its response."""
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        await self._ws.send(json.dumps({"id": request_id, **payload}))
+        try:
+            return await asyncio.wait_for(future, self.request_timeout)
+        finally:
+            self._pending.pop(request_id, None)
+
+    async def _backfill(self, account: str, ledger_index_min: int) -> None:
+        """Replay validated transactions for an account missed while disconnected."""
+        marker = None
+        while True:
+            payload = {
+                "command": "account_tx",
+                "account": account,
+                "ledger_index_min": ledger_index_min,
+                "ledger_index_max": -1,
+                "forward": True,
+            }
+            if marker is not None:
+                payload["marker"] = marker
+            response = await self._request(payload)
+            result = response.get("result", {})
+            for entry in result.get("transactions", []):
+                event = parse_transaction_event(entry)
+                if event is not None:
+                    await self.dispatcher.dispatch(event)
+                    self._advance(event["ledger_index"])
+            marker = result.get("marker")
+            if marker is None:
+                break
+
+    def _advance(self, ledger_index: Optional[int]) -> None:
+        """Move the resume point forward."""
+        if ledger_index is not None and (
+            self.last_ledger_index is None or ledger_index > self.last_ledger_index
+        ):
+            self.last_ledger_index = ledger_index
+
+    def _fail_pending(self) -> None:
+        """Fail outstanding commands when the connection drops."""
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Ledger connection closed"))
+        self._pending.clear()
+
+
+# Singleton dispatcher shared by the subscription service and status lookups
+transaction_dispatcher = TransactionDispatcher()
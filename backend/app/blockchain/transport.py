@@ -0,0 +1,148 @@
+import time
+from json import JSONDecodeError
+from typing import Any, Dict, Optional
+
+import httpx
+from xrpl.asyncio.clients import AsyncJsonRpcClient
+from xrpl.asyncio.clients.exceptions import XRPLRequestFailureException
+from xrpl.asyncio.clients.utils import json_to_response, request_to_json_rpc
+from xrpl.models.requests.request import Request
+from xrpl.models.response import Response
+
+
+class TransportStats:
+    """Counters describing how the pooled transport is being used."""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.in_flight = 0
+        self.connections_opened = 0
+        self.total_latency = 0.0
+
+    @property
+    def connections_reused(self) -> int:
+        """Number of requests served on an already open connection."""
+        return max(self.requests - self.connections_opened, 0)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters as a plain dictionary."""
+        completed = self.requests - self.in_flight
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "in_flight": self.in_flight,
+            "connections_opened": self.connections_opened,
+            "connections_reused": self.connections_reused,
+            "reuse_ratio": (
+                self.connections_reused / self.requests if self.requests else 0.0
+            ),
+            "avg_latency_ms": (
+                self.total_latency / completed * 1000 if completed else 0.0
+            ),
+        }
+
+
+class PooledJsonRpcClient(AsyncJsonRpcClient):
+    """
+    Async JSON-RPC client that keeps a pool of keep-alive connections open.
+
+    The stock xrpl-py client creates a new ``httpx.AsyncClient`` for every
+    request, paying TCP and TLS setup each time. This client holds one
+    ``httpx.AsyncClient`` for its whole lifetime and reuses its connections.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        pool_size: int = 10,
+        timeout: float = 10.0,
+        keepalive_expiry: float = 30.0,
+    ):
+        """
+        Initialize the pooled client.
+
+        Args:
+            url: The JSON-RPC endpoint of the ledger node
+            pool_size: Maximum number of open connections to the node
+            timeout: Default per-request timeout in seconds
+            keepalive_expiry: Seconds an idle connection is kept open
+        """
+        super().__init__(url)
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.keepalive_expiry = keepalive_expiry
+        self.stats = TransportStats()
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Create the shared HTTP client on first use."""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+            )
+        return self._http_client
+
+    async def _trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """Count new connections using the httpcore trace extension."""
+        if event_name == "connection.connect_tcp.complete":
+            self.stats.connections_opened += 1
+
+    async def _request_impl(
+        self, request: Request, *, timeout: Optional[float] = None
+    ) -> Response:
+        """
+        Send a request over the pooled connections.
+
+        Args:
+            request: The rippled request to send
+            timeout: Optional timeout overriding the client default
+
+        Returns:
+            The response from the server
+        """
+        http_client = self._get_http_client()
+        self.stats.requests += 1
+        self.stats.in_flight += 1
+        started = time.perf_counter()
+        try:
+            response = await http_client.post(
+                self.url,
+                json=request_to_json_rpc(request),
+                timeout=timeout if timeout is not None else self.timeout,
+                extensions={"trace": self._trace},
+            )
+        except httpx.TimeoutException:
+            self.stats.errors += 1
+            self.stats.timeouts += 1
+            raise
+        except httpx.HTTPError:
+            self.stats.errors += 1
+            raise
+        finally:
+            self.stats.in_flight -= 1
+            self.stats.total_latency += time.perf_counter() - started
+
+        try:
+            return json_to_response(response.json())
+        except JSONDecodeError:
+            self.stats.errors += 1
+            raise XRPLRequestFailureException(
+                {
+                    "error": response.status_code,
+                    "error_message": response.text,
+                }
+            )
+
+    async def close(self) -> None:
+        """Close all pooled connections."""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from typing import Dict, Any, Optional, List, Union, cast
 
 from xrpl.clients import JsonRpcClient, WebsocketClient
+from xrpl.asyncio.clients import AsyncJsonRpcClient
 from xrpl.models.transactions import Payment, EscrowCreate, EscrowFinish
 from xrpl.models.requests import AccountInfo, AccountTx, Tx
 from xrpl.wallet import Wallet
@@ -12,6 +13,9 @@ from xrpl.transaction import submit_and_wait, XRPLReliableSubmissionException
 from xrpl.models.response import Response
 
 from app.core.config import settings
+from app.blockchain.transport import PooledJsonRpcClient
+from app.blockchain.submission import SubmissionPipeline
+from app.blockchain.subscriptions import transaction_dispatcher
 
 
 class XRPLClientException(Exception):
@@ -39,7 +43,30 @@ class XRPLClient:
         
         try:
             # Create JSON-RPC client
-            self.client = JsonRpcClient(self.network_url)
+            if settings.XRPL_POOLED_TRANSPORT:
+                self.client = PooledJsonRpcClient(
+                    self.network_url,
+                    pool_size=settings.XRPL_POOL_SIZE,
+                    timeout=settings.XRPL_REQUEST_TIMEOUT,
+                    keepalive_expiry=settings.XRPL_KEEPALIVE_EXPIRY,
+                )
+            else:
+                self.client = JsonRpcClient(self.network_url)
+            
+            # Submit back-to-back with local sequence numbers instead of submit_and_wait
+            self.pipeline = None
+            if settings.XRPL_SUBMISSION_PIPELINE:
+                async_client = (
+                    self.client
+                    if isinstance(self.client, PooledJsonRpcClient)
+                    else AsyncJsonRpcClient(self.network_url)
+                )
+                self.pipeline = SubmissionPipeline(
+                    async_client,
+                    dispatcher=transaction_dispatcher,
+                    ledger_offset=settings.XRPL_LEDGER_OFFSET,
+                    max_attempts=settings.XRPL_MAX_SUBMIT_ATTEMPTS,
+                )
             
             # Set up the platform wallet if seed is available
             self.platform_wallet = None
@@ -48,6 +75,40 @@ class XRPLClient:
         except Exception as e:
             raise XRPLClientException(f"Failed to initialize XRPL client: {str(e)}")
     
+    def transport_stats(self) -> Dict[str, Any]:
+        """Get connection reuse and latency counters for the pooled transport."""
+        if isinstance(self.client, PooledJsonRpcClient):
+            return self.client.stats.as_dict()
+        return {}
+    
+    async def close(self) -> None:
+        """Release any connections held by the client."""
+        if self.pipeline is not None:
+            await self.pipeline.close()
+        if isinstance(self.client, PooledJsonRpcClient):
+            await self.client.close()
+    
+    async def _submit_pipelined(self, transaction: Any, wallet: Wallet) -> Dict[str, Any]:
+        """
+        Submit through the pipeline without waiting for validation.
+        
+        Args:
+            transaction: The unsigned transaction
+            wallet: The wallet signing the transaction
+            
+        Returns:
+            Transaction result dictionary with a "pending" status
+        """
+        pending = await self.pipeline.submit(transaction, wallet)
+        return {
+            "tx_hash": pending.tx_hash,
+            "status": "pending",
+            "sequence": pending.sequence,
+            "last_ledger_sequence": pending.last_ledger_sequence,
+            "fee": drops_to_xrp(pending.signed.fee),
+            "timestamp": datetime.utcnow().isoformat(),
+        }
+    
     async def get_account_info(self, address: str) -> Dict[str, Any]:
         """Get information about an XRPL account."""
         try:
@@ -98,6 +159,9 @@ class XRPLClient:
                     }
                 }]
             
+            if self.pipeline is not None:
+                return await self._submit_pipelined(payment_tx, from_wallet)
+            
             # Submit the transaction
             response = await submit_and_wait(payment_tx, from_wallet, self.client)
             
@@ -168,6 +232,12 @@ class XRPLClient:
         if memo:
             escrow_tx.memos = [{"Memo": {"MemoData": memo.encode("hex")}}]
         
+        if self.pipeline is not None:
+            result = await self._submit_pipelined(escrow_tx, from_wallet)
+            # The escrow is identified by the sequence of its EscrowCreate
+            result.update(escrow_id=None, release_time=release_time.isoformat())
+            return result
+        
         # Submit the transaction
         response = await submit_and_wait(escrow_tx, from_wallet, self.client)
         
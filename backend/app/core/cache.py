@@ -0,0 +1,222 @@
+import json
+import math
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import date, datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from app.core.config import settings
+
+
+@dataclass
+class CacheStats:
+    """Counters of one cache backend."""
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    invalidations: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {**asdict(self), "hit_ratio": self.hits / lookups if lookups else 0.0}
+
+
+class MemoryCache:
+    """
+    In-process LRU cache with a time-to-live per entry.
+
+    Each process keeps its own entries, so invalidations made by one API
+    process are not seen by the others; use the Redis backend when running
+    several processes.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted
+            ttl: Default lifetime of an entry in seconds
+            clock: Monotonic time source
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.stats = CacheStats()
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a live entry, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return entry[1]
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store an entry, evicting the least recently used ones if full."""
+        expires = self.clock() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires, value)
+            self._entries.move_to_end(key)
+            self.stats.sets += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def delete(self, *keys: str) -> None:
+        """Drop entries."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+            self.stats.invalidations += len(keys)
+
+    def delete_prefix(self, *prefixes: str) -> None:
+        """Drop every entry whose key starts with one of ``prefixes``."""
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefixes)]
+            for key in keys:
+                del self._entries[key]
+            self.stats.invalidations += len(keys)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"backend": "memory", "entries": len(self._entries), **self.stats.as_dict()}
+
+
+# Characters with a meaning in Redis SCAN MATCH patterns
+_GLOB_SPECIAL = re.compile(r"([*?\[\]\\])")
+
+
+def _encode(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    raise TypeError(f"Cannot cache {type(value).__name__}")
+
+
+def _decode(obj: Dict[str, Any]) -> Any:
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+class RedisCache:
+    """
+    Cache stored in Redis, shared by every API process.
+
+    Values are stored as JSON, so only plain data (including datetimes)
+    can be cached. Any client with the redis-py ``get``/``set``/``delete``/
+    ``scan_iter`` interface works.
+    """
+
+    def __init__(self, client: Any, prefix: str = "cache:", ttl: float = 60.0):
+        """
+        Initialize the cache.
+
+        Args:
+            client: Redis client
+            prefix: Prefix of every key written by this cache
+            ttl: Default lifetime of an entry in seconds
+        """
+        self.client = client
+        self.prefix = prefix
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        raw = self.client.get(self.prefix + key)
+        if raw is None:
+            self.stats.misses += 1
+            return None
+        self.stats.hits += 1
+        return json.loads(raw, object_hook=_decode)
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        seconds = max(1, math.ceil(self.ttl if ttl is None else ttl))
+        self.client.set(self.prefix + key, json.dumps(value, default=_encode), ex=seconds)
+        self.stats.sets += 1
+
+    def delete(self, *keys: str) -> None:
+        if keys:
+            self.client.delete(*(self.prefix + key for key in keys))
+            self.stats.invalidations += len(keys)
+
+    def delete_prefix(self, *prefixes: str) -> None:
+        names = []
+        for prefix in prefixes:
+            pattern = _GLOB_SPECIAL.sub(r"\\\1", self.prefix + prefix) + "*"
+            names.extend(self.client.scan_iter(match=pattern))
+        if names:
+            self.client.delete(*names)
+            self.stats.invalidations += len(names)
+
+    def clear(self) -> None:
+        names = list(self.client.scan_iter(match=f"{self.prefix}*"))
+        if names:
+            self.client.delete(*names)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"backend": "redis", **self.stats.as_dict()}
+
+
+class NullCache:
+    """Cache that stores nothing, used when caching is disabled."""
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key: str) -> Optional[Any]:
+        return None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        pass
+
+    def delete(self, *keys: str) -> None:
+        pass
+
+    def delete_prefix(self, *prefixes: str) -> None:
+        pass
+
+    def clear(self) -> None:
+        pass
+
+    def metrics(self) -> Dict[str, Any]:
+        return {"backend": "none", **self.stats.as_dict()}
+
+
+def create_cache() -> Any:
+    """Create the cache backend selected by CACHE_BACKEND."""
+    if settings.CACHE_BACKEND == "memory":
+        return MemoryCache(max_entries=settings.CACHE_MAX_ENTRIES, ttl=settings.CACHE_TTL)
+    if settings.CACHE_BACKEND == "redis":
+        import redis
+
+        client = redis.Redis.from_url(settings.CACHE_REDIS_URL)
+        return RedisCache(client, prefix=settings.CACHE_PREFIX, ttl=settings.CACHE_TTL)
+    return NullCache()
+
+
+cache = create_cache()
@@ -0,0 +1,52 @@
+import threading
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+
+class ConcurrencyLimitExceeded(Exception):
+    """Raised when a key already has its limit of operations in flight."""
+
+
+class ConcurrencyLimiter:
+    """
+    Caps the number of operations in flight per key.
+
+    Counts are kept per process, so with several API processes the
+    effective limit is multiplied by their number.
+    """
+
+    def __init__(self, limit: int):
+        """
+        Initialize the limiter.
+
+        Args:
+            limit: Operations allowed in flight per key; 0 disables the limit
+        """
+        self.limit = limit
+        self._in_flight: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def hold(self, key: str) -> Iterator[None]:
+        """
+        Hold a slot for ``key`` while the block runs.
+
+        Raises:
+            ConcurrencyLimitExceeded: If ``key`` has no free slot
+        """
+        with self._lock:
+            count = self._in_flight.get(key, 0)
+            if self.limit and count >= self.limit:
+                raise ConcurrencyLimitExceeded(key)
+            self._in_flight[key] = count + 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                count = self._in_flight.pop(key) - 1
+                if count:
+                    self._in_flight[key] = count
+
+    def in_flight(self, key: str) -> int:
+        """Operations currently in flight for ``key``."""
+        return self._in_flight.get(key, 0)
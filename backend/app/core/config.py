@@ -27,6 +27,129 @@ class Settings(BaseSettings):
     POSTGRES_DB: str = "nonprofit_platform"
     SQLALCHEMY_DATABASE_URI: Optional[str] = None
 
+    # Connection pool; "pessimistic" pings on every checkout, "optimistic" relies on recycling
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: str = "pessimistic"
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 disables; PostgreSQL only
+
+    @validator("DB_POOL_PRE_PING")
+    def validate_pool_pre_ping(cls, v: str) -> str:
+        if v not in ["pessimistic", "optimistic"]:
+            raise ValueError("DB_POOL_PRE_PING must be one of: pessimistic, optimistic")
+        return v
+
+    # Sharded campaign/NPO totals; campaigns opt in through counter_service.enable_sharding
+    SHARDED_COUNTERS_ENABLED: bool = False
+    COUNTER_SHARDS: int = 16
+    COUNTER_COMPACTION_INTERVAL: float = 60.0
+
+    # Read-through cache of NPO and campaign lookups: none, memory or redis.
+    # Totals on cached rows can lag by up to CACHE_TTL seconds.
+    CACHE_BACKEND: str = "none"
+    CACHE_TTL: float = 30.0
+    CACHE_MAX_ENTRIES: int = 10000
+    CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    CACHE_PREFIX: str = "cache:"
+
+    @validator("CACHE_BACKEND")
+    def validate_cache_backend(cls, v: str) -> str:
+        if v not in ["none", "memory", "redis"]:
+            raise ValueError("CACHE_BACKEND must be one of: none, memory, redis")
+        return v
+
+    # Rate limiting: token_bucket allows bursts of the full quota, sliding_window
+    # spreads it over the window; idle clients are evicted beyond RATE_LIMIT_MAX_CLIENTS
+    RATE_LIMIT_ALGORITHM: str = "sliding_window"
+    RATE_LIMIT_MAX_CLIENTS: int = 100_000
+
+    @validator("RATE_LIMIT_ALGORITHM")
+    def validate_rate_limit_algorithm(cls, v: str) -> str:
+        if v not in ["token_bucket", "sliding_window"]:
+            raise ValueError("RATE_LIMIT_ALGORITHM must be one of: token_bucket, sliding_window")
+        return v
+
+    # Where counters live: memory (per process), shared_memory (all workers of
+    # one host) or redis (all nodes). Shared backends count with sliding
+    # windows and fall back to memory while failing.
+    RATE_LIMIT_BACKEND: str = "memory"
+    RATE_LIMIT_REDIS_URL: str = "redis://localhost:6379/0"
+    RATE_LIMIT_PREFIX: str = "ratelimit:"
+    RATE_LIMIT_SHARED_PATH: str = "/dev/shm/donation-platform-ratelimit"
+    RATE_LIMIT_SHARED_SLOTS: int = 65536
+    RATE_LIMIT_BACKEND_TIMEOUT: float = 0.1
+    RATE_LIMIT_BACKEND_RETRY: float = 5.0
+
+    @validator("RATE_LIMIT_BACKEND")
+    def validate_rate_limit_backend(cls, v: str) -> str:
+        if v not in ["memory", "shared_memory", "redis"]:
+            raise ValueError("RATE_LIMIT_BACKEND must be one of: memory, shared_memory, redis")
+        return v
+
+    # Authenticated user per (user, token) kept in the cache above; 0 disables
+    IDENTITY_CACHE_TTL: float = 10.0
+    # Carry is_active/is_admin claims in new tokens and trust them instead of
+    # loading the user. Role changes and deactivation then take effect only
+    # once the token expires, so pair with a short ACCESS_TOKEN_EXPIRE_MINUTES.
+    STATELESS_AUTH: bool = False
+
+    # bcrypt runs in this many worker processes (0: threads of the API process)
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 64
+    # bcrypt cost (log2 of the rounds); hashes made with another cost are
+    # rehashed in the background after the next successful login
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_REHASH_ON_LOGIN: bool = True
+
+    @validator("PASSWORD_BCRYPT_ROUNDS")
+    def validate_bcrypt_rounds(cls, v: int) -> int:
+        if not 4 <= v <= 31:
+            raise ValueError("PASSWORD_BCRYPT_ROUNDS must be between 4 and 31")
+        return v
+    # Login attempts in flight per client IP and per account, per API process; 0 disables
+    LOGIN_MAX_CONCURRENT_PER_IP: int = 4
+    LOGIN_MAX_CONCURRENT_PER_ACCOUNT: int = 2
+
+    # Logging: text or json (one object per record, with request id, user,
+    # route and latency). LOG_ASYNC (opt-in) writes from a background thread
+    # through a queue of LOG_QUEUE_SIZE records; when full, the logging thread
+    # waits ("block") or records are dropped and counted ("drop").
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "text"
+    LOG_ASYNC: bool = False
+    LOG_QUEUE_SIZE: int = 10000
+    LOG_QUEUE_OVERFLOW: str = "block"
+    # One record per request with its status and latency (opt-in)
+    LOG_REQUESTS: bool = False
+
+    @validator("LOG_FORMAT")
+    def validate_log_format(cls, v: str) -> str:
+        if v not in ["text", "json"]:
+            raise ValueError("LOG_FORMAT must be one of: text, json")
+        return v
+
+    @validator("LOG_QUEUE_OVERFLOW")
+    def validate_log_queue_overflow(cls, v: str) -> str:
+        if v not in ["drop", "block"]:
+            raise ValueError("LOG_QUEUE_OVERFLOW must be one of: drop, block")
+        return v
+
+    # Cache-Control of public listings, for browsers, CDNs and reverse proxies
+    HTTP_CACHE_MAX_AGE: int = 60
+    HTTP_CACHE_STALE_WHILE_REVALIDATE: int = 300
+
+    # Streaming donation export; rows fetched from the server-side cursor per round trip
+    EXPORT_BATCH_SIZE: int = 1000
+
+    # Largest batch accepted by POST /donations/import
+    DONATION_IMPORT_MAX_ROWS: int = 5000
+
+    # Async database layer; the async URL is derived from SQLALCHEMY_DATABASE_URI if unset
+    ASYNC_DB_ENABLED: bool = False
+    ASYNC_SQLALCHEMY_DATABASE_URI: Optional[str] = None
+
     @property
     def get_database_url(self) -> str:
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_SERVER}/{self.POSTGRES_DB}"
@@ -41,6 +164,41 @@ class Settings(BaseSettings):
 
     XRPL_SEED: Optional[SecretStr] = None
     XRPL_ACCOUNT: Optional[str] = None
+
+    # Pooled keep-alive JSON-RPC transport
+    XRPL_POOLED_TRANSPORT: bool = False
+    XRPL_POOL_SIZE: int = 10
+    XRPL_REQUEST_TIMEOUT: float = 10.0
+    XRPL_KEEPALIVE_EXPIRY: float = 30.0
+
+    # Pipelined submission with locally managed sequence numbers
+    XRPL_SUBMISSION_PIPELINE: bool = False
+    XRPL_LEDGER_OFFSET: int = 20
+    XRPL_MAX_SUBMIT_ATTEMPTS: int = 3
+
+    # WebSocket subscription for transaction confirmations
+    XRPL_SUBSCRIPTIONS_ENABLED: bool = False
+    XRPL_SUBSCRIPTION_MAX_BACKOFF: float = 60.0
+    # Ledgers replayed on startup so transactions validated while down resolve
+    XRPL_SUBSCRIPTION_BACKFILL_LEDGERS: int = 300
+
+    # Asynchronous donation initiation (202 + queued ledger submission)
+    ASYNC_DONATIONS_ENABLED: bool = False
+
+    # Job queue; run workers with `python -m app.workers` or inside the API
+    JOB_WORKERS_IN_API: bool = False
+    JOB_WORKER_PROCESSES: int = 1
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_POLL_INTERVAL: float = 1.0
+    JOB_VISIBILITY_TIMEOUT: float = 300.0
+    JOB_UPLOAD_SPOOL_DIR: str = "/tmp/proof-uploads"
+    CAMPAIGN_STATUS_INTERVAL: float = 300.0
+
+    # Background reconciliation of pending donations
+    RECONCILIATION_ENABLED: bool = False
+    RECONCILIATION_INTERVAL: float = 30.0
+    RECONCILIATION_PAGE_SIZE: int = 100
+    RECONCILIATION_CONCURRENCY: int = 10
     
     # XUMM Wallet Integration
     XUMM_API_KEY: Optional[SecretStr] = None
@@ -0,0 +1,91 @@
+"""
+Password hashing off the event loop.
+
+bcrypt costs a few hundred milliseconds of CPU per hash or verification, so
+hashing runs in a dedicated pool of worker processes instead of on the
+thread serving the request.
+"""
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core import security
+from app.core.config import settings
+
+
+class PasswordHasher:
+    """
+    Runs password hashing and verification in a bounded worker pool.
+
+    At most ``max_pending`` operations are handed to the pool at once; the
+    rest wait on the event loop, so a burst of logins cannot build an
+    unbounded backlog in the pool.
+    """
+
+    def __init__(self, workers: int = 2, max_pending: int = 64):
+        """
+        Initialize the hasher.
+
+        Args:
+            workers: Worker processes; 0 runs hashing in threads of this process
+            max_pending: Operations submitted to the pool at once
+        """
+        self.workers = workers
+        self.max_pending = max_pending
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._pending: Optional[asyncio.Semaphore] = None
+
+    def _get_executor(self) -> Optional[Executor]:
+        with self._lock:
+            if self.workers and self._executor is None:
+                # Fresh interpreters, so no worker inherits the parent's DB connections
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._pending = asyncio.Semaphore(self.max_pending)
+        return self._pending
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        async with self._get_semaphore():
+            executor = self._get_executor()
+            if executor is None:
+                return await asyncio.to_thread(func, *args)
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+
+    async def hash(self, password: str) -> str:
+        """Hash a password."""
+        return await self._run(security.get_password_hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against a hash."""
+        return await self._run(security.verify_password, password, hashed_password)
+
+    def hash_blocking(self, password: str) -> str:
+        """Hash a password in the pool from a thread without an event loop."""
+        executor = self._get_executor()
+        if executor is None:
+            return security.get_password_hash(password)
+        return executor.submit(security.get_password_hash, password).result()
+
+    def shutdown(self) -> None:
+        """Stop the worker processes; they are started again on next use."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(
+    workers=settings.PASSWORD_HASH_WORKERS,
+    max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+)
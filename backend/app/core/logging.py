@@ -1,9 +1,32 @@
+import copy
+import json
 import logging
+import queue
+import re
 import sys
-from typing import Any, Dict
+import threading
+import time
+import traceback
+import uuid
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Optional
 from pathlib import Path
+from fastapi import FastAPI
 from loguru import logger
 from loguru._defaults import LOGURU_FORMAT
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Context of the request being served, added to every log record
+_request_context: ContextVar[Optional[Dict[str, Any]]] = ContextVar("request_context", default=None)
+
+# Request ids accepted from the X-Request-ID header
+_REQUEST_ID = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+# Request fields copied into JSON records
+CONTEXT_FIELDS = ("request_id", "user_id", "route", "status", "latency_ms")
+
+# Background sink of setup_logging(background=True), if any
+log_sink: Optional["BackgroundSink"] = None
 
 class InterceptHandler(logging.Handler):
     """
@@ -28,13 +51,179 @@ class InterceptHandler(logging.Handler):
         )
 
 
+class BackgroundSink:
+    """
+    Loguru sink handing formatted records to a writer thread.
+
+    Records wait in a bounded queue so that slow writes, file rotation and
+    compression happen off the request path. When the queue is full a record
+    is dropped and counted ("drop") or the logging thread waits ("block").
+    """
+
+    _STOP = object()
+
+    def __init__(self, write: Callable[[str], None], max_queue: int = 10000, overflow: str = "drop"):
+        """
+        Initialize the sink and start its writer thread.
+
+        Args:
+            write: Writes one formatted record; called on the writer thread
+            max_queue: Records waiting to be written before overflow applies
+            overflow: "drop" or "block"
+        """
+        self._write = write
+        self.max_queue = max_queue
+        self.overflow = overflow
+        self.dropped = 0
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, message: str) -> None:
+        if self._stopped:
+            self._write(message)
+            return
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            if self.overflow == "block":
+                self._queue.put(message)
+            else:
+                self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            message = self._queue.get()
+            if message is self._STOP:
+                return
+            try:
+                self._write(message)
+            except Exception:
+                traceback.print_exc(file=sys.__stderr__)
+
+    def stop(self) -> None:
+        """Write the queued records; later records are written directly."""
+        if not self._stopped:
+            self._stopped = True
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "max_queue": self.max_queue,
+            "overflow": self.overflow,
+            "dropped": self.dropped,
+        }
+
+
+def json_format(record: Dict[str, Any]) -> str:
+    """Loguru format rendering a record as one JSON object per line."""
+    extra = record["extra"]
+    entry = {
+        "time": record["time"].isoformat(),
+        "level": record["level"].name,
+        "message": record["message"],
+        "logger": record["name"],
+        "function": record["function"],
+        "line": record["line"],
+    }
+    for field in CONTEXT_FIELDS:
+        if extra.get(field) is not None:
+            entry[field] = extra[field]
+    if record["exception"] is not None:
+        entry["exception"] = "".join(traceback.format_exception(*record["exception"]))
+    extra["_json"] = json.dumps(entry, default=str)
+    return "{extra[_json]}\n"
+
+
+def _add_request_context(record: Dict[str, Any]) -> None:
+    context = _request_context.get()
+    if context is None:
+        return
+    extra = record["extra"]
+    extra.setdefault("request_id", context["request_id"])
+    extra.setdefault("user_id", context["user_id"])
+    route = context["scope"].get("route")
+    extra.setdefault("route", getattr(route, "path", context["scope"].get("path")))
+
+
+def set_log_user(user_id: Any) -> None:
+    """Record the authenticated user in the log records of the current request."""
+    context = _request_context.get()
+    if context is not None:
+        context["user_id"] = str(user_id)
+
+
+class RequestContextMiddleware:
+    """
+    Tags log records with the request id, user and route of their request.
+
+    The request id comes from a well-formed X-Request-ID header or is
+    generated, and is returned in X-Request-ID. With ``log_requests``, one
+    record per request carries its status and latency.
+    """
+
+    def __init__(self, app: ASGIApp, log_requests: bool = True):
+        self.app = app
+        self.log_requests = log_requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")
+                break
+        if request_id is None or not _REQUEST_ID.match(request_id):
+            request_id = uuid.uuid4().hex
+
+        context = {"request_id": request_id, "user_id": None, "scope": scope}
+        token = _request_context.set(context)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_request_id(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-request-id", request_id.encode("latin-1")),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            if self.log_requests:
+                latency_ms = round((time.perf_counter() - started) * 1000, 2)
+                logger.bind(status=status, latency_ms=latency_ms).info(
+                    f"{scope['method']} {scope['path']} {status} {latency_ms}ms"
+                )
+            _request_context.reset(token)
+
+
+def add_request_context(app: FastAPI, log_requests: bool = True) -> None:
+    """Add request context middleware to FastAPI application."""
+    app.add_middleware(RequestContextMiddleware, log_requests=log_requests)
+
+
 def setup_logging(
     *,
     log_path: Path = None,
     level: str = "INFO",
     rotation: str = "20 MB",
     retention: str = "1 month",
-    format: str = LOGURU_FORMAT
+    format: str = LOGURU_FORMAT,
+    json: bool = False,
+    background: bool = False,
+    max_queue: int = 10000,
+    overflow: str = "drop",
 ) -> None:
     """
     Configure logging with loguru.
@@ -45,29 +234,56 @@ def setup_logging(
         rotation: When to rotate log files
         retention: How long to keep log files
         format: Log message format
+        json: Write one JSON object per record instead of ``format``
+        background: Write records from a background thread, see BackgroundSink
+        max_queue: Records queued for the background thread
+        overflow: "drop" or "block" when the background queue is full
     """
+    global log_sink
+
     # Remove default loguru handler
     logger.remove()
+    if log_sink is not None:
+        log_sink.stop()
+        log_sink = None
+    record_format = json_format if json else format
+
+    # Handlers writing the records: the logger itself, or an independent
+    # copy used by the background writer thread
+    writer = copy.deepcopy(logger) if background else logger
+    writer_format = "{message}" if background else record_format
+    writer_level = 0 if background else level
 
     # Add console handler
-    logger.add(
+    writer.add(
         sys.stderr,
-        level=level,
-        format=format
+        level=writer_level,
+        format=writer_format
     )
 
     # Add file handler if path is provided
     if log_path:
         log_path.parent.mkdir(parents=True, exist_ok=True)
-        logger.add(
+        writer.add(
             str(log_path),
-            level=level,
-            format=format,
+            level=writer_level,
+            format=writer_format,
             rotation=rotation,
             retention=retention,
             compression="zip"
         )
 
+    if background:
+        raw_writer = writer.opt(raw=True)
+        log_sink = BackgroundSink(
+            lambda message: raw_writer.log(message.record["level"].name, message),
+            max_queue=max_queue,
+            overflow=overflow,
+        )
+        logger.add(log_sink, level=level, format=record_format)
+
+    logger.configure(patcher=_add_request_context)
+
     # Intercept standard logging
     logging.basicConfig(handlers=[InterceptHandler()], level=0, force=True)
 
@@ -1,102 +1,636 @@
-from typing import Callable, Dict
-from datetime import datetime, timedelta
-from fastapi import FastAPI, Request, Response
+import fcntl
+import hashlib
+import inspect
+import math
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, FrozenSet, List, Optional, Pattern, Sequence, Tuple
+from fastapi import FastAPI
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from jose import JWTError, jwt
+from loguru import logger
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+@dataclass
+class RateLimitResult:
+    """Outcome of one rate limit check."""
+    allowed: bool
+    limit: int
+    remaining: int
+    reset_after: float  # Seconds until the full quota is available again
+
+
+class TokenBucket:
+    """
+    Bucket of ``requests`` tokens refilled evenly over ``window`` seconds.
+
+    Allows bursts up to the full quota, then a steady rate. State per
+    client is ``[updated_at, tokens]``.
+    """
+
+    def __init__(self, requests: int, window: float):
+        self.requests = requests
+        self.rate = requests / window
+        # A bucket idle this long is full again, the same as a new one
+        self.idle_ttl = window
+
+    def new_state(self, now: float) -> list:
+        return [now, float(self.requests)]
+
+    def consume(self, state: list, now: float, cost: int) -> RateLimitResult:
+        tokens = min(self.requests, state[1] + (now - state[0]) * self.rate)
+        allowed = tokens >= cost
+        if allowed:
+            tokens -= cost
+        state[0], state[1] = now, tokens
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.requests,
+            remaining=int(tokens),
+            reset_after=(self.requests - tokens) / self.rate,
+        )
+
+
+class SlidingWindowCounter:
+    """
+    Fixed windows whose previous count is weighted by its remaining overlap.
+
+    Approximates a true sliding log within a few percent with two counters.
+    State per client is ``[last_seen, window_start, count, previous_count]``.
+    """
+
+    def __init__(self, requests: int, window: float):
+        self.requests = requests
+        self.window = window
+        # After two idle windows both counters are zero again
+        self.idle_ttl = 2 * window
+
+    def new_state(self, now: float) -> list:
+        return [now, now - now % self.window, 0, 0]
+
+    def consume(self, state: list, now: float, cost: int) -> RateLimitResult:
+        start = now - now % self.window
+        if start != state[1]:
+            state[3] = state[2] if start - state[1] == self.window else 0
+            state[1], state[2] = start, 0
+        state[0] = now
+        elapsed = now - start
+        used = state[3] * (1 - elapsed / self.window) + state[2]
+        allowed = used + cost <= self.requests
+        if allowed:
+            state[2] += cost
+            used += cost
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.requests,
+            remaining=max(0, int(self.requests - used)),
+            reset_after=self.window - elapsed,
+        )
+
+
+ALGORITHMS = {
+    "token_bucket": TokenBucket,
+    "sliding_window": SlidingWindowCounter,
+}
+
 
 class RateLimiter:
-    def __init__(self, requests: int, window: int):
+    """
+    Per-client rate limiter with constant work and state per request.
+
+    Client states are lists starting with the time the client was last
+    seen, kept in LRU order: clients idle long enough to be back at a full
+    quota are dropped, and at most ``max_clients`` are kept. Meant to be
+    used from one event loop.
+    """
+
+    def __init__(
+        self,
+        requests: int,
+        window: int,
+        algorithm: str = "sliding_window",
+        max_clients: int = 100_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
         """
         Initialize rate limiter.
         
         Args:
             requests: Maximum number of requests allowed in the window
             window: Time window in seconds
+            algorithm: "token_bucket" or "sliding_window"
+            max_clients: Client states kept before the least recently seen is evicted
+            clock: Monotonic time source
         """
         self.requests = requests
         self.window = window
-        self.clients: Dict[str, list] = {}
-    
+        self.algorithm = ALGORITHMS[algorithm](requests, window)
+        self.max_clients = max_clients
+        self.clock = clock
+        # Least recently seen first
+        self.clients: "OrderedDict[str, list]" = OrderedDict()
+
+    def hit(self, client_id: str, cost: int = 1) -> RateLimitResult:
+        """Count a request of ``cost`` units against a client's quota."""
+        now = self.clock()
+        state = self.clients.get(client_id)
+        if state is None:
+            state = self.clients[client_id] = self.algorithm.new_state(now)
+        else:
+            self.clients.move_to_end(client_id)
+        result = self.algorithm.consume(state, now, cost)
+        self._evict(now)
+        return result
+
     def is_allowed(self, client_id: str) -> bool:
         """Check if client is allowed to make a request."""
-        now = datetime.now()
-        
-        # Remove old requests
-        if client_id in self.clients:
-            self.clients[client_id] = [
-                timestamp for timestamp in self.clients[client_id]
-                if timestamp > now - timedelta(seconds=self.window)
-            ]
-        else:
-            self.clients[client_id] = []
-        
-        # Check if client has exceeded rate limit
-        if len(self.clients[client_id]) >= self.requests:
-            return False
-        
-        # Add new request
-        self.clients[client_id].append(now)
-        return True
+        return self.hit(client_id).allowed
 
+    def _evict(self, now: float) -> None:
+        clients = self.clients
+        idle_before = now - self.algorithm.idle_ttl
+        # Amortized O(1): each client state is evicted at most once
+        while clients:
+            client_id, state = next(iter(clients.items()))
+            if state[0] > idle_before and len(clients) <= self.max_clients:
+                break
+            del clients[client_id]
+
+
+# Check and count one request of a sliding window limiter atomically. Only
+# allowed requests are counted, so over-limit retries do not extend a block.
+# KEYS: current window, previous window
+# ARGV: cost, limit, weight of the previous window, TTL of the current one
+_REDIS_HIT_SCRIPT = """
+local count = tonumber(redis.call('GET', KEYS[1]) or '0')
+local previous = tonumber(redis.call('GET', KEYS[2]) or '0')
+local cost = tonumber(ARGV[1])
+if previous * tonumber(ARGV[3]) + count + cost <= tonumber(ARGV[2]) then
+    count = redis.call('INCRBY', KEYS[1], cost)
+    redis.call('EXPIRE', KEYS[1], ARGV[4])
+    return {1, count, previous}
+end
+return {0, count, previous}
+"""
+
+
+class RedisRateLimiter:
+    """
+    Sliding window counters in Redis, shared by every API process and node.
+
+    Each request runs one Lua script that weighs the client's previous
+    window, and adds the cost to the current one only if the request is
+    allowed. Windows follow the wall clock, which nodes are expected to
+    keep in sync.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        requests: int,
+        window: int,
+        prefix: str = "ratelimit:",
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            client: ``redis.asyncio`` client
+            requests: Maximum number of requests allowed in the window
+            window: Time window in seconds
+            prefix: Prefix of every key written by this limiter
+            clock: Wall clock time source
+        """
+        self.client = client
+        self.requests = requests
+        self.window = window
+        self.prefix = prefix
+        self.clock = clock
+        self._script = client.register_script(_REDIS_HIT_SCRIPT)
+
+    async def hit(self, client_id: str, cost: int = 1) -> RateLimitResult:
+        """Count a request of ``cost`` units against a client's quota."""
+        now = self.clock()
+        index, elapsed = divmod(now, self.window)
+        weight = 1 - elapsed / self.window
+        key = f"{self.prefix}{client_id}:"
+        allowed, count, previous = await self._script(
+            keys=[f"{key}{int(index)}", f"{key}{int(index) - 1}"],
+            args=[cost, self.requests, repr(weight), 2 * self.window],
+        )
+        used = int(previous) * weight + int(count)
+        return RateLimitResult(
+            allowed=bool(allowed),
+            limit=self.requests,
+            remaining=max(0, int(self.requests - used)),
+            reset_after=self.window - elapsed,
+        )
+
+
+# Lock of the shared memory limiters within this process; fcntl locks only
+# exclude other processes
+_shared_memory_lock = threading.Lock()
+
+
+class SharedMemoryRateLimiter:
+    """
+    Sliding window counters in a memory-mapped file, shared by the worker
+    processes of one host.
+
+    Clients hash into groups of ``SLOTS_PER_GROUP`` slots, each group
+    guarded by an fcntl byte-range lock. When every slot of a group holds
+    an active client, the least recently active one is recycled.
+    """
+
+    # key fingerprint, window index, count, previous window's count
+    SLOT = struct.Struct("<QqQQ")
+    SLOTS_PER_GROUP = 8
+
+    def __init__(
+        self,
+        path: str,
+        requests: int,
+        window: int,
+        slots: int = 65536,
+        prefix: str = "",
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the limiter, creating the file if needed.
+
+        Args:
+            path: File shared by the processes; best on a tmpfs such as /dev/shm
+            requests: Maximum number of requests allowed in the window
+            window: Time window in seconds
+            slots: Clients tracked at once
+            prefix: Prefix of every client id, to share a file between limiters
+            clock: Wall clock time source
+        """
+        self.requests = requests
+        self.window = window
+        self.prefix = prefix
+        self.clock = clock
+        self.groups = max(1, slots // self.SLOTS_PER_GROUP)
+        self.group_size = self.SLOTS_PER_GROUP * self.SLOT.size
+        size = self.groups * self.group_size
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < size:
+            os.ftruncate(self._fd, size)
+        self._map = mmap.mmap(self._fd, size)
+
+    def hit(self, client_id: str, cost: int = 1) -> RateLimitResult:
+        """Count a request of ``cost`` units against a client's quota."""
+        digest = hashlib.blake2b(f"{self.prefix}{client_id}".encode(), digest_size=8).digest()
+        fingerprint = int.from_bytes(digest, "little") or 1
+        offset = (fingerprint % self.groups) * self.group_size
+        now = self.clock()
+        index, elapsed = divmod(now, self.window)
+        index = int(index)
+
+        with _shared_memory_lock:
+            fcntl.lockf(self._fd, fcntl.LOCK_EX, self.group_size, offset)
+            try:
+                slot, count, previous = self._find_slot(offset, fingerprint, index)
+                used = previous * (1 - elapsed / self.window) + count
+                allowed = used + cost <= self.requests
+                if allowed:
+                    count += cost
+                    used += cost
+                self.SLOT.pack_into(self._map, slot, fingerprint, index, count, previous)
+            finally:
+                fcntl.lockf(self._fd, fcntl.LOCK_UN, self.group_size, offset)
+
+        return RateLimitResult(
+            allowed=allowed,
+            limit=self.requests,
+            remaining=max(0, int(self.requests - used)),
+            reset_after=self.window - elapsed,
+        )
+
+    def _find_slot(self, offset: int, fingerprint: int, index: int) -> Tuple[int, int, int]:
+        """Find the client's slot in a group, or the one to recycle for it."""
+        oldest = None
+        for slot in range(offset, offset + self.group_size, self.SLOT.size):
+            owner, window, count, previous = self.SLOT.unpack_from(self._map, slot)
+            if owner == fingerprint:
+                if window == index:
+                    return slot, count, previous
+                return slot, 0, count if window == index - 1 else 0
+            if oldest is None or window < oldest[0]:
+                oldest = (window, slot)
+        return oldest[1], 0, 0
+
+    def close(self) -> None:
+        self._map.close()
+        os.close(self._fd)
+
+
+class FallbackRateLimiter:
+    """
+    Uses a shared limiter, and a local one while the shared one fails.
+
+    After a failure the shared limiter is retried every ``retry_after``
+    seconds, so an unreachable backend costs one timeout per interval
+    rather than one per request.
+    """
+
+    def __init__(
+        self,
+        primary: Any,
+        fallback: RateLimiter,
+        retry_after: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Initialize the limiter.
+
+        Args:
+            primary: Shared limiter
+            fallback: Local limiter used while the shared one fails
+            retry_after: Seconds before retrying a failed shared limiter
+            clock: Monotonic time source
+        """
+        self.primary = primary
+        self.fallback = fallback
+        self.retry_after = retry_after
+        self.clock = clock
+        self.failures = 0
+        self._retry_at = 0.0
+
+    async def hit(self, client_id: str, cost: int = 1) -> RateLimitResult:
+        """Count a request of ``cost`` units against a client's quota."""
+        now = self.clock()
+        if now >= self._retry_at:
+            try:
+                result = self.primary.hit(client_id, cost)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            except Exception as e:
+                self.failures += 1
+                self._retry_at = now + self.retry_after
+                logger.warning(f"Shared rate limiter failed, limiting locally: {e}")
+        return self.fallback.hit(client_id, cost)
+
+    @property
+    def degraded(self) -> bool:
+        """Whether requests are currently limited locally."""
+        return self.clock() < self._retry_at
+
+
+def create_rate_limiter(requests: int, window: int, prefix: str = "") -> Any:
+    """Create the rate limiter selected by RATE_LIMIT_BACKEND."""
+    local = RateLimiter(
+        requests,
+        window,
+        algorithm=settings.RATE_LIMIT_ALGORITHM,
+        max_clients=settings.RATE_LIMIT_MAX_CLIENTS,
+    )
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        import redis.asyncio as redis
+
+        client = redis.Redis.from_url(
+            settings.RATE_LIMIT_REDIS_URL,
+            socket_timeout=settings.RATE_LIMIT_BACKEND_TIMEOUT,
+            socket_connect_timeout=settings.RATE_LIMIT_BACKEND_TIMEOUT,
+        )
+        shared = RedisRateLimiter(
+            client, requests, window, prefix=settings.RATE_LIMIT_PREFIX + prefix
+        )
+    elif settings.RATE_LIMIT_BACKEND == "shared_memory":
+        shared = SharedMemoryRateLimiter(
+            settings.RATE_LIMIT_SHARED_PATH,
+            requests,
+            window,
+            slots=settings.RATE_LIMIT_SHARED_SLOTS,
+            prefix=prefix,
+        )
+    else:
+        return local
+    return FallbackRateLimiter(shared, local, retry_after=settings.RATE_LIMIT_BACKEND_RETRY)
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """
+    A budget of requests per client.
+
+    ``key`` is "principal" to count per user id of a valid bearer token,
+    falling back to the client IP, or "ip" to always count per client IP.
+    """
+    name: str
+    requests: int
+    window: int
+    key: str = "principal"
+
+
+@dataclass(frozen=True)
+class RateLimitRule:
+    """
+    Routes counted against a policy.
+
+    ``path`` is a path prefix in which ``{param}`` matches one segment;
+    no ``methods`` means every method. Each request uses ``cost`` units.
+    """
+    path: str
+    policy: str
+    methods: FrozenSet[str] = frozenset()
+    cost: int = 1
+
+
+class RateLimitPolicies:
+    """
+    Chooses the policy and cost of each request from per-route rules.
+
+    Rules are tried in order and the first match wins, so list specific
+    routes before the routers containing them. Unmatched requests use the
+    ``default`` policy. Each policy counts in its own limiter.
+    """
+
+    def __init__(
+        self,
+        policies: Sequence[RateLimitPolicy],
+        rules: Sequence[RateLimitRule] = (),
+        default: str = "default",
+    ):
+        """
+        Initialize the policies.
+
+        Args:
+            policies: Available policies
+            rules: Routes of the non-default policies, most specific first
+            default: Name of the policy of unmatched requests
+        """
+        self.policies = {policy.name: policy for policy in policies}
+        self.default = self.policies[default]
+        self.rules = [
+            (_compile_path(rule.path), rule.methods, self.policies[rule.policy], rule.cost)
+            for rule in rules
+        ]
+        self.limiters = {
+            policy.name: create_rate_limiter(policy.requests, policy.window, prefix=f"{policy.name}:")
+            for policy in policies
+        }
+
+    def match(self, method: str, path: str) -> Tuple[RateLimitPolicy, int]:
+        """Get the policy and cost of a request."""
+        for pattern, methods, policy, cost in self.rules:
+            if (not methods or method in methods) and pattern.match(path):
+                return policy, cost
+        return self.default, 1
+
+    async def hit(self, policy: RateLimitPolicy, client_id: str, cost: int = 1) -> RateLimitResult:
+        """Count a request against a client's quota under ``policy``."""
+        result = self.limiters[policy.name].hit(client_id, cost)
+        if inspect.isawaitable(result):
+            result = await result
+        return result
+
+
+def _compile_path(path: str) -> Pattern:
+    pattern = re.sub(r"\\\{[^/]+?\\\}", "[^/]+", re.escape(path.rstrip("/")))
+    return re.compile(f"{pattern}(?:/|$)")
+
+
+@lru_cache(maxsize=4096)
+def _principal(authorization: str) -> Optional[str]:
+    """
+    User id of a valid bearer token, or None.
+
+    Only used to group requests, so cached tokens are not checked for expiry
+    again; authentication still rejects expired ones.
+    """
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    subject = payload.get("sub")
+    return f"user:{subject}" if subject else None
+
+
+# Headers set on every limited response, for CORS expose_headers
+RATE_LIMIT_HEADERS = ["RateLimit-Policy", "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset"]
+
+
+def rate_limit_headers(policy: RateLimitPolicy, result: RateLimitResult) -> List[Tuple[bytes, bytes]]:
+    """Raw RateLimit-* headers describing a client's quota after a request."""
+    reset = str(math.ceil(result.reset_after)).encode()
+    headers = [
+        (b"ratelimit-policy", f"{policy.requests};w={policy.window}".encode()),
+        (b"ratelimit-limit", str(result.limit).encode()),
+        (b"ratelimit-remaining", str(result.remaining).encode()),
+        (b"ratelimit-reset", reset),
+    ]
+    if not result.allowed:
+        headers.append((b"retry-after", reset))
+    return headers
+
+
+class RateLimitMiddleware:
+    """
+    Middleware counting each HTTP request against its rate limit policy.
+
+    Plain ASGI, so responses (streamed ones included) pass through without
+    an extra task per request.
+    """
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
     def __init__(
         self,
         app: ASGIApp,
         requests_per_minute: int = 60,
-        exclude_paths: list = None
+        exclude_paths: list = None,
+        policies: Optional[RateLimitPolicies] = None,
     ):
         """
         Initialize rate limit middleware.
         
         Args:
             app: The ASGI application
-            requests_per_minute: Maximum number of requests allowed per minute
+            requests_per_minute: Maximum number of requests allowed per minute,
+                used when no ``policies`` are given
             exclude_paths: List of paths to exclude from rate limiting
+            policies: Per-route policies
         """
-        super().__init__(app)
-        self.limiter = RateLimiter(requests_per_minute, 60)
-        self.exclude_paths = exclude_paths or []
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Handle incoming request."""
-        # Skip rate limiting for excluded paths
-        if any(request.url.path.startswith(path) for path in self.exclude_paths):
-            return await call_next(request)
-        
-        # Get client identifier (IP address or token)
-        client_id = request.client.host
-        if "Authorization" in request.headers:
-            client_id = request.headers["Authorization"]
-        
+        self.app = app
+        self.policies = policies or RateLimitPolicies(
+            [RateLimitPolicy("default", requests_per_minute, 60)]
+        )
+        self.exclude_paths = tuple(exclude_paths or ())
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        # Skip rate limiting for other protocols and excluded paths
+        path = scope.get("path", "")
+        if scope["type"] != "http" or (self.exclude_paths and path.startswith(self.exclude_paths)):
+            await self.app(scope, receive, send)
+            return
+
+        policy, cost = self.policies.match(scope["method"], path)
+
+        # Get client identifier (user id or IP address)
+        client_id = None
+        if policy.key == "principal":
+            for name, value in scope["headers"]:
+                if name == b"authorization":
+                    client_id = _principal(value.decode("latin-1"))
+                    break
+        if client_id is None:
+            client = scope.get("client")
+            client_id = client[0] if client else "unknown"
+
         # Check rate limit
-        if not self.limiter.is_allowed(client_id):
-            return JSONResponse(
+        result = await self.policies.hit(policy, client_id, cost)
+        headers = rate_limit_headers(policy, result)
+        if not result.allowed:
+            response = JSONResponse(
                 status_code=429,
                 content={
                     "detail": "Too many requests. Please try again later."
-                }
+                },
             )
-        
-        return await call_next(request)
+            response.raw_headers.extend(headers)
+            await response(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), *headers]
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 def add_rate_limit(
     app: FastAPI,
     requests_per_minute: int = 60,
-    exclude_paths: list = None
+    exclude_paths: list = None,
+    policies: Optional[RateLimitPolicies] = None,
 ) -> None:
     """
     Add rate limiting middleware to FastAPI application.
     
     Args:
         app: FastAPI application instance
-        requests_per_minute: Maximum number of requests allowed per minute
+        requests_per_minute: Maximum number of requests allowed per minute,
+            used when no ``policies`` are given
         exclude_paths: List of paths to exclude from rate limiting
+        policies: Per-route policies
     """
     app.add_middleware(
         RateLimitMiddleware,
         requests_per_minute=requests_per_minute,
-        exclude_paths=exclude_paths
-    ) 
\ No newline at end of file
+        exclude_paths=exclude_paths,
+        policies=policies,
+    )
@@ -1,5 +1,5 @@
 from datetime import datetime, timedelta
-from typing import Any, Union, Optional
+from typing import Any, Dict, Union, Optional
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -7,11 +7,27 @@ from passlib.context import CryptContext
 from app.core.config import settings
 
 # Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.PASSWORD_BCRYPT_ROUNDS
+)
 
 # JWT settings
 ALGORITHM = "HS256"
 
+# Flags carried in tokens when STATELESS_AUTH is enabled
+IDENTITY_CLAIMS = ("is_active", "is_admin", "is_superuser")
+
+
+def identity_claims(user: Any) -> Dict[str, Any]:
+    """
+    Claims that let a token stand in for its user, empty unless STATELESS_AUTH.
+    """
+    if not settings.STATELESS_AUTH:
+        return {}
+    claims = {name: bool(getattr(user, name, False)) for name in IDENTITY_CLAIMS}
+    claims["uid"] = str(user.id)
+    return claims
+
 
 def create_access_token(
     subject: Union[str, Any], expires_delta: Optional[timedelta] = None
@@ -41,4 +57,11 @@ def get_password_hash(password: str) -> str:
     """
     Hash a password.
     """
-    return pwd_context.hash(password) 
\ No newline at end of file
+    return pwd_context.hash(password) 
+
+
+def password_needs_rehash(hashed_password: str) -> bool:
+    """
+    Check if a hash was made with other cost parameters than the current ones.
+    """
+    return pwd_context.needs_update(hashed_password)
@@ -1,43 +1,74 @@
-from typing import Callable
+from typing import Dict, Optional
 from fastapi import FastAPI
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.requests import Request
-from starlette.responses import Response
-
-class SecurityHeadersMiddleware(BaseHTTPMiddleware):
-    """Middleware to add security headers to responses."""
-    
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        response = await call_next(request)
-        
-        # Add security headers
-        response.headers["X-Content-Type-Options"] = "nosniff"
-        response.headers["X-Frame-Options"] = "DENY"
-        response.headers["X-XSS-Protection"] = "1; mode=block"
-        response.headers["Strict-Transport-Security"] = "max-age=31536000; includeSubDomains"
-        response.headers["Content-Security-Policy"] = (
-            "default-src 'self'; "
-            "img-src 'self' data: https:; "
-            "font-src 'self' https:; "
-            "style-src 'self' 'unsafe-inline' https:; "
-            "script-src 'self' 'unsafe-inline' 'unsafe-eval' https:; "
-            "connect-src 'self' https:;"
-        )
-        response.headers["Referrer-Policy"] = "strict-origin-when-cross-origin"
-        response.headers["Permissions-Policy"] = (
-            "accelerometer=(), "
-            "camera=(), "
-            "geolocation=(), "
-            "gyroscope=(), "
-            "magnetometer=(), "
-            "microphone=(), "
-            "payment=(), "
-            "usb=()"
-        )
-        
-        return response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SECURITY_HEADERS = {
+    "X-Content-Type-Options": "nosniff",
+    "X-Frame-Options": "DENY",
+    "X-XSS-Protection": "1; mode=block",
+    "Strict-Transport-Security": "max-age=31536000; includeSubDomains",
+    "Content-Security-Policy": (
+        "default-src 'self'; "
+        "img-src 'self' data: https:; "
+        "font-src 'self' https:; "
+        "style-src 'self' 'unsafe-inline' https:; "
+        "script-src 'self' 'unsafe-inline' 'unsafe-eval' https:; "
+        "connect-src 'self' https:;"
+    ),
+    "Referrer-Policy": "strict-origin-when-cross-origin",
+    "Permissions-Policy": (
+        "accelerometer=(), "
+        "camera=(), "
+        "geolocation=(), "
+        "gyroscope=(), "
+        "magnetometer=(), "
+        "microphone=(), "
+        "payment=(), "
+        "usb=()"
+    ),
+}
+
+
+class SecurityHeadersMiddleware:
+    """
+    Middleware to add security headers to responses.
+
+    Plain ASGI: the headers are encoded once and appended to the start
+    message of each response, replacing any the application set itself.
+    Response bodies, streamed ones included, pass through untouched.
+    """
+
+    def __init__(self, app: ASGIApp, headers: Optional[Dict[str, str]] = None):
+        """
+        Initialize security headers middleware.
+
+        Args:
+            app: The ASGI application
+            headers: Headers to add (default: SECURITY_HEADERS)
+        """
+        self.app = app
+        self.raw_headers = [
+            (name.lower().encode("latin-1"), value.encode("latin-1"))
+            for name, value in (headers or SECURITY_HEADERS).items()
+        ]
+        self.names = {name for name, _ in self.raw_headers}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = [
+                    header for header in message.get("headers", []) if header[0] not in self.names
+                ]
+                message["headers"] = headers + self.raw_headers
+            await send(message)
+
+        await self.app(scope, receive, send_with_headers)
 
 
 def add_security_headers(app: FastAPI) -> None:
     """Add security headers middleware to FastAPI application."""
-    app.add_middleware(SecurityHeadersMiddleware) 
\ No newline at end of file
+    app.add_middleware(SecurityHeadersMiddleware)
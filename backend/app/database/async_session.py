@@ -0,0 +1,79 @@
+from typing import AsyncGenerator, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from app.core.config import settings
+from app.database.pool import get_engine_options
+
+# Async driver for each sync URL scheme
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+    "sqlite+pysqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(url: str) -> str:
+    """
+    Turn a sync database URL into one using an async driver.
+
+    URLs that already name an async driver are returned unchanged.
+    """
+    parsed = make_url(url)
+    drivername = ASYNC_DRIVERS.get(parsed.drivername, parsed.drivername)
+    return parsed.set(drivername=drivername).render_as_string(hide_password=False)
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_engine_if_started() -> Optional[AsyncEngine]:
+    """
+    Get the async engine if something has already created it.
+    """
+    return _async_engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Get the async engine, creating it on first use.
+
+    The engine is built lazily so the async driver is only imported by
+    deployments that enable the async layer.
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = settings.ASYNC_SQLALCHEMY_DATABASE_URI or get_async_database_url(
+            settings.SQLALCHEMY_DATABASE_URI
+        )
+        _async_engine = create_async_engine(url, **get_engine_options(url, is_async=True))
+    return _async_engine
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """
+    Create a new async session.
+
+    Objects stay usable after commit, since lazy refreshes would need
+    an explicit await.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            get_async_engine(), autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory()
+
+
+# Dependency to get async DB session
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -5,4 +5,7 @@ from app.models.user import User  # noqa
 from app.models.npo import NPO  # noqa
 from app.models.donation import Donation  # noqa
 from app.models.campaign import Campaign  # noqa
-from app.models.token import Token  # noqa 
\ No newline at end of file
+from app.models.token import Token  # noqa 
+from app.models.job import Job  # noqa
+from app.models.counter_shard import CounterShard  # noqa
+from app.models.campaign_stats import CampaignStats, CampaignDonor  # noqa
@@ -0,0 +1,168 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from app.core.config import settings
+
+# Upper bounds, in seconds, of the checkout wait histogram buckets
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolTelemetry:
+    """
+    Counters for one connection pool.
+
+    Checkout waits are kept as a cumulative histogram, so a latency spike
+    can be told apart from pool exhaustion: waits pile up in the upper
+    buckets and ``timeouts`` grows once the pool and its overflow are used up.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.overflow_opened = 0
+        self.wait_sum = 0.0
+        self.wait_max = 0.0
+        self._buckets: List[int] = [0] * (len(WAIT_BUCKETS) + 1)
+
+    def record_checkout(self, wait: float, overflow: bool) -> None:
+        """Record a successful checkout and how long it waited."""
+        with self._lock:
+            self.checkouts += 1
+            self.wait_sum += wait
+            self.wait_max = max(self.wait_max, wait)
+            self._buckets[bisect.bisect_left(WAIT_BUCKETS, wait)] += 1
+            if overflow:
+                self.overflow_opened += 1
+
+    def record_timeout(self) -> None:
+        """Record a checkout that gave up after the pool timeout."""
+        with self._lock:
+            self.timeouts += 1
+
+    def histogram(self) -> Dict[str, int]:
+        """Get the cumulative wait histogram keyed by bucket upper bound."""
+        histogram: Dict[str, int] = {}
+        total = 0
+        for bound, count in zip(WAIT_BUCKETS + (float("inf"),), self._buckets):
+            total += count
+            histogram["+Inf" if bound == float("inf") else str(bound)] = total
+        return histogram
+
+
+class _InstrumentedPoolMixin:
+    """Times checkouts of a queue pool and records them on ``self.telemetry``."""
+
+    telemetry: PoolTelemetry
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.telemetry = PoolTelemetry()
+
+    def recreate(self):
+        # Keep counting across dispose()
+        pool = super().recreate()
+        pool.telemetry = self.telemetry
+        return pool
+
+    def _do_get(self):
+        overflow = self._overflow
+        started = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.telemetry.record_timeout()
+            raise
+        self.telemetry.record_checkout(
+            time.perf_counter() - started, self._overflow > max(overflow, 0)
+        )
+        return connection
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def get_engine_options(url: str, *, is_async: bool = False) -> Dict[str, Any]:
+    """
+    Build ``create_engine`` keyword arguments from the pool settings.
+
+    In-memory SQLite databases keep SQLAlchemy's default pool, since every
+    connection would otherwise see a different database.
+
+    Args:
+        url: The database URL
+        is_async: Whether the engine uses an async driver
+
+    Returns:
+        Keyword arguments for ``create_engine`` or ``create_async_engine``
+    """
+    parsed = make_url(url)
+    options: Dict[str, Any] = {
+        # Pessimistic pings each connection on checkout; optimistic relies on
+        # recycling and invalidates the pool when a query hits a dead connection
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "pessimistic",
+    }
+
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedAsyncAdaptedQueuePool if is_async else InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+
+    if settings.DB_STATEMENT_TIMEOUT_MS and parsed.get_backend_name() == "postgresql":
+        timeout = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        if is_async:
+            options["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            options["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+
+    return options
+
+
+def get_pool_metrics(pool: Any) -> Dict[str, Any]:
+    """
+    Get occupancy and checkout telemetry of a pool.
+
+    Args:
+        pool: The ``engine.pool`` to inspect
+
+    Returns:
+        Pool size, in-use and idle connections, overflow and wait figures
+    """
+    metrics: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        metrics.update(
+            size=pool.size(),
+            in_use=pool.checkedout(),
+            idle=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+
+    telemetry = getattr(pool, "telemetry", None)
+    if telemetry is not None:
+        metrics.update(
+            checkouts=telemetry.checkouts,
+            timeouts=telemetry.timeouts,
+            overflow_opened=telemetry.overflow_opened,
+            wait_avg_seconds=telemetry.wait_sum / telemetry.checkouts if telemetry.checkouts else 0.0,
+            wait_max_seconds=telemetry.wait_max,
+            wait_histogram=telemetry.histogram(),
+        )
+    return metrics
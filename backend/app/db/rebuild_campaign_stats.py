@@ -0,0 +1,26 @@
+"""
+Recompute the campaign_stats table from the donations table.
+
+    python -m app.db.rebuild_campaign_stats
+    python -m app.db.rebuild_campaign_stats --campaign-id 42
+"""
+import argparse
+from typing import Optional
+
+from app.database.session import SessionLocal
+from app.services import campaign_stats_service
+
+
+def rebuild_campaign_stats(campaign_id: Optional[int] = None) -> int:
+    db = SessionLocal()
+    try:
+        return campaign_stats_service.rebuild(db, campaign_id=campaign_id)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild campaign donation stats")
+    parser.add_argument("--campaign-id", type=int, help="Only rebuild this campaign")
+    args = parser.parse_args()
+    print(f"Rebuilt stats for {rebuild_campaign_stats(args.campaign_id)} campaigns")
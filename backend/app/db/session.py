@@ -1,11 +1,12 @@
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.database.pool import get_engine_options
 
 # Create database engine
 engine = create_engine(
     settings.get_database_url,
-    pool_pre_ping=True
+    **get_engine_options(settings.get_database_url)
 )
 
 # Create SessionLocal class
@@ -4,16 +4,32 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 
 from app.api.api_v1.api import api_router
+from app.api.pagination import NEXT_CURSOR_HEADER
 from app.core.config import settings
-from app.core.rate_limit import add_rate_limit
-from app.core.logging import setup_logging
+from app.core.hashing import password_hasher
+from app.api.rate_limits import create_policies
+from app.core.rate_limit import RATE_LIMIT_HEADERS, add_rate_limit
+from app.core import logging as app_logging
+from app.core.logging import add_request_context, setup_logging
 from app.core.security_headers import add_security_headers
 from pathlib import Path
 from app.database.base import Base
-from app.database.session import engine
+from app.database.session import engine, SessionLocal
+from app.blockchain.xrpl_client import xrpl_client
+from app.services import blockchain_service
+from app.workers.reconciliation import reconciliation_worker
+from app.workers import donation_submitter, tasks  # noqa: F401 - registers handlers
+from app.workers.runtime import job_worker
 
 # Set up logging
-setup_logging(log_path=Path("logs/app.log"))
+setup_logging(
+    log_path=Path("logs/app.log"),
+    level=settings.LOG_LEVEL,
+    json=settings.LOG_FORMAT == "json",
+    background=settings.LOG_ASYNC,
+    max_queue=settings.LOG_QUEUE_SIZE,
+    overflow=settings.LOG_QUEUE_OVERFLOW,
+)
 
 # Create the database tables
 Base.metadata.create_all(bind=engine)
@@ -32,13 +48,14 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],  # Allows all methods
     allow_headers=["*"],  # Allows all headers
+    expose_headers=[NEXT_CURSOR_HEADER, *RATE_LIMIT_HEADERS, "Retry-After", "X-Request-ID"],
 )
 
 # Add security headers
 add_security_headers(app)
 
 # Add rate limiting
-add_rate_limit(app)
+add_rate_limit(app, policies=create_policies())
 
 # Add trusted hosts
 app.add_middleware(
@@ -46,9 +63,41 @@ app.add_middleware(
     allowed_hosts=["*"]  # In production, replace with actual domain
 )
 
+# Tag log records with request id, user and route; outermost, so the
+# logged latency covers every middleware
+add_request_context(app, log_requests=settings.LOG_REQUESTS)
+
 # Include routers
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+@app.on_event("startup")
+async def startup_event():
+    if settings.XRPL_SUBSCRIPTIONS_ENABLED:
+        db = SessionLocal()
+        try:
+            await blockchain_service.start_ledger_subscriptions(db)
+        finally:
+            db.close()
+    if settings.RECONCILIATION_ENABLED:
+        await reconciliation_worker.start()
+    if settings.JOB_WORKERS_IN_API:
+        db = SessionLocal()
+        try:
+            tasks.schedule_periodic_jobs(db)
+        finally:
+            db.close()
+        await job_worker.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await job_worker.stop()
+    await reconciliation_worker.stop()
+    await blockchain_service.stop_ledger_subscriptions()
+    await xrpl_client.close()
+    password_hasher.shutdown()
+    if app_logging.log_sink is not None:
+        app_logging.log_sink.stop()
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Non-Profit Donation Platform API"}
@@ -1,4 +1,7 @@
 from .user import User
 from .npo import NPO
 from .donation import Donation
-from .campaign import Campaign 
\ No newline at end of file
+from .campaign import Campaign 
+from .job import Job
+from .counter_shard import CounterShard
+from .campaign_stats import CampaignStats, CampaignDonor
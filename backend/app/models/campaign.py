@@ -1,12 +1,26 @@
 from datetime import datetime
-from sqlalchemy import Boolean, Column, String, Integer, DateTime, ForeignKey, Text, Float
+from sqlalchemy import Boolean, Column, String, Integer, DateTime, ForeignKey, Text, Float, Index, text
 from sqlalchemy.orm import relationship
 
-from app.database.session import Base
+from app.database.base_class import Base
 
 
 class Campaign(Base):
     __tablename__ = "campaigns"
+    __table_args__ = (
+        # Keyset pagination order, see app.services.pagination
+        Index("ix_campaigns_created_at_id", "created_at", "id"),
+        Index("ix_campaigns_npo_created_at_id", "npo_id", "created_at", "id"),
+        # Campaigns running now (get_campaigns(active_only=True))
+        Index("ix_campaigns_end_date_start_date", "end_date", "start_date"),
+        # Active campaigns past their end date (check_campaign_status)
+        Index(
+            "ix_campaigns_active_end_date",
+            "end_date",
+            postgresql_where=text("is_active"),
+            sqlite_where=text("is_active = 1"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String, index=True, nullable=False)
@@ -19,6 +33,8 @@ class Campaign(Base):
     # Campaign goals and status
     goal_amount = Column(Float, nullable=False)
     current_amount = Column(Float, default=0.0)
+    # Increments still on counter shards, see counter_service.apply_shard_totals
+    pending_total = 0.0
     start_date = Column(DateTime, nullable=False)
     end_date = Column(DateTime, nullable=True)
     is_active = Column(Boolean, default=True)
@@ -30,12 +46,15 @@ class Campaign(Base):
     token_details = Column(String, nullable=True)  # JSON string with token details
     
     # Nonprofit organization that owns this campaign
-    npo_id = Column(Integer, ForeignKey("non_profit_orgs.id"), nullable=False)
-    npo = relationship("NonProfitOrg", back_populates="campaigns")
+    npo_id = Column(String, ForeignKey("npos.id"), nullable=False)
+    npo = relationship("NPO")
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
-    
-    # Relationships
-    donations = relationship("Donation", back_populates="campaign") 
\ No newline at end of file
+ 
+
+    @property
+    def raised_amount(self) -> float:
+        """Raised amount including increments still on counter shards."""
+        return (self.current_amount or 0.0) + self.pending_total
@@ -0,0 +1,36 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy.sql import func
+
+from app.database.base_class import Base
+
+
+class CampaignStats(Base):
+    """
+    Donation counts of a campaign, maintained as donations change.
+
+    ``campaign_id`` has no foreign key, like ``donations.campaign_id``.
+    """
+    __tablename__ = "campaign_stats"
+
+    campaign_id = Column(Integer, primary_key=True)
+    total_donations = Column(Integer, nullable=False, default=0)
+    completed_donations = Column(Integer, nullable=False, default=0)
+    total_donors = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def __repr__(self):
+        return f"<CampaignStats(campaign_id={self.campaign_id}, donations={self.total_donations}, donors={self.total_donors})>"
+
+
+class CampaignDonor(Base):
+    """
+    How many donations a donor has made to a campaign.
+
+    Keeps ``CampaignStats.total_donors`` exact without a COUNT(DISTINCT):
+    a donor counts once while this row exists.
+    """
+    __tablename__ = "campaign_donors"
+
+    campaign_id = Column(Integer, primary_key=True)
+    donor_id = Column(String, primary_key=True)
+    donations = Column(Integer, nullable=False, default=0)
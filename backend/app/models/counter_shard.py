@@ -0,0 +1,22 @@
+from sqlalchemy import Column, Integer, String, Float
+
+from app.database.base_class import Base
+
+
+class CounterShard(Base):
+    """
+    One slice of a sharded running total.
+
+    The real total of a sharded counter is the value on its owner row
+    (``campaigns.current_amount`` or ``npos.total_received``) plus the sum
+    of its shards; compaction periodically folds the shards back.
+    """
+    __tablename__ = "counter_shards"
+
+    owner_type = Column(String, primary_key=True)  # campaign, npo
+    owner_id = Column(String, primary_key=True)
+    shard = Column(Integer, primary_key=True)
+    value = Column(Float, nullable=False, default=0.0)
+
+    def __repr__(self):
+        return f"<CounterShard(owner={self.owner_type}:{self.owner_id}, shard={self.shard}, value={self.value})>"
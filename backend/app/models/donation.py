@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 from datetime import datetime
-from sqlalchemy import Column, String, Float, DateTime, ForeignKey
+from sqlalchemy import Column, String, Float, Integer, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -8,13 +8,33 @@ from app.database.base_class import Base
 
 class Donation(Base):
     __tablename__ = "donations"
+    __table_args__ = (
+        # Keyset pagination order, see app.services.pagination
+        Index("ix_donations_created_at_id", "created_at", "id"),
+        # Filtered donation lists, in pagination order
+        Index("ix_donations_npo_created_at_id", "npo_id", "created_at", "id"),
+        Index("ix_donations_campaign_created_at_id", "campaign_id", "created_at", "id"),
+        Index("ix_donations_donor_created_at_id", "donor_id", "created_at", "id"),
+        # Reconciliation reads pending ledger transactions in ID order
+        Index(
+            "ix_donations_pending_tx_hash",
+            "id",
+            "transaction_hash",
+            postgresql_where=text("status = 'pending' AND transaction_hash IS NOT NULL"),
+            sqlite_where=text("status = 'pending' AND transaction_hash IS NOT NULL"),
+        ),
+    )
 
     id = Column(String, primary_key=True, index=True)
     amount = Column(Float, nullable=False)
     donor_id = Column(String, ForeignKey("users.id"))
     npo_id = Column(String, ForeignKey("npos.id"))
-    transaction_hash = Column(String, unique=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    campaign_id = Column(Integer, index=True, nullable=True)
+    status = Column(String, index=True, nullable=False, default="pending")  # pending, completed, failed
+    # Mapped as tx_hash; the column keeps its original transaction_hash name
+    tx_hash = Column("transaction_hash", String, unique=True)
+    # Set in Python so SQLite stores the same format keyset cursors bind
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now())
 
     # Relationships will be added later to avoid circular imports
     # donor = relationship("User", back_populates="donations")
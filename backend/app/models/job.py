@@ -0,0 +1,38 @@
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+
+from app.database.base_class import Base
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+    __table_args__ = (
+        # Claim order: ready jobs of a queue by priority, then age
+        Index("ix_jobs_claim", "queue", "status", "run_at", "priority"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    queue = Column(String, index=True, nullable=False)
+    payload = Column(Text, nullable=False)  # JSON string
+    priority = Column(Integer, nullable=False, default=0)  # Higher runs first
+
+    # queued, running, done, failed
+    status = Column(String, index=True, nullable=False, default="queued")
+    attempts = Column(Integer, nullable=False, default=0)
+    max_attempts = Column(Integer, nullable=False, default=5)
+    last_error = Column(Text, nullable=True)
+
+    # Scheduling and visibility timeout
+    run_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(DateTime, nullable=True)
+
+    # Timestamps
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+
+    def __repr__(self):
+        return f"<Job(id={self.id}, queue={self.queue}, status={self.status})>"
@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 from datetime import datetime
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Text, Float
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Text, Float, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -12,6 +12,10 @@ if TYPE_CHECKING:
 
 class NPO(Base):
     __tablename__ = "npos"
+    __table_args__ = (
+        # Keyset pagination order, see app.services.pagination
+        Index("ix_npos_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, index=True)
     name = Column(String, index=True)
@@ -34,10 +38,13 @@ class NPO(Base):
     
     # Statistics
     total_received = Column(Float, default=0.0)
+    # Increments still on counter shards, see counter_service.apply_shard_totals
+    pending_total = 0.0
     total_campaigns = Column(Integer, default=0)
     
     # Account creation and update timestamps
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set in Python so SQLite stores the same format keyset cursors bind
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
@@ -46,5 +53,10 @@ class NPO(Base):
     # received_donations = relationship("Donation", back_populates="npo")
     # campaigns = relationship("Campaign", back_populates="npo")
 
+    @property
+    def received_amount(self) -> float:
+        """Total received including increments still on counter shards."""
+        return (self.total_received or 0.0) + self.pending_total
+
     def __repr__(self):
         return f"<NPO(name={self.name}, email={self.email}, xrpl_address={self.xrpl_address})>" 
\ No newline at end of file
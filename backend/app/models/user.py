@@ -1,5 +1,6 @@
 from typing import TYPE_CHECKING
-from sqlalchemy import Boolean, Column, Integer, String, DateTime
+from datetime import datetime
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -11,6 +12,10 @@ if TYPE_CHECKING:
 
 class User(Base):
     __tablename__ = "users"
+    __table_args__ = (
+        # Keyset pagination order, see app.services.pagination
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id = Column(String, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
@@ -18,7 +23,8 @@ class User(Base):
     hashed_password = Column(String, nullable=False)
     is_nonprofit = Column(Boolean, default=False)
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Set in Python so SQLite stores the same format keyset cursors bind
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     xrpl_address = Column(String, unique=True)
 
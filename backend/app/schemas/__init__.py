@@ -3,4 +3,11 @@ from app.schemas.user import User, UserCreate, UserUpdate, UserInDB
 from app.schemas.token import Token, TokenCreate, TokenPayload
 from app.schemas.npo import NPO, NPOCreate, NPOUpdate
 from app.schemas.campaign import Campaign, CampaignCreate, CampaignUpdate
-from app.schemas.donation import Donation, DonationCreate, DonationUpdate 
\ No newline at end of file
+from app.schemas.donation import (
+    Donation,
+    DonationCreate,
+    DonationUpdate,
+    DonationImportRow,
+    DonationImportError,
+    DonationImportResult,
+) 
\ No newline at end of file
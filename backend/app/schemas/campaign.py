@@ -1,6 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import AliasChoices, BaseModel, Field, HttpUrl
 from decimal import Decimal
 
 class CampaignBase(BaseModel):
@@ -40,7 +40,8 @@ class Campaign(CampaignBase):
     """Complete campaign schema."""
     id: int
     npo_id: int
-    current_amount: Decimal = 0
+    # Includes increments still on counter shards when read from a campaign row
+    current_amount: Decimal = Field(0, validation_alias=AliasChoices("raised_amount", "current_amount"))
     is_active: bool = True
     created_at: datetime
     updated_at: Optional[datetime] = None
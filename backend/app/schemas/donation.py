@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from decimal import Decimal
 from pydantic import BaseModel, Field
@@ -33,4 +33,28 @@ class Donation(DonationBase):
     updated_at: Optional[datetime] = None
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True 
+
+
+class DonationImportRow(BaseModel):
+    """Schema for one donation of a bulk import."""
+    amount: Decimal = Field(..., gt=0)
+    npo_id: str
+    campaign_id: Optional[int] = None
+    donor_id: Optional[str] = None
+    status: str = Field("completed", pattern="^(pending|completed)$")
+    xrpl_transaction_hash: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+
+class DonationImportError(BaseModel):
+    """A rejected row of a bulk import."""
+    index: int
+    error: str
+
+
+class DonationImportResult(BaseModel):
+    """Outcome of a bulk import."""
+    created: int
+    ids: List[str]
+    errors: List[DonationImportError]
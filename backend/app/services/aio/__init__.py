@@ -0,0 +1,63 @@
+"""
+Async service layer.
+
+``users``, ``npos``, ``campaigns`` and ``donations`` expose the database
+functions of the sync services as coroutines. With ``ASYNC_DB_ENABLED`` they
+are the native ``AsyncSession`` services of this package; otherwise they run
+the sync services in a worker thread. Either way, take the session from
+``deps.get_service_db``, which yields the matching kind.
+"""
+import asyncio
+import functools
+from types import ModuleType
+from typing import Any, Callable, Union
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.services import campaign_service as sync_campaign_service
+from app.services import donation_service as sync_donation_service
+from app.services import npo_service as sync_npo_service
+from app.services import user_service as sync_user_service
+from app.services.aio import campaign_service, donation_service, npo_service, user_service
+
+
+class ThreadedService:
+    """Awaitable facade running the functions of a sync service module in a thread."""
+
+    def __init__(self, module: ModuleType):
+        self._module = module
+
+    def __getattr__(self, name: str) -> Any:
+        func = getattr(self._module, name)
+        if not callable(func):
+            return func
+
+        @functools.wraps(func)
+        async def call(*args: Any, **kwargs: Any) -> Any:
+            return await asyncio.to_thread(func, *args, **kwargs)
+
+        setattr(self, name, call)
+        return call
+
+
+def _select(sync_module: ModuleType, async_module: ModuleType) -> Any:
+    return async_module if settings.ASYNC_DB_ENABLED else ThreadedService(sync_module)
+
+
+async def run_sync(
+    db: Union[AsyncSession, Session], func: Callable[..., Any], *args: Any, **kwargs: Any
+) -> Any:
+    """
+    Await a sync service function, such as ``job_service.enqueue``, with either session kind.
+    """
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(lambda session: func(session, *args, **kwargs))
+    return await asyncio.to_thread(func, db, *args, **kwargs)
+
+
+users = _select(sync_user_service, user_service)
+npos = _select(sync_npo_service, npo_service)
+campaigns = _select(sync_campaign_service, campaign_service)
+donations = _select(sync_donation_service, donation_service)
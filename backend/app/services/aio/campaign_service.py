@@ -0,0 +1,167 @@
+from typing import Any, Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+
+from app.models.campaign import Campaign
+from app.models.campaign_stats import CampaignStats
+from app.models.npo import NPO
+from app.services import campaign_stats_service, pagination
+from app.services.aio import counter_service
+from app.services.campaign_service import add_to_npo_campaigns, invalidate_campaign, running_at
+
+
+async def get_campaign(db: AsyncSession, id: int) -> Optional[Campaign]:
+    """
+    Get a campaign by ID.
+    """
+    result = await db.execute(
+        select(Campaign, CampaignStats)
+        .outerjoin(CampaignStats, CampaignStats.campaign_id == Campaign.id)
+        .filter(Campaign.id == id)
+    )
+    row = result.first()
+    if not row:
+        return None
+    campaign = campaign_stats_service.attach_stats([row])[0]
+    await counter_service.apply_shard_totals(db, [campaign], owner_type=counter_service.CAMPAIGN)
+    return campaign
+
+
+async def get_campaigns(
+    db: AsyncSession, 
+    *, 
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    npo_id: Optional[int] = None,
+    active_only: bool = False,
+) -> List[Campaign]:
+    """
+    Get a list of campaigns with optional filtering.
+    """
+    query = select(Campaign, CampaignStats).outerjoin(
+        CampaignStats, CampaignStats.campaign_id == Campaign.id
+    )
+    
+    if npo_id is not None:
+        query = query.filter(Campaign.npo_id == npo_id)
+    
+    if active_only:
+        query = query.filter(*running_at(datetime.utcnow(), db.get_bind().dialect.name))
+    
+    result = await db.execute(
+        pagination.paginate(query, Campaign, skip=skip, cursor=cursor, limit=limit)
+    )
+    campaigns = campaign_stats_service.attach_stats(result.all())
+    await counter_service.apply_shard_totals(db, campaigns, owner_type=counter_service.CAMPAIGN)
+    return campaigns
+
+
+async def create_campaign(
+    db: AsyncSession, *, obj_in: Dict[str, Any]
+) -> Campaign:
+    """
+    Create a new campaign.
+    """
+    obj_in_data = jsonable_encoder(obj_in)
+    
+    # Verify NPO exists
+    npo = await db.get(NPO, obj_in_data["npo_id"])
+    if not npo:
+        raise ValueError("NPO not found")
+    
+    db_obj = Campaign(**obj_in_data)
+    db.add(db_obj)
+    
+    # Update NPO stats
+    await db.execute(add_to_npo_campaigns(npo.id, 1))
+    await db.commit()
+    await db.refresh(db_obj)
+    
+    return db_obj
+
+
+async def update_campaign(
+    db: AsyncSession, *, db_obj: Campaign, obj_in: Dict[str, Any]
+) -> Campaign:
+    """
+    Update a campaign.
+    """
+    obj_data = jsonable_encoder(db_obj)
+    
+    # Verify NPO exists if npo_id is being updated
+    if "npo_id" in obj_in and obj_in["npo_id"] != db_obj.npo_id:
+        npo = await db.get(NPO, obj_in["npo_id"])
+        if not npo:
+            raise ValueError("NPO not found")
+        
+        # Update old and new NPO stats
+        await db.execute(add_to_npo_campaigns(db_obj.npo_id, -1))
+        await db.execute(add_to_npo_campaigns(npo.id, 1))
+    
+    for field in obj_data:
+        if field in obj_in:
+            setattr(db_obj, field, obj_in[field])
+    
+    db.add(db_obj)
+    await db.commit()
+    invalidate_campaign(db_obj.id)
+    await db.refresh(db_obj)
+    return db_obj
+
+
+async def delete_campaign(db: AsyncSession, *, id: int) -> None:
+    """
+    Delete a campaign.
+    """
+    db_obj = await db.get(Campaign, id)
+    if db_obj:
+        # Update NPO stats
+        await db.execute(add_to_npo_campaigns(db_obj.npo_id, -1))
+        
+        await db.delete(db_obj)
+        await db.commit()
+        invalidate_campaign(id)
+
+
+async def check_campaign_status(db: AsyncSession) -> None:
+    """
+    Check and update campaign status based on end dates.
+    """
+    # Get all active campaigns with end dates in the past
+    now = datetime.utcnow()
+    result = await db.execute(
+        select(Campaign)
+        .filter(Campaign.is_active == True)
+        .filter(Campaign.end_date.isnot(None))
+        .filter(Campaign.end_date < now)
+    )
+    
+    # Deactivate expired campaigns
+    expired_campaigns = result.scalars().all()
+    for campaign in expired_campaigns:
+        campaign.is_active = False
+        db.add(campaign)
+    
+    await db.commit()
+    for campaign in expired_campaigns:
+        invalidate_campaign(campaign.id)
+
+
+async def get_campaigns_by_npo(
+    db: AsyncSession,
+    *,
+    npo_id: int,
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    active_only: bool = True,
+) -> List[Campaign]:
+    """
+    Get campaigns for a specific non-profit organization.
+    """
+    return await get_campaigns(
+        db, skip=skip, cursor=cursor, limit=limit, active_only=active_only, npo_id=npo_id
+    )
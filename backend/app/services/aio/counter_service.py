@@ -0,0 +1,36 @@
+from typing import Any, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.services import counter_service
+from app.services.counter_service import (  # noqa: F401
+    CAMPAIGN,
+    NPO_OWNER,
+    add_to_owner,
+    add_to_shard,
+    shard_for,
+)
+
+
+async def add(db: AsyncSession, *, owner_type: str, owner_id: Any, amount: float, key: Any) -> None:
+    """
+    Add to a campaign or NPO total without committing.
+    """
+    if settings.SHARDED_COUNTERS_ENABLED:
+        shard = shard_for(key, settings.COUNTER_SHARDS)
+        result = await db.execute(add_to_shard(owner_type, owner_id, shard, amount))
+        if result.rowcount:
+            return
+    await db.execute(add_to_owner(owner_type, owner_id, amount))
+
+
+async def apply_shard_totals(db: AsyncSession, objs: Sequence[Any], *, owner_type: str) -> None:
+    """
+    Set the pending shard values of loaded campaigns or NPOs.
+    """
+    if not settings.SHARDED_COUNTERS_ENABLED:
+        return
+    await db.run_sync(
+        lambda session: counter_service.apply_shard_totals(session, objs, owner_type=owner_type)
+    )
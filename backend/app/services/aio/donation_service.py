@@ -0,0 +1,263 @@
+from typing import Any, Dict, List, Optional, Union
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from fastapi.encoders import jsonable_encoder
+
+from app.models.donation import Donation
+from app.models.npo import NPO
+from app.models.campaign import Campaign
+from app.services import campaign_stats_service, pagination
+from app.services.aio import counter_service
+
+
+async def get_donation(db: AsyncSession, id: int) -> Optional[Donation]:
+    """
+    Get a donation by ID.
+    """
+    result = await db.execute(select(Donation).filter(Donation.id == id))
+    return result.scalars().first()
+
+
+async def get_campaign(db: AsyncSession, id: int) -> Optional[Campaign]:
+    """
+    Get a campaign by ID, with its NPO loaded.
+    """
+    result = await db.execute(
+        select(Campaign).options(selectinload(Campaign.npo)).filter(Campaign.id == id)
+    )
+    campaign = result.scalars().first()
+    await counter_service.apply_shard_totals(db, [campaign], owner_type=counter_service.CAMPAIGN)
+    return campaign
+
+
+async def get_donations(
+    db: AsyncSession,
+    *,
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    npo_id: Optional[int] = None,
+    campaign_id: Optional[int] = None,
+    donor_id: Optional[int] = None,
+) -> List[Donation]:
+    """
+    Get a list of donations with optional filtering.
+    """
+    query = select(Donation)
+    
+    if npo_id is not None:
+        query = query.filter(Donation.npo_id == npo_id)
+    if campaign_id is not None:
+        query = query.filter(Donation.campaign_id == campaign_id)
+    if donor_id is not None:
+        query = query.filter(Donation.donor_id == donor_id)
+    
+    result = await db.execute(
+        pagination.paginate(query, Donation, skip=skip, cursor=cursor, limit=limit)
+    )
+    return list(result.scalars().all())
+
+
+async def get_user_donations(
+    db: AsyncSession, 
+    *, 
+    user_id: int,
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    campaign_id: Optional[int] = None,
+    npo_id: Optional[int] = None
+) -> List[Donation]:
+    """
+    Get donations for a specific user.
+    """
+    return await get_donations(
+        db,
+        skip=skip,
+        cursor=cursor,
+        limit=limit,
+        npo_id=npo_id,
+        campaign_id=campaign_id,
+        donor_id=user_id,
+    )
+
+
+async def create_donation(
+    db: AsyncSession,
+    *,
+    obj_in: Dict[str, Any],
+    donor_id: int,
+    commit: bool = True,
+) -> Donation:
+    """
+    Create a new donation.
+    
+    With ``commit=False`` the donation is only flushed, so the caller can
+    commit it together with related rows.
+    """
+    obj_in_data = jsonable_encoder(obj_in)
+    obj_in_data["donor_id"] = donor_id
+    obj_in_data["status"] = "pending"  # Initial status
+    
+    # Verify NPO exists
+    npo = await db.get(NPO, obj_in_data["npo_id"])
+    if not npo:
+        raise ValueError("NPO not found")
+    
+    # Verify campaign exists if provided
+    if obj_in_data.get("campaign_id"):
+        result = await db.execute(
+            select(Campaign.id).filter(
+                Campaign.id == obj_in_data["campaign_id"],
+                Campaign.npo_id == obj_in_data["npo_id"]
+            )
+        )
+        if result.first() is None:
+            raise ValueError("Campaign not found or does not belong to the specified NPO")
+    
+    db_obj = Donation(**obj_in_data)
+    db.add(db_obj)
+    
+    # Update campaign amount if applicable, in the same transaction
+    if db_obj.campaign_id:
+        await db.flush()
+        await counter_service.add(
+            db,
+            owner_type=counter_service.CAMPAIGN,
+            owner_id=db_obj.campaign_id,
+            amount=db_obj.amount,
+            key=db_obj.id,
+        )
+        await db.run_sync(
+            lambda session: campaign_stats_service.record_donation_created(
+                session, campaign_id=db_obj.campaign_id, donor_id=db_obj.donor_id
+            )
+        )
+    
+    if not commit:
+        await db.flush()
+        return db_obj
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+
+async def update_donation(
+    db: AsyncSession,
+    *,
+    db_obj: Donation,
+    obj_in: Union[Dict[str, Any], Any],
+) -> Donation:
+    """
+    Update a donation.
+    """
+    obj_data = jsonable_encoder(db_obj)
+    update_data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+    
+    for field in obj_data:
+        if field in update_data:
+            setattr(db_obj, field, update_data[field])
+    
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+
+async def refresh_donation(db: AsyncSession, *, donation: Donation) -> Donation:
+    """
+    Reload a donation from the database.
+    """
+    await db.refresh(donation)
+    return donation
+
+
+async def delete_donation(db: AsyncSession, *, id: int) -> None:
+    """
+    Delete a donation.
+    """
+    db_obj = await db.get(Donation, id)
+    if db_obj:
+        # Update campaign amount if applicable
+        if db_obj.campaign_id and db_obj.status == "completed":
+            await counter_service.add(
+                db,
+                owner_type=counter_service.CAMPAIGN,
+                owner_id=db_obj.campaign_id,
+                amount=-db_obj.amount,
+                key=db_obj.id,
+            )
+        if db_obj.campaign_id:
+            await db.run_sync(
+                lambda session: campaign_stats_service.record_donation_deleted(
+                    session,
+                    campaign_id=db_obj.campaign_id,
+                    donor_id=db_obj.donor_id,
+                    completed=db_obj.status == "completed",
+                )
+            )
+        
+        await db.delete(db_obj)
+        await db.commit()
+
+
+async def _resolve_pending(db: AsyncSession, donation: Donation, status: str) -> bool:
+    """
+    Move a pending donation to ``status`` without committing.
+
+    See ``app.services.donation_service._resolve_pending``.
+    """
+    result = await db.execute(
+        update(Donation)
+        .where(Donation.id == donation.id, Donation.status == "pending")
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+
+    if status == "completed":
+        if donation.campaign_id:
+            await db.run_sync(
+                lambda session: campaign_stats_service.record_donation_completed(
+                    session, campaign_id=donation.campaign_id
+                )
+            )
+
+        # Update NPO stats
+        if donation.npo_id:
+            await counter_service.add(
+                db,
+                owner_type=counter_service.NPO_OWNER,
+                owner_id=donation.npo_id,
+                amount=donation.amount,
+                key=donation.id,
+            )
+    return True
+
+
+async def resolve_donation(
+    db: AsyncSession, *, donation_id: int, status: str
+) -> Optional[Donation]:
+    """
+    Apply a ledger status to a donation if it is still pending.
+    """
+    donation = await get_donation(db, id=donation_id)
+    if not donation:
+        return None
+    
+    await _resolve_pending(db, donation, status)
+    await db.commit()
+    await db.refresh(donation)
+    return donation
+
+
+async def process_donation_completion(
+    db: AsyncSession, *, donation_id: int
+) -> Optional[Donation]:
+    """
+    Process a donation completion.
+    """
+    return await resolve_donation(db, donation_id=donation_id, status="completed")
@@ -0,0 +1,152 @@
+from typing import Any, Dict, List, Optional, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi.encoders import jsonable_encoder
+
+from app.models.npo import NPO
+from app.models.campaign import Campaign
+from app.models.campaign_stats import CampaignStats
+from app.services import campaign_stats_service, pagination
+from app.services.aio import counter_service
+from app.services.npo_service import invalidate_npo
+
+
+async def get_npo(db: AsyncSession, id: int) -> Optional[NPO]:
+    """
+    Get a non-profit organization by ID.
+    """
+    result = await db.execute(select(NPO).filter(NPO.id == id))
+    npo = result.scalars().first()
+    await counter_service.apply_shard_totals(db, [npo], owner_type=counter_service.NPO_OWNER)
+    return npo
+
+
+async def get_npo_by_name(db: AsyncSession, name: str) -> Optional[NPO]:
+    """
+    Get a non-profit organization by name.
+    """
+    result = await db.execute(select(NPO).filter(NPO.name == name))
+    return result.scalars().first()
+
+
+async def get_npos(
+    db: AsyncSession, 
+    *, 
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    verified_only: bool = True
+) -> List[NPO]:
+    """
+    Get multiple non-profit organizations with optional filtering.
+    """
+    query = select(NPO)
+    
+    if verified_only:
+        query = query.filter(NPO.is_verified == True)
+    
+    result = await db.execute(pagination.paginate(query, NPO, skip=skip, cursor=cursor, limit=limit))
+    npos = list(result.scalars().all())
+    await counter_service.apply_shard_totals(db, npos, owner_type=counter_service.NPO_OWNER)
+    return npos
+
+
+async def create_npo(
+    db: AsyncSession, *, obj_in: Dict[str, Any]
+) -> NPO:
+    """
+    Create a new non-profit organization.
+    """
+    obj_in_data = jsonable_encoder(obj_in)
+    db_obj = NPO(**obj_in_data)
+    
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    return db_obj
+
+
+async def update_npo(
+    db: AsyncSession, *, db_obj: NPO, obj_in: Union[Dict[str, Any], Any]
+) -> NPO:
+    """
+    Update a non-profit organization.
+    """
+    obj_data = jsonable_encoder(db_obj)
+    if isinstance(obj_in, dict):
+        update_data = obj_in
+    else:
+        update_data = obj_in.dict(exclude_unset=True)
+    
+    old_name = db_obj.name
+    for field in obj_data:
+        if field in update_data:
+            setattr(db_obj, field, update_data[field])
+    
+    db.add(db_obj)
+    await db.commit()
+    invalidate_npo(db_obj, old_name)
+    await db.refresh(db_obj)
+    return db_obj
+
+
+async def add_proof(
+    db: AsyncSession, *, npo: NPO, description: str, url: str
+) -> NPO:
+    """
+    Add a proof of fund utilization.
+    """
+    npo.verification_documents = url
+    db.add(npo)
+    await db.commit()
+    invalidate_npo(npo)
+    await db.refresh(npo)
+    return npo
+
+
+async def get_npo_campaigns(
+    db: AsyncSession, 
+    *, 
+    npo_id: int,
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    active_only: bool = True
+) -> List[Campaign]:
+    """
+    Get campaigns for a specific non-profit organization.
+    """
+    query = (
+        select(Campaign, CampaignStats)
+        .outerjoin(CampaignStats, CampaignStats.campaign_id == Campaign.id)
+        .filter(Campaign.npo_id == npo_id)
+    )
+    
+    if active_only:
+        query = query.filter(Campaign.is_active == True)
+    
+    result = await db.execute(
+        pagination.paginate(query, Campaign, skip=skip, cursor=cursor, limit=limit)
+    )
+    campaigns = campaign_stats_service.attach_stats(result.all())
+    await counter_service.apply_shard_totals(db, campaigns, owner_type=counter_service.CAMPAIGN)
+    return campaigns
+
+
+async def get_npo_by_owner(db: AsyncSession, owner_id: int) -> Optional[NPO]:
+    """
+    Get a non-profit organization by owner ID.
+    """
+    result = await db.execute(select(NPO).filter(NPO.owner_id == owner_id))
+    return result.scalars().first()
+
+
+async def remove_npo(db: AsyncSession, *, id: int) -> NPO:
+    """
+    Remove a non-profit organization.
+    """
+    obj = await db.get(NPO, id)
+    await db.delete(obj)
+    await db.commit()
+    invalidate_npo(obj)
+    return obj
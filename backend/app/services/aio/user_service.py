@@ -0,0 +1,98 @@
+from typing import Any, Dict, Optional, Union
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.hashing import password_hasher
+from app.models.user import User
+from app.services import pagination
+from app.services.user_service import (  # noqa: F401
+    invalidate_identity,
+    is_active,
+    is_admin,
+    schedule_rehash,
+)
+
+
+async def get_user(db: AsyncSession, id: int) -> Optional[User]:
+    """
+    Get a user by ID.
+    """
+    result = await db.execute(select(User).filter(User.id == id))
+    return result.scalars().first()
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """
+    Get a user by email.
+    """
+    result = await db.execute(select(User).filter(User.email == email))
+    return result.scalars().first()
+
+
+async def get_users(
+    db: AsyncSession, *, skip: Optional[int] = None, cursor: Optional[str] = None, limit: int = 100
+) -> list[User]:
+    """
+    Get multiple users.
+    """
+    result = await db.execute(
+        pagination.paginate(select(User), User, skip=skip, cursor=cursor, limit=limit)
+    )
+    return list(result.scalars().all())
+
+
+async def create_user(db: AsyncSession, *, user_in: Dict[str, Any]) -> User:
+    """
+    Create a new user.
+    """
+    hashed_password = await password_hasher.hash(user_in["password"])
+    db_user = User(
+        email=user_in["email"],
+        hashed_password=hashed_password,
+        full_name=user_in.get("full_name"),
+        is_admin=user_in.get("is_admin", False),
+        is_active=user_in.get("is_active", True),
+        xrpl_address=user_in.get("xrpl_address")
+    )
+    db.add(db_user)
+    await db.commit()
+    await db.refresh(db_user)
+    return db_user
+
+
+async def update_user(
+    db: AsyncSession, *, db_obj: User, obj_in: Union[Dict[str, Any], Any]
+) -> User:
+    """
+    Update a user.
+    """
+    update_data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+    old_email = db_obj.email
+    
+    if "password" in update_data and update_data["password"]:
+        update_data["hashed_password"] = await password_hasher.hash(update_data["password"])
+        del update_data["password"]
+    
+    for field in update_data:
+        setattr(db_obj, field, update_data[field])
+    
+    db.add(db_obj)
+    await db.commit()
+    await db.refresh(db_obj)
+    invalidate_identity(db_obj, old_email)
+    return db_obj
+
+
+async def authenticate(
+    db: AsyncSession, *, email: str, password: str
+) -> Optional[User]:
+    """
+    Authenticate a user.
+    """
+    user = await get_user_by_email(db, email=email)
+    if not user:
+        return None
+    if not await password_hasher.verify(password, user.hashed_password):
+        return None
+    schedule_rehash(user, password)
+    return user
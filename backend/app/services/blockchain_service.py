@@ -1,7 +1,28 @@
+import asyncio
 from typing import Dict, Any, Optional
 from datetime import datetime, timedelta
 
+from loguru import logger
+from sqlalchemy.orm import Session
+
 from app.blockchain.xrpl_client import xrpl_client
+from app.blockchain.subscriptions import (
+    LedgerSubscriptionService,
+    TransactionEvent,
+    transaction_dispatcher,
+)
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.models.npo import NPO
+from app.services import donation_service
+
+
+ledger_subscriptions = LedgerSubscriptionService(
+    xrpl_client.ws_url,
+    transaction_dispatcher,
+    max_backoff=settings.XRPL_SUBSCRIPTION_MAX_BACKOFF,
+    initial_backfill_ledgers=settings.XRPL_SUBSCRIPTION_BACKFILL_LEDGERS,
+)
 
 
 async def initiate_xrp_payment(
@@ -58,6 +79,10 @@ async def check_transaction_status(tx_hash: str) -> str:
     Returns:
         Transaction status: "pending", "completed", or "failed"
     """
+    # Transactions already pushed by the ledger subscription need no round trip
+    status = transaction_dispatcher.get_status(tx_hash)
+    if status is not None:
+        return status
     return await xrpl_client.check_transaction_status(tx_hash)
 
 
@@ -111,4 +136,91 @@ async def get_account_info(address: str) -> Dict[str, Any]:
     Returns:
         Account information dictionary
     """
-    return await xrpl_client.get_account_info(address) 
\ No newline at end of file
+    return await xrpl_client.get_account_info(address) 
+
+def _resolve_donation(event: TransactionEvent) -> None:
+    """
+    Apply a validated transaction to the matching pending donation.
+    
+    Args:
+        event: The validated transaction event
+    """
+    db = SessionLocal()
+    try:
+        donation_service.resolve_donation_by_tx_hash(
+            db, tx_hash=event["tx_hash"], status=event["status"]
+        )
+    finally:
+        db.close()
+
+
+async def handle_validated_transaction(event: TransactionEvent) -> None:
+    """
+    Dispatcher handler resolving donations from the ledger subscription.
+    
+    Args:
+        event: The validated transaction event
+    """
+    await asyncio.to_thread(_resolve_donation, event)
+
+
+def _replace_tx_hash(tx_hash: str, new_tx_hash: str) -> None:
+    db = SessionLocal()
+    try:
+        donation_service.replace_tx_hash(db, tx_hash=tx_hash, new_tx_hash=new_tx_hash)
+    finally:
+        db.close()
+
+
+async def handle_resubmitted_transaction(tx_hash: str, new_tx_hash: str) -> None:
+    """
+    Pipeline handler moving a pending donation to its resubmitted transaction.
+    
+    Args:
+        tx_hash: Hash of the expired transaction
+        new_tx_hash: Hash of the transaction replacing it
+    """
+    await asyncio.to_thread(_replace_tx_hash, tx_hash, new_tx_hash)
+
+
+# Resubmissions get a new hash, and their outcome may never reach the subscription
+if xrpl_client.pipeline is not None:
+    xrpl_client.pipeline.on_resubmit = handle_resubmitted_transaction
+    xrpl_client.pipeline.on_result = handle_validated_transaction
+
+
+async def start_ledger_subscriptions(db: Session) -> None:
+    """
+    Subscribe to the platform and NPO accounts and start resolving donations.
+    
+    Args:
+        db: Database session used to load the NPO addresses
+    """
+    if settings.XRPL_ACCOUNT:
+        ledger_subscriptions.accounts.add(settings.XRPL_ACCOUNT)
+    for (address,) in db.query(NPO.xrpl_address).filter(NPO.xrpl_address.isnot(None)):
+        ledger_subscriptions.accounts.add(address)
+    
+    transaction_dispatcher.add_handler(handle_validated_transaction)
+    await ledger_subscriptions.start()
+
+
+async def watch_account(address: Optional[str]) -> None:
+    """
+    Add an NPO address to the ledger subscription, if it is enabled.
+    
+    Args:
+        address: The XRPL address receiving donations
+    """
+    if not address or not settings.XRPL_SUBSCRIPTIONS_ENABLED:
+        return
+    try:
+        await ledger_subscriptions.add_account(address)
+    except Exception as e:
+        # The account is kept and subscribed when the connection is re-established
+        logger.warning(f"Failed to subscribe to {address}: {str(e)}")
+
+
+async def stop_ledger_subscriptions() -> None:
+    """Stop the ledger subscription."""
+    await ledger_subscriptions.stop()
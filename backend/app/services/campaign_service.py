@@ -1,4 +1,5 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, Union
+from sqlalchemy import ColumnElement, Update, func, literal_column, update
 from sqlalchemy.orm import Session
 from datetime import datetime
 from fastapi.encoders import jsonable_encoder
@@ -6,19 +7,61 @@ from fastapi.encoders import jsonable_encoder
 from app.models.campaign import Campaign
 from app.models.npo import NPO
 from app.core.config import settings
+from app.services import campaign_stats_service, counter_service, entity_cache, pagination
+
+
+def add_to_npo_campaigns(npo_id: int, delta: int) -> Update:
+    """
+    Statement adjusting an NPO's campaign count in the database itself.
+    """
+    return (
+        update(NPO)
+        .where(NPO.id == npo_id)
+        .values(total_campaigns=func.coalesce(NPO.total_campaigns, 0) + delta)
+    )
+
+
+def running_at(now: datetime, dialect: str) -> Tuple[ColumnElement, ColumnElement]:
+    """
+    Filter on campaigns running at ``now``.
+
+    Without STAT4 statistics SQLite cannot tell how few campaigns are still
+    running and walks the created_at index instead of seeking the end date,
+    so it is told the end date range is selective.
+    """
+    ends_after = Campaign.end_date >= now
+    if dialect == "sqlite":
+        ends_after = func.likelihood(ends_after, literal_column("0.05"))
+    return Campaign.start_date <= now, ends_after
 
 
 def get_campaign(db: Session, id: int) -> Optional[Campaign]:
     """
     Get a campaign by ID.
     """
-    return db.query(Campaign).filter(Campaign.id == id).first()
+    def load() -> Optional[Campaign]:
+        row = campaign_stats_service.join_stats(db.query(Campaign)).filter(Campaign.id == id).first()
+        return campaign_stats_service.attach_stats([row])[0] if row else None
+    
+    campaign = entity_cache.get_or_load(
+        db, Campaign, "id", id, load, extra=campaign_stats_service.STATS_ATTRIBUTES
+    )
+    counter_service.apply_shard_totals(db, [campaign], owner_type=counter_service.CAMPAIGN)
+    return campaign
+
+
+def invalidate_campaign(campaign_id: int) -> None:
+    """
+    Drop a campaign from the lookup cache.
+    """
+    entity_cache.invalidate(Campaign, "id", campaign_id)
 
 
 def get_campaigns(
     db: Session, 
     *, 
-    skip: int = 0, 
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
     limit: int = 100,
     npo_id: Optional[int] = None,
     active_only: bool = False,
@@ -32,13 +75,13 @@ def get_campaigns(
         query = query.filter(Campaign.npo_id == npo_id)
     
     if active_only:
-        now = datetime.utcnow()
-        query = query.filter(
-            Campaign.start_date <= now,
-            Campaign.end_date >= now
-        )
+        query = query.filter(*running_at(datetime.utcnow(), db.get_bind().dialect.name))
     
-    return query.offset(skip).limit(limit).all()
+    query = campaign_stats_service.join_stats(query)
+    rows = pagination.paginate(query, Campaign, skip=skip, cursor=cursor, limit=limit).all()
+    campaigns = campaign_stats_service.attach_stats(rows)
+    counter_service.apply_shard_totals(db, campaigns, owner_type=counter_service.CAMPAIGN)
+    return campaigns
 
 
 def create_campaign(
@@ -56,13 +99,11 @@ def create_campaign(
     
     db_obj = Campaign(**obj_in_data)
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
     
     # Update NPO stats
-    npo.total_campaigns += 1
-    db.add(npo)
+    db.execute(add_to_npo_campaigns(npo.id, 1))
     db.commit()
+    db.refresh(db_obj)
     
     return db_obj
 
@@ -82,13 +123,8 @@ def update_campaign(
             raise ValueError("NPO not found")
         
         # Update old and new NPO stats
-        old_npo = db.query(NPO).filter(NPO.id == db_obj.npo_id).first()
-        if old_npo:
-            old_npo.total_campaigns -= 1
-            db.add(old_npo)
-        
-        npo.total_campaigns += 1
-        db.add(npo)
+        db.execute(add_to_npo_campaigns(db_obj.npo_id, -1))
+        db.execute(add_to_npo_campaigns(npo.id, 1))
     
     for field in obj_data:
         if field in obj_in:
@@ -96,6 +132,7 @@ def update_campaign(
     
     db.add(db_obj)
     db.commit()
+    invalidate_campaign(db_obj.id)
     db.refresh(db_obj)
     return db_obj
 
@@ -107,13 +144,11 @@ def delete_campaign(db: Session, *, id: int) -> None:
     db_obj = db.query(Campaign).filter(Campaign.id == id).first()
     if db_obj:
         # Update NPO stats
-        npo = db.query(NPO).filter(NPO.id == db_obj.npo_id).first()
-        if npo:
-            npo.total_campaigns -= 1
-            db.add(npo)
+        db.execute(add_to_npo_campaigns(db_obj.npo_id, -1))
         
         db.delete(db_obj)
         db.commit()
+        invalidate_campaign(id)
 
 
 def check_campaign_status(db: Session) -> None:
@@ -136,15 +171,25 @@ def check_campaign_status(db: Session) -> None:
         db.add(campaign)
     
     db.commit()
+    for campaign in expired_campaigns:
+        invalidate_campaign(campaign.id)
 
 
 def get_campaigns_by_npo(
-    db: Session, *, npo_id: int, skip: int = 0, limit: int = 100, active_only: bool = True
+    db: Session,
+    *,
+    npo_id: int,
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    active_only: bool = True,
 ) -> List[Campaign]:
     """
     Get campaigns for a specific non-profit organization.
     """
-    return get_campaigns(db, skip=skip, limit=limit, active_only=active_only, npo_id=npo_id)
+    return get_campaigns(
+        db, skip=skip, cursor=cursor, limit=limit, active_only=active_only, npo_id=npo_id
+    )
 
 
 def remove_campaign(db: Session, *, id: int) -> Campaign:
@@ -154,11 +199,9 @@ def remove_campaign(db: Session, *, id: int) -> Campaign:
     obj = db.query(Campaign).get(id)
     
     # Update NPO stats
-    npo = db.query(NPO).filter(NPO.id == obj.npo_id).first()
-    if npo:
-        npo.total_campaigns -= 1
-        db.add(npo)
+    db.execute(add_to_npo_campaigns(obj.npo_id, -1))
     
     db.delete(obj)
     db.commit()
+    invalidate_campaign(id)
     return obj 
\ No newline at end of file
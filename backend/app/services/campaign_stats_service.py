@@ -0,0 +1,196 @@
+from typing import Any, Iterable, List, Mapping, Optional, Tuple
+
+from sqlalchemy import Update, case, delete, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Query, Session
+
+from app.models.campaign import Campaign
+from app.models.campaign_stats import CampaignDonor, CampaignStats
+from app.models.donation import Donation
+
+
+# Stats copied onto campaigns by attach_stats
+STATS_ATTRIBUTES = ("total_donations", "total_donors")
+
+
+def _update_or_insert(db: Session, stmt: Update, row: Any) -> bool:
+    """
+    Run an increment, inserting ``row`` instead if nothing matched.
+
+    The insert runs in a savepoint so a concurrent insert of the same row
+    only costs a retry of the increment.
+
+    Returns:
+        True if the row was inserted
+    """
+    if db.execute(stmt).rowcount:
+        return False
+    try:
+        with db.begin_nested():
+            db.add(row)
+        return True
+    except IntegrityError:
+        db.execute(stmt)
+        return False
+
+
+def _add_to_stats(campaign_id: int, **deltas: int) -> Update:
+    return (
+        update(CampaignStats)
+        .where(CampaignStats.campaign_id == campaign_id)
+        .values({name: getattr(CampaignStats, name) + delta for name, delta in deltas.items()})
+    )
+
+
+def _add_to_donor(campaign_id: int, donor_id: Any, delta: int) -> Update:
+    return (
+        update(CampaignDonor)
+        .where(CampaignDonor.campaign_id == campaign_id, CampaignDonor.donor_id == str(donor_id))
+        .values(donations=CampaignDonor.donations + delta)
+    )
+
+
+def record_donation_created(db: Session, *, campaign_id: int, donor_id: Optional[Any]) -> None:
+    """
+    Count a new donation in its campaign's stats, without committing.
+    """
+    record_donations_created(db, campaign_id=campaign_id, donors={donor_id: 1})
+
+
+def record_donations_created(
+    db: Session, *, campaign_id: int, donors: Mapping[Optional[Any], int], completed: int = 0
+) -> None:
+    """
+    Count a batch of new donations to one campaign, without committing.
+
+    Args:
+        db: Database session
+        campaign_id: Campaign the donations belong to
+        donors: Number of new donations per donor ID; anonymous donations
+            are counted under None and count towards donations but not donors
+        completed: How many of the donations are already completed
+    """
+    total = sum(donors.values())
+    _update_or_insert(
+        db,
+        _add_to_stats(campaign_id, total_donations=total, completed_donations=completed),
+        CampaignStats(
+            campaign_id=campaign_id,
+            total_donations=total,
+            completed_donations=completed,
+            total_donors=0,
+        ),
+    )
+    new_donors = 0
+    for donor_id, count in donors.items():
+        if donor_id is None:
+            continue
+        new_donors += _update_or_insert(
+            db,
+            _add_to_donor(campaign_id, donor_id, count),
+            CampaignDonor(campaign_id=campaign_id, donor_id=str(donor_id), donations=count),
+        )
+    if new_donors:
+        db.execute(_add_to_stats(campaign_id, total_donors=new_donors))
+
+
+def record_donation_completed(db: Session, *, campaign_id: int) -> None:
+    """
+    Count a completed donation in its campaign's stats, without committing.
+    """
+    _update_or_insert(
+        db,
+        _add_to_stats(campaign_id, completed_donations=1),
+        CampaignStats(campaign_id=campaign_id, total_donations=0, completed_donations=1, total_donors=0),
+    )
+
+
+def record_donation_deleted(
+    db: Session, *, campaign_id: int, donor_id: Optional[Any], completed: bool
+) -> None:
+    """
+    Remove a deleted donation from its campaign's stats, without committing.
+    """
+    deltas = {"total_donations": -1}
+    if completed:
+        deltas["completed_donations"] = -1
+    db.execute(_add_to_stats(campaign_id, **deltas))
+    if donor_id is None:
+        return
+
+    db.execute(_add_to_donor(campaign_id, donor_id, -1))
+    removed = db.execute(
+        delete(CampaignDonor).where(
+            CampaignDonor.campaign_id == campaign_id,
+            CampaignDonor.donor_id == str(donor_id),
+            CampaignDonor.donations <= 0,
+        )
+    ).rowcount
+    if removed:
+        db.execute(_add_to_stats(campaign_id, total_donors=-1))
+
+
+def rebuild(db: Session, *, campaign_id: Optional[int] = None) -> int:
+    """
+    Recompute campaign stats from the donations table.
+
+    Args:
+        db: Database session
+        campaign_id: Only rebuild this campaign; all campaigns if None
+
+    Returns:
+        The number of campaigns with stats
+    """
+    donations = Donation.campaign_id.isnot(None)
+    if campaign_id is not None:
+        donations = Donation.campaign_id == campaign_id
+        db.execute(delete(CampaignDonor).where(CampaignDonor.campaign_id == campaign_id))
+        db.execute(delete(CampaignStats).where(CampaignStats.campaign_id == campaign_id))
+    else:
+        db.execute(delete(CampaignDonor))
+        db.execute(delete(CampaignStats))
+
+    db.execute(
+        insert(CampaignDonor).from_select(
+            ["campaign_id", "donor_id", "donations"],
+            select(Donation.campaign_id, Donation.donor_id, func.count())
+            .where(donations, Donation.donor_id.isnot(None))
+            .group_by(Donation.campaign_id, Donation.donor_id),
+        )
+    )
+    result = db.execute(
+        insert(CampaignStats).from_select(
+            ["campaign_id", "total_donations", "completed_donations", "total_donors"],
+            select(
+                Donation.campaign_id,
+                func.count(),
+                func.sum(case((Donation.status == "completed", 1), else_=0)),
+                func.count(func.distinct(Donation.donor_id)),
+            )
+            .where(donations)
+            .group_by(Donation.campaign_id),
+        )
+    )
+    db.commit()
+    return result.rowcount
+
+
+def join_stats(query: Query) -> Query:
+    """
+    Add each campaign's stats row to a campaign query with an outer join.
+    """
+    return query.add_entity(CampaignStats).outerjoin(
+        CampaignStats, CampaignStats.campaign_id == Campaign.id
+    )
+
+
+def attach_stats(rows: Iterable[Tuple[Campaign, Optional[CampaignStats]]]) -> List[Campaign]:
+    """
+    Copy the stats of ``(campaign, stats)`` rows onto the campaigns.
+    """
+    campaigns = []
+    for campaign, stats in rows:
+        campaign.total_donations = stats.total_donations if stats else 0
+        campaign.total_donors = stats.total_donors if stats else 0
+        campaigns.append(campaign)
+    return campaigns
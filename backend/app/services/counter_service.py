@@ -0,0 +1,210 @@
+import zlib
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy import Update, delete, func, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.campaign import Campaign
+from app.models.counter_shard import CounterShard
+from app.models.npo import NPO
+
+CAMPAIGN = "campaign"
+NPO_OWNER = "npo"
+
+def add_to_campaign_amount(campaign_id: int, amount: float) -> Update:
+    """
+    Statement adding to a campaign's raised amount in the database itself,
+    so concurrent donations never overwrite each other's increments.
+    """
+    return (
+        update(Campaign)
+        .where(Campaign.id == campaign_id)
+        .values(current_amount=func.coalesce(Campaign.current_amount, 0) + amount)
+    )
+
+
+def add_to_npo_total(npo_id: int, amount: float) -> Update:
+    """
+    Statement adding to an NPO's total received in the database itself.
+    """
+    return (
+        update(NPO)
+        .where(NPO.id == npo_id)
+        .values(total_received=func.coalesce(NPO.total_received, 0) + amount)
+    )
+
+
+def add_to_owner(owner_type: str, owner_id: Any, amount: float) -> Update:
+    """
+    Statement adding directly to the counter column of an owner row.
+    """
+    if owner_type == CAMPAIGN:
+        return add_to_campaign_amount(owner_id, amount)
+    return add_to_npo_total(owner_id, amount)
+
+
+def shard_for(key: Any, shards: int) -> int:
+    """
+    Pick the shard of a counter update from a stable hash of its key.
+    """
+    return zlib.crc32(str(key).encode()) % shards
+
+
+def add_to_shard(owner_type: str, owner_id: Any, shard: int, amount: float) -> Update:
+    """
+    Statement adding to one shard of a counter.
+    """
+    return (
+        update(CounterShard)
+        .where(
+            CounterShard.owner_type == owner_type,
+            CounterShard.owner_id == str(owner_id),
+            CounterShard.shard == shard,
+        )
+        .values(value=CounterShard.value + amount)
+    )
+
+
+def add(db: Session, *, owner_type: str, owner_id: Any, amount: float, key: Any) -> None:
+    """
+    Add to a campaign or NPO total without committing.
+
+    Owners with shard rows take the increment on the shard picked by ``key``,
+    so concurrent donations spread over several rows. Everyone else is
+    updated in place.
+    """
+    if settings.SHARDED_COUNTERS_ENABLED:
+        shard = shard_for(key, settings.COUNTER_SHARDS)
+        result = db.execute(add_to_shard(owner_type, owner_id, shard, amount))
+        if result.rowcount:
+            return
+    db.execute(add_to_owner(owner_type, owner_id, amount))
+
+
+def _create_shards(db: Session, owner_type: str, owner_id: Any, shards: int) -> None:
+    existing = {
+        shard
+        for (shard,) in db.query(CounterShard.shard).filter(
+            CounterShard.owner_type == owner_type, CounterShard.owner_id == str(owner_id)
+        )
+    }
+    db.add_all(
+        CounterShard(owner_type=owner_type, owner_id=str(owner_id), shard=shard, value=0.0)
+        for shard in range(shards)
+        if shard not in existing
+    )
+
+
+def enable_sharding(db: Session, *, campaign: Campaign) -> None:
+    """
+    Switch a campaign, and the totals of its NPO, to sharded counters.
+    """
+    _create_shards(db, CAMPAIGN, campaign.id, settings.COUNTER_SHARDS)
+    _create_shards(db, NPO_OWNER, campaign.npo_id, settings.COUNTER_SHARDS)
+    db.commit()
+
+
+def disable_sharding(db: Session, *, campaign: Campaign) -> None:
+    """
+    Fold a campaign's shards back into its row and drop them.
+
+    The NPO keeps its shards, since other campaigns may still use them;
+    compaction keeps folding them.
+
+    The shards are deleted and their values read back in one statement, so
+    every increment is either folded here or, once its shard is gone, lands
+    on the campaign row itself; none is lost between a read and the delete.
+    """
+    values = db.execute(
+        delete(CounterShard)
+        .where(CounterShard.owner_type == CAMPAIGN, CounterShard.owner_id == str(campaign.id))
+        .returning(CounterShard.value)
+        .execution_options(synchronize_session=False)
+    ).scalars().all()
+    folded = sum(values)
+    if folded:
+        db.execute(add_to_owner(CAMPAIGN, campaign.id, folded))
+    db.commit()
+
+
+def get_shard_totals(
+    db: Session, *, owner_type: str, owner_ids: Iterable[Any]
+) -> Dict[str, float]:
+    """
+    Get the summed shard values of several owners, keyed by owner ID.
+    """
+    ids = [str(owner_id) for owner_id in owner_ids]
+    if not ids:
+        return {}
+    return dict(
+        db.query(CounterShard.owner_id, func.sum(CounterShard.value))
+        .filter(CounterShard.owner_type == owner_type, CounterShard.owner_id.in_(ids))
+        .group_by(CounterShard.owner_id)
+        .all()
+    )
+
+
+def apply_shard_totals(db: Session, objs: Sequence[Any], *, owner_type: str) -> None:
+    """
+    Set the pending shard values of loaded campaigns or NPOs.
+
+    They go to the plain ``pending_total`` attribute, which the displayed
+    totals add to the counter column, so reading a row again or refreshing
+    it never counts them twice or drops them.
+    """
+    if not settings.SHARDED_COUNTERS_ENABLED:
+        return
+    objs = [obj for obj in objs if obj is not None]
+    totals = get_shard_totals(db, owner_type=owner_type, owner_ids=[obj.id for obj in objs])
+    for obj in objs:
+        obj.pending_total = totals.get(str(obj.id)) or 0.0
+
+
+def compact_owner(db: Session, owner_type: str, owner_id: Any) -> float:
+    """
+    Fold the shards of one owner into its row, without committing.
+
+    Each shard is decreased by the value that was read rather than reset,
+    so increments landing during compaction are kept.
+    """
+    shards: List[Tuple[int, float]] = (
+        db.query(CounterShard.shard, CounterShard.value)
+        .filter(
+            CounterShard.owner_type == owner_type,
+            CounterShard.owner_id == str(owner_id),
+            CounterShard.value != 0,
+        )
+        .all()
+    )
+    folded = 0.0
+    for shard, value in shards:
+        db.execute(add_to_shard(owner_type, owner_id, shard, -value))
+        folded += value
+    if folded:
+        db.execute(add_to_owner(owner_type, owner_id, folded))
+    return folded
+
+
+def compact(db: Session) -> int:
+    """
+    Fold every non-empty sharded counter back into its owner row.
+
+    Each owner is folded in its own transaction, so readers always see the
+    same total.
+
+    Returns:
+        The number of counters folded
+    """
+    owners = (
+        db.query(CounterShard.owner_type, CounterShard.owner_id)
+        .filter(CounterShard.value != 0)
+        .distinct()
+        .all()
+    )
+    for owner_type, owner_id in owners:
+        # Owner IDs are stored as strings; campaigns have integer keys
+        key = int(owner_id) if owner_type == CAMPAIGN else owner_id
+        compact_owner(db, owner_type, key)
+        db.commit()
+    return len(owners)
@@ -1,6 +1,8 @@
-from typing import Any, Dict, List, Optional, Union
+import uuid
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Union
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-from datetime import datetime
 from decimal import Decimal
 
 from fastapi.encoders import jsonable_encoder
@@ -8,7 +10,9 @@ from fastapi.encoders import jsonable_encoder
 from app.models.donation import Donation
 from app.models.npo import NPO
 from app.models.campaign import Campaign
+from app.models.user import User
 from app.core.config import settings
+from app.services import campaign_service, campaign_stats_service, counter_service, pagination
 
 
 def get_donation(db: Session, id: int) -> Optional[Donation]:
@@ -22,13 +26,14 @@ def get_campaign(db: Session, id: int) -> Optional[Campaign]:
     """
     Get a campaign by ID.
     """
-    return db.query(Campaign).filter(Campaign.id == id).first()
+    return campaign_service.get_campaign(db, id=id)
 
 
 def get_donations(
     db: Session,
     *,
-    skip: int = 0,
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
     limit: int = 100,
     npo_id: Optional[int] = None,
     campaign_id: Optional[int] = None,
@@ -46,14 +51,15 @@ def get_donations(
     if donor_id is not None:
         query = query.filter(Donation.donor_id == donor_id)
     
-    return query.offset(skip).limit(limit).all()
+    return pagination.paginate(query, Donation, skip=skip, cursor=cursor, limit=limit).all()
 
 
 def get_user_donations(
     db: Session, 
     *, 
     user_id: int,
-    skip: int = 0, 
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
     limit: int = 100,
     campaign_id: Optional[int] = None,
     npo_id: Optional[int] = None
@@ -69,7 +75,7 @@ def get_user_donations(
     if npo_id is not None:
         query = query.filter(Donation.npo_id == npo_id)
     
-    return query.offset(skip).limit(limit).all()
+    return pagination.paginate(query, Donation, skip=skip, cursor=cursor, limit=limit).all()
 
 
 def create_donation(
@@ -77,9 +83,13 @@ def create_donation(
     *,
     obj_in: Dict[str, Any],
     donor_id: int,
+    commit: bool = True,
 ) -> Donation:
     """
     Create a new donation.
+    
+    With ``commit=False`` the donation is only flushed, so the caller can
+    commit it together with related rows.
     """
     obj_in_data = jsonable_encoder(obj_in)
     obj_in_data["donor_id"] = donor_id
@@ -101,34 +111,160 @@ def create_donation(
     
     db_obj = Donation(**obj_in_data)
     db.add(db_obj)
-    db.commit()
-    db.refresh(db_obj)
     
-    # Update campaign amount if applicable
+    # Update campaign amount if applicable, in the same transaction
     if db_obj.campaign_id:
-        campaign = get_campaign(db, id=db_obj.campaign_id)
-        if campaign:
-            campaign.current_amount += db_obj.amount
-            db.add(campaign)
-            db.commit()
+        db.flush()
+        counter_service.add(
+            db,
+            owner_type=counter_service.CAMPAIGN,
+            owner_id=db_obj.campaign_id,
+            amount=db_obj.amount,
+            key=db_obj.id,
+        )
+        campaign_stats_service.record_donation_created(
+            db, campaign_id=db_obj.campaign_id, donor_id=db_obj.donor_id
+        )
     
+    if not commit:
+        db.flush()
+        return db_obj
+    db.commit()
+    db.refresh(db_obj)
     return db_obj
 
 
+def import_donations(db: Session, *, rows: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Create a batch of donations in a single transaction.
+    
+    NPO, campaign, donor and transaction hash references of the whole batch
+    are checked with one query each. Rows that fail a check are reported
+    and skipped; the others are inserted with a single executemany, and
+    each campaign and NPO total is updated once for the batch.
+    
+    Args:
+        db: Database session
+        rows: Donations shaped like schemas.DonationImportRow
+    
+    Returns:
+        The IDs of the created donations and the errors of rejected rows,
+        as ``{"ids": [...], "errors": [{"index": ..., "error": ...}]}``
+    """
+    def referenced(key: str) -> set:
+        return {row[key] for row in rows if row.get(key) is not None}
+    
+    npo_ids = referenced("npo_id")
+    known_npos = {
+        npo_id for (npo_id,) in db.query(NPO.id).filter(NPO.id.in_(npo_ids))
+    } if npo_ids else set()
+    campaign_ids = referenced("campaign_id")
+    campaign_npos = dict(
+        db.query(Campaign.id, Campaign.npo_id).filter(Campaign.id.in_(campaign_ids))
+    ) if campaign_ids else {}
+    donor_ids = referenced("donor_id")
+    known_donors = {
+        user_id for (user_id,) in db.query(User.id).filter(User.id.in_(donor_ids))
+    } if donor_ids else set()
+    tx_hashes = referenced("xrpl_transaction_hash")
+    seen_hashes = {
+        tx_hash for (tx_hash,) in db.query(Donation.tx_hash).filter(Donation.tx_hash.in_(tx_hashes))
+    } if tx_hashes else set()
+    
+    values: List[Dict[str, Any]] = []
+    errors: List[Dict[str, Any]] = []
+    for index, row in enumerate(rows):
+        campaign_id = row.get("campaign_id")
+        donor_id = row.get("donor_id")
+        tx_hash = row.get("xrpl_transaction_hash")
+        if row["npo_id"] not in known_npos:
+            error = "NPO not found"
+        elif campaign_id is not None and str(campaign_npos.get(campaign_id)) != str(row["npo_id"]):
+            error = "Campaign not found or does not belong to the specified NPO"
+        elif donor_id is not None and donor_id not in known_donors:
+            error = "Donor not found"
+        elif tx_hash is not None and tx_hash in seen_hashes:
+            error = "Duplicate transaction hash"
+        else:
+            error = None
+        if error:
+            errors.append({"index": index, "error": error})
+            continue
+        
+        if tx_hash is not None:
+            seen_hashes.add(tx_hash)
+        value = {
+            "id": str(uuid.uuid4()),
+            "amount": float(row["amount"]),
+            "npo_id": row["npo_id"],
+            "campaign_id": campaign_id,
+            "donor_id": donor_id,
+            "status": row.get("status") or "completed",
+            "tx_hash": tx_hash,
+        }
+        if row.get("created_at") is not None:
+            value["created_at"] = row["created_at"]
+        values.append(value)
+    
+    if not values:
+        return {"ids": [], "errors": errors}
+    
+    # Rows with and without created_at take separate executemany batches
+    for batch in (
+        [value for value in values if "created_at" in value],
+        [value for value in values if "created_at" not in value],
+    ):
+        if batch:
+            db.execute(insert(Donation), batch)
+    
+    # Campaigns are credited when a donation is created, NPOs on completion
+    campaign_amounts: Dict[int, float] = defaultdict(float)
+    campaign_donors: Dict[int, Counter] = defaultdict(Counter)
+    campaign_completed: Counter = Counter()
+    npo_amounts: Dict[Any, float] = defaultdict(float)
+    for value in values:
+        completed = value["status"] == "completed"
+        if value["campaign_id"] is not None:
+            campaign_amounts[value["campaign_id"]] += value["amount"]
+            campaign_donors[value["campaign_id"]][value["donor_id"]] += 1
+            campaign_completed[value["campaign_id"]] += completed
+        if completed:
+            npo_amounts[value["npo_id"]] += value["amount"]
+    
+    for campaign_id, amount in campaign_amounts.items():
+        counter_service.add(
+            db, owner_type=counter_service.CAMPAIGN, owner_id=campaign_id, amount=amount, key=uuid.uuid4()
+        )
+        campaign_stats_service.record_donations_created(
+            db,
+            campaign_id=campaign_id,
+            donors=campaign_donors[campaign_id],
+            completed=campaign_completed[campaign_id],
+        )
+    for npo_id, amount in npo_amounts.items():
+        counter_service.add(
+            db, owner_type=counter_service.NPO_OWNER, owner_id=npo_id, amount=amount, key=uuid.uuid4()
+        )
+    
+    db.commit()
+    return {"ids": [value["id"] for value in values], "errors": errors}
+
+
 def update_donation(
     db: Session,
     *,
     db_obj: Donation,
-    obj_in: Dict[str, Any],
+    obj_in: Union[Dict[str, Any], Any],
 ) -> Donation:
     """
     Update a donation.
     """
     obj_data = jsonable_encoder(db_obj)
+    update_data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
     
     for field in obj_data:
-        if field in obj_in:
-            setattr(db_obj, field, obj_in[field])
+        if field in update_data:
+            setattr(db_obj, field, update_data[field])
     
     db.add(db_obj)
     db.commit()
@@ -136,6 +272,14 @@ def update_donation(
     return db_obj
 
 
+def refresh_donation(db: Session, *, donation: Donation) -> Donation:
+    """
+    Reload a donation from the database.
+    """
+    db.refresh(donation)
+    return donation
+
+
 def delete_donation(db: Session, *, id: int) -> None:
     """
     Delete a donation.
@@ -144,35 +288,148 @@ def delete_donation(db: Session, *, id: int) -> None:
     if db_obj:
         # Update campaign amount if applicable
         if db_obj.campaign_id and db_obj.status == "completed":
-            campaign = get_campaign(db, id=db_obj.campaign_id)
-            if campaign:
-                campaign.current_amount -= db_obj.amount
-                db.add(campaign)
+            counter_service.add(
+                db,
+                owner_type=counter_service.CAMPAIGN,
+                owner_id=db_obj.campaign_id,
+                amount=-db_obj.amount,
+                key=db_obj.id,
+            )
+        if db_obj.campaign_id:
+            campaign_stats_service.record_donation_deleted(
+                db,
+                campaign_id=db_obj.campaign_id,
+                donor_id=db_obj.donor_id,
+                completed=db_obj.status == "completed",
+            )
         
         db.delete(db_obj)
         db.commit()
         
         
-def process_donation_completion(db: Session, *, donation_id: int) -> Optional[Donation]:
+def _resolve_pending(db: Session, donation: Donation, status: str) -> bool:
     """
-    Process a donation completion.
+    Move a pending donation to ``status`` without committing.
+
+    The ledger subscription, the reconciliation worker and status reads can
+    resolve the same donation at once; the conditional UPDATE lets exactly
+    one of them do it, and only that one credits a completion to the NPO and
+    campaign stats. Returns whether this call resolved the donation.
+    """
+    result = db.execute(
+        update(Donation)
+        .where(Donation.id == donation.id, Donation.status == "pending")
+        .values(status=status)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        return False
+
+    if status == "completed":
+        if donation.campaign_id:
+            campaign_stats_service.record_donation_completed(db, campaign_id=donation.campaign_id)
+
+        # Update NPO stats
+        if donation.npo_id:
+            counter_service.add(
+                db,
+                owner_type=counter_service.NPO_OWNER,
+                owner_id=donation.npo_id,
+                amount=donation.amount,
+                key=donation.id,
+            )
+    return True
+
+
+def resolve_donation(db: Session, *, donation_id: int, status: str) -> Optional[Donation]:
+    """
+    Apply a ledger status to a donation if it is still pending.
     """
     donation = get_donation(db, id=donation_id)
     if not donation:
         return None
     
-    # Update donation status
-    donation.status = "completed"
-    donation.completed_at = datetime.utcnow()
-    db.add(donation)
+    _resolve_pending(db, donation, status)
+    db.commit()
+    db.refresh(donation)
+    return donation
+
+
+def process_donation_completion(db: Session, *, donation_id: int) -> Optional[Donation]:
+    """
+    Process a donation completion.
+    """
+    return resolve_donation(db, donation_id=donation_id, status="completed")
+
+
+def get_pending_donations_page(
+    db: Session, *, after_id: Optional[int] = None, limit: int = 100
+) -> List[Donation]:
+    """
+    Get a page of pending donations that have a ledger transaction, ordered by ID.
+    """
+    query = db.query(Donation).filter(
+        Donation.status == "pending", Donation.tx_hash.isnot(None)
+    )
+    if after_id is not None:
+        query = query.filter(Donation.id > after_id)
+    return query.order_by(Donation.id).limit(limit).all()
+
+
+def apply_donation_statuses(db: Session, *, statuses: Dict[int, str]) -> List[Donation]:
+    """
+    Apply ledger statuses to pending donations in a single transaction.
+    
+    Completed donations go through the same bookkeeping as
+    process_donation_completion. Donations that are no longer pending are
+    skipped; the ones resolved here are returned.
+    """
+    if not statuses:
+        return []
     
-    # Update NPO stats
-    if donation.npo_id:
-        npo = db.query(NPO).filter(NPO.id == donation.npo_id).first()
-        if npo:
-            npo.total_received += donation.amount
-            db.add(npo)
+    donations = (
+        db.query(Donation)
+        .filter(Donation.id.in_(list(statuses)), Donation.status == "pending")
+        .all()
+    )
+    resolved = [
+        donation for donation in donations
+        if _resolve_pending(db, donation, statuses[donation.id])
+    ]
+    
+    db.commit()
+    return resolved
+
+
+def resolve_donation_by_tx_hash(
+    db: Session, *, tx_hash: str, status: str
+) -> Optional[Donation]:
+    """
+    Resolve a pending donation from a validated ledger transaction.
+    """
+    donation = (
+        db.query(Donation)
+        .filter(Donation.tx_hash == tx_hash, Donation.status == "pending")
+        .first()
+    )
+    if not donation or not _resolve_pending(db, donation, status):
+        db.rollback()
+        return None
     
     db.commit()
     db.refresh(donation)
-    return donation 
\ No newline at end of file
+    return donation
+
+
+def replace_tx_hash(db: Session, *, tx_hash: str, new_tx_hash: str) -> bool:
+    """
+    Point a pending donation at the transaction that replaced its expired one.
+    """
+    replaced = db.execute(
+        update(Donation)
+        .where(Donation.tx_hash == tx_hash, Donation.status == "pending")
+        .values(tx_hash=new_tx_hash)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    return replaced > 0
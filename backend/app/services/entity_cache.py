@@ -0,0 +1,92 @@
+from typing import Any, Callable, Dict, Optional, Sequence, Type
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.util import identity_key
+
+from app.core.cache import cache
+
+
+def cache_key(model: Type[Any], field: str, value: Any) -> str:
+    """
+    Key of a cached row looked up by ``field``.
+    """
+    return f"{model.__tablename__}:{field}:{value}"
+
+
+def snapshot(obj: Any, extra: Sequence[str] = (), exclude: Sequence[str] = ()) -> Dict[str, Any]:
+    """
+    Copy the column values, plus ``extra`` plain attributes, of a loaded row.
+
+    Columns in ``exclude`` are left out and load from the database when a
+    restored row first reads them.
+    """
+    data = {
+        attr.key: getattr(obj, attr.key)
+        for attr in inspect(obj).mapper.column_attrs
+        if attr.key not in exclude
+    }
+    for name in extra:
+        data[name] = getattr(obj, name, None)
+    return data
+
+
+def restore(db: Session, model: Type[Any], data: Dict[str, Any], extra: Sequence[str] = ()) -> Any:
+    """
+    Turn a snapshot back into a row attached to ``db`` without querying.
+
+    A row the session already holds is returned as is. Otherwise the row is
+    added as clean and persistent, as if just loaded, so later updates flush
+    as usual.
+    """
+    columns = {key: value for key, value in data.items() if key not in extra}
+    mapper = inspect(model)
+    key = identity_key(model, tuple(columns[column.key] for column in mapper.primary_key))
+    obj = db.identity_map.get(key)
+    if obj is None:
+        obj = model(**columns)
+        make_transient_to_detached(obj)
+        db.add(obj)
+    for name in extra:
+        setattr(obj, name, data.get(name))
+    return obj
+
+
+def get_or_load(
+    db: Session,
+    model: Type[Any],
+    field: str,
+    value: Any,
+    load: Callable[[], Optional[Any]],
+    extra: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    ttl: Optional[float] = None,
+) -> Optional[Any]:
+    """
+    Read a row through the cache, loading and caching it on a miss.
+
+    Missing rows are not cached.
+    """
+    key = cache_key(model, field, value)
+    data = cache.get(key)
+    if data is not None:
+        return restore(db, model, data, extra)
+
+    obj = load()
+    if obj is not None:
+        cache.set(key, snapshot(obj, extra, exclude), ttl)
+    return obj
+
+
+def invalidate(model: Type[Any], field: str, *values: Any) -> None:
+    """
+    Drop the cached rows looked up by ``field`` with any of ``values``.
+    """
+    cache.delete(*{cache_key(model, field, value) for value in values if value is not None})
+
+
+def invalidate_prefix(model: Type[Any], field: str, *prefixes: Any) -> None:
+    """
+    Drop the cached rows looked up by ``field`` with a value starting with any of ``prefixes``.
+    """
+    cache.delete_prefix(*{cache_key(model, field, prefix) for prefix in prefixes if prefix is not None})
@@ -0,0 +1,126 @@
+import csv
+import io
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Iterable, Iterator, Optional, Sequence, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.donation import Donation
+
+# Exported columns, in file order
+DONATION_COLUMNS = (
+    "id",
+    "created_at",
+    "amount",
+    "status",
+    "npo_id",
+    "campaign_id",
+    "donor_id",
+    "tx_hash",
+)
+
+# Rows written to the CSV buffer before a chunk is yielded
+_CHUNK_ROWS = 500
+
+
+def iter_donation_rows(
+    db: Session,
+    *,
+    npo_id: Optional[Any] = None,
+    campaign_id: Optional[int] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    batch_size: Optional[int] = None,
+) -> Iterator[Tuple[Any, ...]]:
+    """
+    Stream donation rows for export, oldest first.
+
+    Rows are plain tuples fetched ``batch_size`` at a time through a
+    server-side cursor where the driver supports one, so neither the driver
+    nor the session holds more than one batch however large the export is.
+
+    Args:
+        db: Database session
+        npo_id: Only donations to this NPO
+        campaign_id: Only donations to this campaign
+        start: Only donations created at or after this time
+        end: Only donations created before this time
+        batch_size: Rows per fetch (default: EXPORT_BATCH_SIZE)
+
+    Returns:
+        Iterator of row tuples in DONATION_COLUMNS order
+    """
+    query = select(*(getattr(Donation, column) for column in DONATION_COLUMNS))
+    if npo_id is not None:
+        query = query.filter(Donation.npo_id == npo_id)
+    if campaign_id is not None:
+        query = query.filter(Donation.campaign_id == campaign_id)
+    if start is not None:
+        query = query.filter(Donation.created_at >= start)
+    if end is not None:
+        query = query.filter(Donation.created_at < end)
+    query = query.order_by(Donation.created_at, Donation.id).execution_options(
+        yield_per=batch_size or settings.EXPORT_BATCH_SIZE
+    )
+
+    result = db.execute(query)
+    try:
+        for row in result:
+            yield tuple(row)
+    finally:
+        result.close()
+
+
+def _format_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def iter_csv(rows: Iterable[Sequence[Any]], columns: Sequence[str] = DONATION_COLUMNS) -> Iterator[str]:
+    """
+    Encode rows as CSV with a header line, yielding a chunk every few hundred rows.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    pending = 0
+    for row in rows:
+        writer.writerow([_format_value(value) for value in row])
+        pending += 1
+        if pending >= _CHUNK_ROWS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+            pending = 0
+    yield buffer.getvalue()
+
+
+def iter_ndjson(rows: Iterable[Sequence[Any]], columns: Sequence[str] = DONATION_COLUMNS) -> Iterator[str]:
+    """
+    Encode rows as newline-delimited JSON objects.
+    """
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({column: _format_value(value) for column, value in zip(columns, row)}))
+        if len(lines) >= _CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """
+    Compress text chunks into a single gzip stream as they are produced.
+    """
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode())
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,299 @@
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+
+
+def enqueue(
+    db: Session,
+    *,
+    queue: str,
+    payload: Dict[str, Any],
+    priority: int = 0,
+    max_attempts: int = 5,
+    delay: float = 0,
+    commit: bool = True,
+) -> Job:
+    """
+    Add a job to a queue.
+    """
+    db_obj = Job(
+        queue=queue,
+        payload=json.dumps(payload),
+        priority=priority,
+        max_attempts=max_attempts,
+        status="queued",
+        attempts=0,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+    db.add(db_obj)
+    if commit:
+        db.commit()
+        db.refresh(db_obj)
+    return db_obj
+
+
+def get_job(db: Session, id: int) -> Optional[Job]:
+    """
+    Get a job by ID.
+    """
+    return db.query(Job).filter(Job.id == id).first()
+
+
+def _claimable(queues: Sequence[str], now: datetime):
+    """
+    Filter for jobs a worker may take: queued jobs that are due, and running
+    jobs whose visibility timeout has lapsed because their worker died, as
+    long as they have attempts left.
+    """
+    return and_(
+        Job.queue.in_(list(queues)),
+        or_(
+            and_(Job.status == "queued", Job.run_at <= now),
+            and_(
+                Job.status == "running",
+                Job.locked_until < now,
+                Job.attempts < Job.max_attempts,
+            ),
+        ),
+    )
+
+
+def fail_expired(db: Session, *, queues: Sequence[str], now: Optional[datetime] = None) -> int:
+    """
+    Fail running jobs whose visibility timeout lapsed on their last attempt.
+
+    Such a job may have had its side effect already, so it is not run again.
+    """
+    now = now or datetime.utcnow()
+    result = db.execute(
+        update(Job)
+        .where(
+            Job.queue.in_(list(queues)),
+            Job.status == "running",
+            Job.locked_until < now,
+            Job.attempts >= Job.max_attempts,
+        )
+        .values(
+            status="failed",
+            last_error="Visibility timeout lapsed on the last attempt",
+            locked_until=None,
+            finished_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount
+
+
+def claim_next(
+    db: Session,
+    *,
+    queue: Optional[str] = None,
+    queues: Optional[Sequence[str]] = None,
+    worker_id: Optional[str] = None,
+    visibility_timeout: float = 300,
+) -> Optional[Job]:
+    """
+    Claim the next job for this worker, highest priority first.
+
+    On PostgreSQL the row is locked with ``SELECT ... FOR UPDATE SKIP LOCKED``
+    so concurrent workers never wait on each other. Other databases fall back
+    to a conditional UPDATE that only one claimer can win.
+    """
+    queues = list(queues or [queue])
+    now = datetime.utcnow()
+    fail_expired(db, queues=queues, now=now)
+    lock_until = now + timedelta(seconds=visibility_timeout)
+    query = (
+        db.query(Job)
+        .filter(_claimable(queues, now))
+        .order_by(Job.priority.desc(), Job.run_at, Job.id)
+    )
+
+    if db.get_bind().dialect.name == "postgresql":
+        job = query.with_for_update(skip_locked=True).first()
+        if not job:
+            db.rollback()
+            return None
+        job.status = "running"
+        job.attempts += 1
+        job.locked_by = worker_id
+        job.locked_until = lock_until
+        job.started_at = now
+        db.commit()
+        db.refresh(job)
+        return job
+
+    while True:
+        job = query.first()
+        if not job:
+            return None
+
+        result = db.execute(
+            update(Job)
+            .where(Job.id == job.id, _claimable(queues, now))
+            .values(
+                status="running",
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_until=lock_until,
+                started_at=now,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        if result.rowcount == 1:
+            db.refresh(job)
+            return job
+
+
+def get_payload(job: Job) -> Dict[str, Any]:
+    """
+    Decode the payload of a job.
+    """
+    return json.loads(job.payload)
+
+
+def extend_lock(
+    db: Session, *, job_id: int, worker_id: Optional[str], visibility_timeout: float = 300
+) -> bool:
+    """
+    Push back the visibility timeout of a running job.
+
+    Returns False once the job is no longer running under ``worker_id``.
+    """
+    result = db.execute(
+        update(Job)
+        .where(Job.id == job_id, Job.status == "running", Job.locked_by == worker_id)
+        .values(locked_until=datetime.utcnow() + timedelta(seconds=visibility_timeout))
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    return result.rowcount == 1
+
+
+def _finish(db: Session, *, job: Job, worker_id: Optional[str], **values: Any) -> Optional[Job]:
+    """
+    Update a job only while it is running under ``worker_id``.
+
+    Returns None when the lock lapsed and another worker reclaimed the job,
+    so a late outcome never overwrites that worker's.
+    """
+    result = db.execute(
+        update(Job)
+        .where(Job.id == job.id, Job.status == "running", Job.locked_by == worker_id)
+        .values(**values)
+        .execution_options(synchronize_session=False)
+    )
+    db.commit()
+    if result.rowcount != 1:
+        return None
+    db.refresh(job)
+    return job
+
+
+def complete_job(db: Session, *, job: Job, worker_id: Optional[str]) -> Optional[Job]:
+    """
+    Mark a job as done.
+
+    Returns None once the job is no longer running under ``worker_id``.
+    """
+    return _finish(
+        db, job=job, worker_id=worker_id,
+        status="done", locked_until=None, finished_at=datetime.utcnow(),
+    )
+
+
+def fail_job(db: Session, *, job: Job, worker_id: Optional[str], error: str) -> Optional[Job]:
+    """
+    Mark a job as failed without retrying it.
+
+    Returns None once the job is no longer running under ``worker_id``.
+    """
+    return _finish(
+        db, job=job, worker_id=worker_id,
+        status="failed", last_error=error, locked_until=None, finished_at=datetime.utcnow(),
+    )
+
+
+def retry_job(
+    db: Session,
+    *,
+    job: Job,
+    worker_id: Optional[str],
+    error: str,
+    base_delay: float = 5,
+    max_delay: float = 600,
+) -> Optional[Job]:
+    """
+    Requeue a job with exponential backoff, or fail it once out of attempts.
+
+    Returns None once the job is no longer running under ``worker_id``.
+    """
+    if job.attempts >= job.max_attempts:
+        return fail_job(db, job=job, worker_id=worker_id, error=error)
+
+    delay = min(base_delay * 2 ** (job.attempts - 1), max_delay)
+    return _finish(
+        db, job=job, worker_id=worker_id,
+        status="queued",
+        last_error=error,
+        locked_by=None,
+        locked_until=None,
+        run_at=datetime.utcnow() + timedelta(seconds=delay),
+    )
+
+
+def has_pending(db: Session, *, queue: str) -> bool:
+    """
+    Check whether a queue has a job that is queued or running.
+    """
+    return (
+        db.query(Job.id)
+        .filter(Job.queue == queue, Job.status.in_(["queued", "running"]))
+        .first()
+        is not None
+    )
+
+
+def get_queue_metrics(db: Session) -> List[Dict[str, Any]]:
+    """
+    Get depth and latency figures for every queue.
+
+    ``depth`` counts jobs that are due but not yet claimed, and ``lag_seconds``
+    is how long the oldest of them has been waiting.
+    """
+    now = datetime.utcnow()
+    rows = (
+        db.query(
+            Job.queue,
+            Job.status,
+            func.count(Job.id),
+            func.min(Job.run_at),
+        )
+        .group_by(Job.queue, Job.status)
+        .all()
+    )
+    ready = dict(
+        db.query(Job.queue, func.count(Job.id))
+        .filter(Job.status == "queued", Job.run_at <= now)
+        .group_by(Job.queue)
+        .all()
+    )
+
+    metrics: Dict[str, Dict[str, Any]] = {}
+    for queue, status, count, oldest_run_at in rows:
+        entry = metrics.setdefault(
+            queue,
+            {"queue": queue, "depth": ready.get(queue, 0), "lag_seconds": 0.0,
+             "queued": 0, "running": 0, "done": 0, "failed": 0},
+        )
+        entry[status] = count
+        if status == "queued" and oldest_run_at is not None:
+            entry["lag_seconds"] = max((now - oldest_run_at).total_seconds(), 0.0)
+    return list(metrics.values())
@@ -1,6 +1,6 @@
 import uuid
 import boto3
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, BinaryIO, Dict, List, Optional, Union
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
 from fastapi.encoders import jsonable_encoder
@@ -9,26 +9,42 @@ from datetime import datetime
 from app.models.npo import NPO
 from app.models.campaign import Campaign
 from app.core.config import settings
+from app.services import campaign_stats_service, counter_service, entity_cache, pagination
 
 
 def get_npo(db: Session, id: int) -> Optional[NPO]:
     """
     Get a non-profit organization by ID.
     """
-    return db.query(NPO).filter(NPO.id == id).first()
+    npo = entity_cache.get_or_load(
+        db, NPO, "id", id, lambda: db.query(NPO).filter(NPO.id == id).first()
+    )
+    counter_service.apply_shard_totals(db, [npo], owner_type=counter_service.NPO_OWNER)
+    return npo
 
 
 def get_npo_by_name(db: Session, name: str) -> Optional[NPO]:
     """
     Get a non-profit organization by name.
     """
-    return db.query(NPO).filter(NPO.name == name).first()
+    return entity_cache.get_or_load(
+        db, NPO, "name", name, lambda: db.query(NPO).filter(NPO.name == name).first()
+    )
+
+
+def invalidate_npo(npo: NPO, *names: Optional[str]) -> None:
+    """
+    Drop an NPO from the lookup cache, including under former ``names``.
+    """
+    entity_cache.invalidate(NPO, "id", npo.id)
+    entity_cache.invalidate(NPO, "name", npo.name, *names)
 
 
 def get_npos(
     db: Session, 
     *, 
-    skip: int = 0, 
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
     limit: int = 100,
     verified_only: bool = True
 ) -> List[NPO]:
@@ -40,7 +56,9 @@ def get_npos(
     if verified_only:
         query = query.filter(NPO.is_verified == True)
     
-    return query.offset(skip).limit(limit).all()
+    npos = pagination.paginate(query, NPO, skip=skip, cursor=cursor, limit=limit).all()
+    counter_service.apply_shard_totals(db, npos, owner_type=counter_service.NPO_OWNER)
+    return npos
 
 
 def create_npo(
@@ -70,24 +88,37 @@ def update_npo(
     else:
         update_data = obj_in.dict(exclude_unset=True)
     
+    old_name = db_obj.name
     for field in obj_data:
         if field in update_data:
             setattr(db_obj, field, update_data[field])
     
     db.add(db_obj)
     db.commit()
+    invalidate_npo(db_obj, old_name)
     db.refresh(db_obj)
     return db_obj
 
 
-def upload_proof_file(proof_file: UploadFile, npo_id: int) -> str:
+def get_proof_key(filename: str, npo_id: int) -> str:
     """
-    Upload a proof file to S3 and return the URL.
+    Generate a unique S3 key for a proof file.
+    """
+    file_extension = filename.split(".")[-1]
+    return f"proofs/{npo_id}/{uuid.uuid4()}.{file_extension}"
+
+
+def get_proof_url(key: str) -> str:
+    """
+    Get the public URL of an S3 key.
+    """
+    return f"https://{settings.S3_BUCKET}.s3.amazonaws.com/{key}"
+
+
+def upload_proof_object(fileobj: BinaryIO, key: str, content_type: Optional[str]) -> None:
+    """
+    Upload a file object to S3 under the given key.
     """
-    # Generate a unique filename
-    file_extension = proof_file.filename.split(".")[-1]
-    filename = f"proofs/{npo_id}/{uuid.uuid4()}.{file_extension}"
-    
     # Initialize S3 client
     s3_client = boto3.client(
         's3',
@@ -98,15 +129,20 @@ def upload_proof_file(proof_file: UploadFile, npo_id: int) -> str:
     
     # Upload the file
     s3_client.upload_fileobj(
-        proof_file.file,
+        fileobj,
         settings.S3_BUCKET,
-        filename,
-        ExtraArgs={"ContentType": proof_file.content_type}
+        key,
+        ExtraArgs={"ContentType": content_type}
     )
-    
-    # Return the URL
-    url = f"https://{settings.S3_BUCKET}.s3.amazonaws.com/{filename}"
-    return url
+
+
+def upload_proof_file(proof_file: UploadFile, npo_id: int) -> str:
+    """
+    Upload a proof file to S3 and return the URL.
+    """
+    key = get_proof_key(proof_file.filename, npo_id)
+    upload_proof_object(proof_file.file, key, proof_file.content_type)
+    return get_proof_url(key)
 
 
 def add_proof(
@@ -123,6 +159,7 @@ def add_proof(
     npo.verification_documents = url
     db.add(npo)
     db.commit()
+    invalidate_npo(npo)
     db.refresh(npo)
     return npo
 
@@ -131,7 +168,8 @@ def get_npo_campaigns(
     db: Session, 
     *, 
     npo_id: int,
-    skip: int = 0, 
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
     limit: int = 100,
     active_only: bool = True
 ) -> List[Campaign]:
@@ -143,7 +181,11 @@ def get_npo_campaigns(
     if active_only:
         query = query.filter(Campaign.is_active == True)
     
-    return query.offset(skip).limit(limit).all()
+    query = campaign_stats_service.join_stats(query)
+    rows = pagination.paginate(query, Campaign, skip=skip, cursor=cursor, limit=limit).all()
+    campaigns = campaign_stats_service.attach_stats(rows)
+    counter_service.apply_shard_totals(db, campaigns, owner_type=counter_service.CAMPAIGN)
+    return campaigns
 
 
 def get_npo_by_owner(db: Session, owner_id: int) -> Optional[NPO]:
@@ -160,4 +202,5 @@ def remove_npo(db: Session, *, id: int) -> NPO:
     obj = db.query(NPO).get(id)
     db.delete(obj)
     db.commit()
+    invalidate_npo(obj)
     return obj 
\ No newline at end of file
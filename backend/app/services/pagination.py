@@ -0,0 +1,66 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Optional, Sequence, Tuple, TypeVar
+
+from sqlalchemy import tuple_
+
+Q = TypeVar("Q")
+
+
+def encode_cursor(created_at: datetime, id: Any) -> str:
+    """
+    Encode the sort key of a row as an opaque cursor token.
+    """
+    raw = json.dumps([created_at.isoformat(), id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, Any]:
+    """
+    Decode a cursor token back into a ``(created_at, id)`` sort key.
+
+    Raises:
+        ValueError: If the token was not produced by encode_cursor
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), id
+    except (TypeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def paginate(
+    query: Q,
+    model: Any,
+    *,
+    limit: int,
+    skip: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Q:
+    """
+    Limit a Query or Select to one page of ``model`` rows, newest first.
+
+    By default pages are keyset pages on ``(created_at, id)``: the cursor of
+    the previous page's last row is turned into a range filter the index can
+    seek to, so deep pages cost the same as the first one. Passing ``skip``
+    keeps the old offset paging for existing clients.
+    """
+    query = query.order_by(model.created_at.desc(), model.id.desc())
+    if skip is not None:
+        return query.offset(skip).limit(limit)
+    if cursor:
+        created_at, id = decode_cursor(cursor)
+        query = query.filter(tuple_(model.created_at, model.id) < tuple_(created_at, id))
+    return query.limit(limit)
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """
+    Get the cursor of the page after ``items``, or None on the last page.
+    """
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -1,8 +1,30 @@
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional, Union
+from loguru import logger
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
-from app.core.security import verify_password, get_password_hash
+from app.core.config import settings
+from app.core.hashing import password_hasher
+from app.core.security import (
+    IDENTITY_CLAIMS,
+    get_password_hash,
+    password_needs_rehash,
+    verify_password,
+)
+from app.database.session import SessionLocal
 from app.models.user import User
+from app.services import entity_cache, pagination
+
+# Never written to the identity cache; loaded on first access instead
+IDENTITY_UNCACHED = ("hashed_password",)
+
+# Rehashes of outdated password hashes, run after the login that found them
+_rehash_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="password-rehash")
+_rehash_pending: set = set()
+_rehash_lock = threading.Lock()
 
 
 def get_user(db: Session, id: int) -> Optional[User]:
@@ -19,13 +41,60 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
+def get_identity(db: Session, *, subject: str, token: str, by_email: bool = False) -> Optional[User]:
+    """
+    Get the user a token was issued to, through the identity cache.
+
+    Entries are keyed by token subject and a digest of the token, and live
+    for at most IDENTITY_CACHE_TTL seconds.
+    """
+    def load() -> Optional[User]:
+        if by_email:
+            return get_user_by_email(db, email=subject)
+        return get_user(db, id=subject)
+
+    if not settings.IDENTITY_CACHE_TTL:
+        return load()
+    digest = hashlib.sha256(token.encode()).hexdigest()[:32]
+    return entity_cache.get_or_load(
+        db,
+        User,
+        "token",
+        f"{subject}:{digest}",
+        load,
+        exclude=IDENTITY_UNCACHED,
+        ttl=settings.IDENTITY_CACHE_TTL,
+    )
+
+
+def user_from_claims(db: Session, *, claims: Dict[str, Any]) -> User:
+    """
+    Build the user of a stateless token from its claims, without querying.
+
+    Attributes not carried in the token load on first access.
+    """
+    data = {"id": claims["uid"], **{name: claims[name] for name in IDENTITY_CLAIMS}}
+    extra = [name for name in IDENTITY_CLAIMS if name not in User.__table__.columns]
+    return entity_cache.restore(db, User, data, extra)
+
+
+def invalidate_identity(user: User, *emails: Optional[str]) -> None:
+    """
+    Drop every cached identity of a user, including under former ``emails``.
+    """
+    subjects = (user.id, user.email, *emails)
+    entity_cache.invalidate_prefix(
+        User, "token", *(f"{subject}:" for subject in subjects if subject is not None)
+    )
+
+
 def get_users(
-    db: Session, *, skip: int = 0, limit: int = 100
+    db: Session, *, skip: Optional[int] = None, cursor: Optional[str] = None, limit: int = 100
 ) -> list[User]:
     """
     Get multiple users.
     """
-    return db.query(User).offset(skip).limit(limit).all()
+    return pagination.paginate(db.query(User), User, skip=skip, cursor=cursor, limit=limit).all()
 
 
 def create_user(db: Session, *, user_in: Dict[str, Any]) -> User:
@@ -53,6 +122,7 @@ def update_user(
     Update a user.
     """
     update_data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+    old_email = db_obj.email
     
     if "password" in update_data and update_data["password"]:
         update_data["hashed_password"] = get_password_hash(update_data["password"])
@@ -65,6 +135,7 @@ def update_user(
     db.add(db_obj)
     db.commit()
     db.refresh(db_obj)
+    invalidate_identity(db_obj, old_email)
     return db_obj
 
 
@@ -79,9 +150,57 @@ def authenticate(
         return None
     if not verify_password(password, user.hashed_password):
         return None
+    schedule_rehash(user, password)
     return user
 
 
+def replace_password_hash(db: Session, *, user_id: Any, old_hash: str, new_hash: str) -> bool:
+    """
+    Replace a user's password hash, unless it changed since ``old_hash`` was read.
+    """
+    result = db.execute(
+        update(User)
+        .where(User.id == user_id, User.hashed_password == old_hash)
+        .values(hashed_password=new_hash)
+    )
+    db.commit()
+    return bool(result.rowcount)
+
+
+def _rehash(user_id: Any, password: str, old_hash: str) -> None:
+    db = SessionLocal()
+    try:
+        new_hash = password_hasher.hash_blocking(password)
+        if replace_password_hash(db, user_id=user_id, old_hash=old_hash, new_hash=new_hash):
+            logger.info(f"Upgraded password hash of user {user_id}")
+    except Exception:
+        logger.exception(f"Failed to upgrade password hash of user {user_id}")
+    finally:
+        db.close()
+        with _rehash_lock:
+            _rehash_pending.discard(user_id)
+
+
+def schedule_rehash(user: User, password: str) -> bool:
+    """
+    Rehash a just verified password in the background if its hash is outdated.
+
+    The new hash uses the current PASSWORD_BCRYPT_ROUNDS and is only written
+    if the password was not changed meanwhile.
+
+    Returns:
+        True if a rehash was scheduled
+    """
+    if not settings.PASSWORD_REHASH_ON_LOGIN or not password_needs_rehash(user.hashed_password):
+        return False
+    with _rehash_lock:
+        if user.id in _rehash_pending:
+            return False
+        _rehash_pending.add(user.id)
+    _rehash_executor.submit(_rehash, user.id, password, user.hashed_password)
+    return True
+
+
 def is_active(user: User) -> bool:
     """
     Check if user is active.
@@ -0,0 +1,73 @@
+"""
+Run job workers outside the API process.
+
+    python -m app.workers --processes 4 --concurrency 8
+    python -m app.workers --queues donation_submission proof_upload
+"""
+import argparse
+import asyncio
+import multiprocessing
+from typing import List, Optional
+
+from loguru import logger
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.workers import donation_submitter, tasks  # noqa: F401 - registers handlers
+from app.workers.runtime import JobWorker, handlers
+
+
+def run_worker(queues: Optional[List[str]], concurrency: int) -> None:
+    """Run one worker until interrupted."""
+    worker = JobWorker(
+        queues=queues,
+        concurrency=concurrency,
+        poll_interval=settings.JOB_POLL_INTERVAL,
+        visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT,
+    )
+    logger.info(f"Worker {worker.worker_id} draining {queues or list(handlers)}")
+    try:
+        asyncio.run(worker.run_forever())
+    except KeyboardInterrupt:
+        pass
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run background job workers")
+    parser.add_argument("--queues", nargs="*", help="Queues to drain (default: all)")
+    parser.add_argument("--processes", type=int, default=settings.JOB_WORKER_PROCESSES)
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY)
+    args = parser.parse_args()
+
+    unknown = set(args.queues or []) - set(handlers)
+    if unknown:
+        parser.error(f"Unknown queues: {', '.join(sorted(unknown))}")
+
+    db = SessionLocal()
+    try:
+        tasks.schedule_periodic_jobs(db)
+    finally:
+        db.close()
+
+    if args.processes <= 1:
+        run_worker(args.queues, args.concurrency)
+        return
+
+    # Fresh interpreters, so no process inherits the parent's DB connections
+    context = multiprocessing.get_context("spawn")
+    processes = [
+        context.Process(target=run_worker, args=(args.queues, args.concurrency))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Any, Dict
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.models.job import Job
+from app.services import blockchain_service, donation_service, job_service
+from app.workers.runtime import register
+
+
+DONATION_SUBMISSION_QUEUE = "donation_submission"
+# Donors are waiting on these, so they go ahead of housekeeping jobs
+DONATION_SUBMISSION_PRIORITY = 10
+
+
+def enqueue_donation_submission(
+    db: Session,
+    *,
+    donation_id: int,
+    from_address: str,
+    to_address: str,
+    amount: float,
+    use_escrow: bool = False,
+) -> Job:
+    """
+    Queue the ledger submission of a donation.
+
+    Args:
+        db: Database session
+        donation_id: The donation to settle
+        from_address: The donor's XRPL address
+        to_address: The NPO's XRPL address
+        amount: The amount of XRP to send
+        use_escrow: Whether to use an escrow for conditional release
+
+    Returns:
+        The queued job
+    """
+    return job_service.enqueue(
+        db,
+        queue=DONATION_SUBMISSION_QUEUE,
+        payload={
+            "donation_id": donation_id,
+            "from_address": from_address,
+            "to_address": to_address,
+            "amount": float(amount),
+            "use_escrow": use_escrow,
+        },
+        priority=DONATION_SUBMISSION_PRIORITY,
+        max_attempts=1,
+    )
+
+
+@register(DONATION_SUBMISSION_QUEUE)
+async def submit_donation(db: Session, payload: Dict[str, Any]) -> None:
+    """
+    Submit the payment of a queued donation and record the transaction.
+
+    A ledger error marks the donation as failed and fails the job; the
+    submission is never retried because the payment may have gone through.
+
+    Args:
+        db: Database session
+        payload: The job payload written by ``enqueue_donation_submission``
+    """
+    donation = await asyncio.to_thread(
+        donation_service.get_donation, db, id=payload["donation_id"]
+    )
+    if not donation:
+        raise LookupError("Donation not found")
+
+    try:
+        tx_result = await blockchain_service.initiate_xrp_payment(
+            from_address=payload["from_address"],
+            to_address=payload["to_address"],
+            amount=payload["amount"],
+            use_escrow=payload["use_escrow"],
+        )
+    except Exception as e:
+        logger.error(f"Donation {donation.id} submission failed: {str(e)}")
+        await asyncio.to_thread(
+            donation_service.update_donation,
+            db, db_obj=donation, obj_in={"status": "failed"},
+        )
+        raise
+
+    donation_update = {
+        "tx_hash": tx_result.get("tx_hash"),
+        "escrow_id": tx_result.get("escrow_id"),
+        "status": "failed" if tx_result.get("status") == "failed" else "pending",
+    }
+    await asyncio.to_thread(
+        donation_service.update_donation, db, db_obj=donation, obj_in=donation_update
+    )
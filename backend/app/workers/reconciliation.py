@@ -0,0 +1,196 @@
+import time
+import asyncio
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.services import blockchain_service, donation_service
+
+
+class ReconciliationStats:
+    """Throughput counters for the reconciliation worker."""
+
+    def __init__(self):
+        self.started_at = time.monotonic()
+        self.checked = 0
+        self.resolved = 0
+        self.errors = 0
+        self.pages = 0
+        self.passes = 0
+        self.lag_seconds = 0.0
+        self.last_pass_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters and derived rates as a plain dictionary."""
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        return {
+            "checked": self.checked,
+            "resolved": self.resolved,
+            "errors": self.errors,
+            "pages": self.pages,
+            "passes": self.passes,
+            "checked_per_second": self.checked / elapsed,
+            "resolved_per_second": self.resolved / elapsed,
+            "lag_seconds": self.lag_seconds,
+            "last_pass_seconds": self.last_pass_seconds,
+        }
+
+
+class ReconciliationWorker:
+    """
+    Background worker moving pending donations to their final ledger status.
+
+    Pending donations with a ``tx_hash`` are read in pages ordered by ID. Each
+    page is checked against the ledger concurrently, bounded by a semaphore,
+    and all resulting status changes are applied in one transaction.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        check_status: Callable[[str], Awaitable[str]] = blockchain_service.check_transaction_status,
+        page_size: int = 100,
+        concurrency: int = 10,
+        interval: float = 30.0,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            session_factory: Callable returning a new database session
+            check_status: Coroutine returning the ledger status of a transaction
+            page_size: Number of donations read and committed per page
+            concurrency: Maximum number of ledger lookups in flight
+            interval: Seconds to sleep between passes
+        """
+        self.session_factory = session_factory
+        self.check_status = check_status
+        self.page_size = page_size
+        self.concurrency = concurrency
+        self.interval = interval
+        self.stats = ReconciliationStats()
+        self._task: Optional[asyncio.Task] = None
+
+    async def _check(
+        self, semaphore: asyncio.Semaphore, donation_id: int, tx_hash: str
+    ) -> Tuple[int, Optional[str]]:
+        """Look up one transaction while holding a semaphore slot."""
+        async with semaphore:
+            try:
+                return donation_id, await self.check_status(tx_hash)
+            except Exception as e:
+                self.stats.errors += 1
+                logger.warning(f"Reconciliation lookup failed for {tx_hash}: {str(e)}")
+                return donation_id, None
+
+    async def reconcile_page(
+        self, db: Session, after_id: Optional[int]
+    ) -> Tuple[int, Optional[int]]:
+        """
+        Reconcile one page of pending donations.
+
+        Args:
+            db: Database session
+            after_id: Only donations with a greater ID are considered
+
+        Returns:
+            Number of donations in the page and the last ID seen
+        """
+        page = await asyncio.to_thread(
+            donation_service.get_pending_donations_page,
+            db, after_id=after_id, limit=self.page_size,
+        )
+        if not page:
+            return 0, after_id
+
+        # Snapshot the columns we need before leaving the session's thread
+        rows: List[Tuple[int, str, Optional[datetime]]] = [
+            (donation.id, donation.tx_hash, donation.created_at) for donation in page
+        ]
+        oldest = min((created for _, _, created in rows if created), default=None)
+        if oldest is not None:
+            now = datetime.now(oldest.tzinfo) if oldest.tzinfo else datetime.utcnow()
+            self.stats.lag_seconds = max(self.stats.lag_seconds, (now - oldest).total_seconds())
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results = await asyncio.gather(
+            *[self._check(semaphore, donation_id, tx_hash) for donation_id, tx_hash, _ in rows]
+        )
+        self.stats.checked += len(rows)
+
+        statuses = {
+            donation_id: status
+            for donation_id, status in results
+            if status is not None and status != "pending"
+        }
+        if statuses:
+            resolved = await asyncio.to_thread(
+                donation_service.apply_donation_statuses, db, statuses=statuses
+            )
+            self.stats.resolved += len(resolved)
+
+        self.stats.pages += 1
+        return len(rows), rows[-1][0]
+
+    async def run_once(self) -> int:
+        """
+        Run one full pass over all pending donations.
+
+        Returns:
+            Number of donations checked in this pass
+        """
+        started = time.monotonic()
+        checked = 0
+        after_id = None
+        self.stats.lag_seconds = 0.0
+        db = self.session_factory()
+        try:
+            while True:
+                count, after_id = await self.reconcile_page(db, after_id)
+                checked += count
+                if count < self.page_size:
+                    break
+        finally:
+            db.close()
+
+        self.stats.passes += 1
+        self.stats.last_pass_seconds = time.monotonic() - started
+        return checked
+
+    async def run_forever(self) -> None:
+        """Run passes until cancelled, sleeping between them."""
+        while True:
+            try:
+                await self.run_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Reconciliation pass failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+
+    async def start(self) -> None:
+        """Start the worker as a background task."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run_forever())
+
+    async def stop(self) -> None:
+        """Stop the background task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+# Singleton instance
+reconciliation_worker = ReconciliationWorker(
+    page_size=settings.RECONCILIATION_PAGE_SIZE,
+    concurrency=settings.RECONCILIATION_CONCURRENCY,
+    interval=settings.RECONCILIATION_INTERVAL,
+)
@@ -0,0 +1,252 @@
+import os
+import time
+import socket
+import asyncio
+import inspect
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.database.session import SessionLocal
+from app.models.job import Job
+from app.services import job_service
+
+
+JobHandler = Callable[[Session, Dict[str, Any]], Union[Awaitable[None], None]]
+
+# Queue name -> handler
+handlers: Dict[str, JobHandler] = {}
+
+
+def register(queue: str) -> Callable[[JobHandler], JobHandler]:
+    """
+    Register the handler of a queue.
+
+    Handlers receive a database session and the decoded payload. Raising an
+    exception requeues the job with backoff until it runs out of attempts.
+    Sync handlers run in a thread so they don't block the event loop.
+    """
+    def decorator(handler: JobHandler) -> JobHandler:
+        handlers[queue] = handler
+        return handler
+    return decorator
+
+
+class QueueStats:
+    """Per-queue counters of one worker process."""
+
+    def __init__(self):
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+        self.total_wait = 0.0
+        self.total_run = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters and averages as a plain dictionary."""
+        finished = self.processed + self.failed + self.retried
+        return {
+            "processed": self.processed,
+            "failed": self.failed,
+            "retried": self.retried,
+            "avg_wait_seconds": self.total_wait / finished if finished else 0.0,
+            "avg_run_seconds": self.total_run / finished if finished else 0.0,
+        }
+
+
+class JobWorker:
+    """
+    Pool of tasks claiming and running jobs from the durable job queue.
+
+    Several ``JobWorker`` instances, in one or more processes, can drain the
+    same queues; the claim in ``job_service.claim_next`` keeps them from
+    running a job twice, and a job whose worker dies becomes visible again
+    once its visibility timeout lapses.
+    """
+
+    def __init__(
+        self,
+        queues: Optional[Sequence[str]] = None,
+        concurrency: int = 4,
+        poll_interval: float = 1.0,
+        visibility_timeout: float = 300,
+        session_factory: Callable[[], Session] = SessionLocal,
+        worker_id: Optional[str] = None,
+    ):
+        """
+        Initialize the worker.
+
+        Args:
+            queues: Queues to drain; defaults to every registered queue
+            concurrency: Number of jobs run at the same time
+            poll_interval: Seconds to wait when no job is ready
+            visibility_timeout: Seconds a claimed job stays invisible to other workers
+            session_factory: Callable returning a new database session
+            worker_id: Identifier recorded on claimed jobs
+        """
+        self.queues = list(queues) if queues else None
+        self.concurrency = concurrency
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.session_factory = session_factory
+        self.worker_id = worker_id or f"{socket.gethostname()}:{os.getpid()}"
+        self.stats: Dict[str, QueueStats] = {}
+        self._tasks: List[asyncio.Task] = []
+
+    def _queues(self) -> List[str]:
+        return self.queues if self.queues is not None else list(handlers)
+
+    def _stats(self, queue: str) -> QueueStats:
+        if queue not in self.stats:
+            self.stats[queue] = QueueStats()
+        return self.stats[queue]
+
+    def _extend_lock(self, job_id: int) -> bool:
+        db = self.session_factory()
+        try:
+            return job_service.extend_lock(
+                db,
+                job_id=job_id,
+                worker_id=self.worker_id,
+                visibility_timeout=self.visibility_timeout,
+            )
+        finally:
+            db.close()
+
+    async def _heartbeat(self, job_id: int) -> None:
+        """Keep extending the lock of a running job so no other worker reclaims it."""
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                held = await asyncio.to_thread(self._extend_lock, job_id)
+            except Exception as e:
+                logger.warning(f"Could not extend the lock of job {job_id}: {str(e)}")
+                continue
+            if not held:
+                logger.warning(f"Job {job_id} is no longer locked by {self.worker_id}")
+                return
+
+    async def execute(self, db: Session, job: Job) -> None:
+        """
+        Run the handler of a claimed job and record the outcome.
+
+        Args:
+            db: Database session
+            job: The claimed job
+        """
+        stats = self._stats(job.queue)
+        if job.started_at is not None and job.run_at is not None:
+            stats.total_wait += max((job.started_at - job.run_at).total_seconds(), 0.0)
+
+        job_id = job.id
+        started = time.monotonic()
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        try:
+            handler = handlers.get(job.queue)
+            if handler is None:
+                raise LookupError(f"No handler registered for queue {job.queue}")
+
+            payload = job_service.get_payload(job)
+            if inspect.iscoroutinefunction(handler):
+                await handler(db, payload)
+            else:
+                await asyncio.to_thread(handler, db, payload)
+        except Exception as e:
+            stats.total_run += time.monotonic() - started
+            logger.warning(f"Job {job.id} on {job.queue} failed: {str(e)}")
+            db.rollback()
+            job = await asyncio.to_thread(
+                job_service.retry_job, db, job=job, worker_id=self.worker_id, error=str(e)
+            )
+            if job is None:
+                logger.warning(f"Job {job_id} was reclaimed by another worker before it failed")
+            elif job.status == "failed":
+                stats.failed += 1
+            else:
+                stats.retried += 1
+            return
+        finally:
+            heartbeat.cancel()
+
+        stats.total_run += time.monotonic() - started
+        stats.processed += 1
+        done = await asyncio.to_thread(
+            job_service.complete_job, db, job=job, worker_id=self.worker_id
+        )
+        if done is None:
+            logger.warning(f"Job {job_id} was reclaimed by another worker before it completed")
+
+    async def run_once(self) -> bool:
+        """
+        Claim and run a single job.
+
+        Returns:
+            True if a job was run, False if none was ready
+        """
+        queues = self._queues()
+        if not queues:
+            return False
+
+        db = self.session_factory()
+        try:
+            job = await asyncio.to_thread(
+                job_service.claim_next,
+                db,
+                queues=queues,
+                worker_id=self.worker_id,
+                visibility_timeout=self.visibility_timeout,
+            )
+            if job is None:
+                return False
+            await self.execute(db, job)
+            return True
+        finally:
+            db.close()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                if not await self.run_once():
+                    await asyncio.sleep(self.poll_interval)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Job worker error: {str(e)}")
+                await asyncio.sleep(self.poll_interval)
+
+    async def start(self) -> None:
+        """Start the worker tasks."""
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._loop()) for _ in range(self.concurrency)]
+
+    async def stop(self) -> None:
+        """Stop the worker tasks."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def run_forever(self) -> None:
+        """Run until cancelled."""
+        await self.start()
+        try:
+            await asyncio.gather(*self._tasks)
+        finally:
+            await self.stop()
+
+    def metrics(self) -> Dict[str, Any]:
+        """Get the in-process counters of every queue this worker has touched."""
+        return {
+            "worker_id": self.worker_id,
+            "queues": {queue: stats.as_dict() for queue, stats in self.stats.items()},
+        }
+
+
+# Worker running inside the API process when JOB_WORKERS_IN_API is set
+job_worker = JobWorker(
+    concurrency=settings.JOB_WORKER_CONCURRENCY,
+    poll_interval=settings.JOB_POLL_INTERVAL,
+    visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT,
+)
@@ -0,0 +1,147 @@
+import os
+import shutil
+import uuid
+from typing import Any, Dict, Optional
+
+from fastapi import UploadFile
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.job import Job
+from app.services import campaign_service, counter_service, job_service, npo_service
+from app.workers.runtime import register
+
+
+PROOF_UPLOAD_QUEUE = "proof_upload"
+PROOF_UPLOAD_PRIORITY = 5
+
+CAMPAIGN_STATUS_QUEUE = "campaign_status"
+
+COUNTER_COMPACTION_QUEUE = "counter_compaction"
+
+# Periodic jobs queue their next run after every run, failed or not, so a
+# failed run is not retried as well
+PERIODIC_MAX_ATTEMPTS = 1
+
+
+def enqueue_proof_upload(db: Session, *, proof_file: UploadFile, npo_id: int) -> str:
+    """
+    Spool a proof file to disk and queue its upload to S3.
+
+    The S3 key is chosen up front so the URL can be stored right away; it
+    resolves once the upload job has run. The job is added to the session
+    without committing, so it lands together with the proof record. The
+    spool directory must be shared with the worker processes.
+
+    Args:
+        db: Database session
+        proof_file: The uploaded proof file
+        npo_id: The NPO the proof belongs to
+
+    Returns:
+        The URL the proof will be served from
+    """
+    os.makedirs(settings.JOB_UPLOAD_SPOOL_DIR, exist_ok=True)
+    path = os.path.join(settings.JOB_UPLOAD_SPOOL_DIR, uuid.uuid4().hex)
+    with open(path, "wb") as spool:
+        shutil.copyfileobj(proof_file.file, spool)
+
+    key = npo_service.get_proof_key(proof_file.filename, npo_id)
+    job_service.enqueue(
+        db,
+        queue=PROOF_UPLOAD_QUEUE,
+        payload={"path": path, "key": key, "content_type": proof_file.content_type},
+        priority=PROOF_UPLOAD_PRIORITY,
+        commit=False,
+    )
+    return npo_service.get_proof_url(key)
+
+
+@register(PROOF_UPLOAD_QUEUE)
+def upload_proof(db: Session, payload: Dict[str, Any]) -> None:
+    """
+    Upload a spooled proof file to S3 and remove it from the spool.
+    """
+    path = payload["path"]
+    if not os.path.exists(path):
+        # A previous attempt uploaded it but died before completing the job
+        logger.warning(f"Spooled proof {path} is gone, assuming it was uploaded")
+        return
+
+    with open(path, "rb") as fileobj:
+        npo_service.upload_proof_object(fileobj, payload["key"], payload["content_type"])
+    os.remove(path)
+
+
+def _schedule_next(db: Session, *, queue: str, delay: float) -> None:
+    """
+    Queue the next run of a periodic job from its handler.
+
+    The handler's own work may have failed and left the session unusable,
+    so it is rolled back first.
+    """
+    db.rollback()
+    job_service.enqueue(
+        db, queue=queue, payload={}, delay=delay, max_attempts=PERIODIC_MAX_ATTEMPTS
+    )
+
+
+def schedule_campaign_status(db: Session, *, delay: float = 0) -> Optional[Job]:
+    """
+    Queue the next campaign status check unless one is already pending.
+    """
+    if job_service.has_pending(db, queue=CAMPAIGN_STATUS_QUEUE):
+        return None
+    return job_service.enqueue(
+        db, queue=CAMPAIGN_STATUS_QUEUE, payload={}, delay=delay, max_attempts=PERIODIC_MAX_ATTEMPTS
+    )
+
+
+@register(CAMPAIGN_STATUS_QUEUE)
+def check_campaign_status(db: Session, payload: Dict[str, Any]) -> None:
+    """
+    Deactivate expired campaigns and schedule the next check, even when
+    this one fails.
+    """
+    try:
+        campaign_service.check_campaign_status(db)
+    finally:
+        _schedule_next(db, queue=CAMPAIGN_STATUS_QUEUE, delay=settings.CAMPAIGN_STATUS_INTERVAL)
+
+
+def schedule_counter_compaction(db: Session, *, delay: float = 0) -> Optional[Job]:
+    """
+    Queue the next sharded counter compaction unless one is already pending.
+    """
+    if not settings.SHARDED_COUNTERS_ENABLED:
+        return None
+    if job_service.has_pending(db, queue=COUNTER_COMPACTION_QUEUE):
+        return None
+    return job_service.enqueue(
+        db, queue=COUNTER_COMPACTION_QUEUE, payload={}, delay=delay, max_attempts=PERIODIC_MAX_ATTEMPTS
+    )
+
+
+@register(COUNTER_COMPACTION_QUEUE)
+def compact_counters(db: Session, payload: Dict[str, Any]) -> None:
+    """
+    Fold sharded counters back into their rows and schedule the next run,
+    even when this one fails.
+    """
+    try:
+        folded = counter_service.compact(db)
+        if folded:
+            logger.info(f"Compacted {folded} sharded counters")
+    finally:
+        _schedule_next(
+            db, queue=COUNTER_COMPACTION_QUEUE, delay=settings.COUNTER_COMPACTION_INTERVAL
+        )
+
+
+def schedule_periodic_jobs(db: Session) -> None:
+    """
+    Seed the self-rescheduling maintenance jobs.
+    """
+    schedule_campaign_status(db)
+    schedule_counter_compaction(db)
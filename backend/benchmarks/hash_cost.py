@@ -0,0 +1,62 @@
+"""
+bcrypt hash time per cost setting on this machine.
+
+Times hashing at each cost (log2 rounds) and marks the most expensive one
+that fits the login budget; set it as PASSWORD_BCRYPT_ROUNDS. Existing
+hashes are upgraded as their users log in.
+
+    python -m benchmarks.hash_cost
+    python -m benchmarks.hash_cost --min 10 --max 15 --budget-ms 250
+"""
+import argparse
+import statistics
+import time
+from typing import Dict
+
+from passlib.context import CryptContext
+
+from app.core.config import settings
+
+PASSWORD = "correct horse battery staple"
+
+
+def measure(rounds: int, repeats: int) -> Dict[str, float]:
+    """Time hashing with ``rounds`` and report median and worst latency."""
+    context = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds)
+    latencies = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        context.hash(PASSWORD)
+        latencies.append(time.perf_counter() - started)
+    return {
+        "p50_ms": statistics.median(latencies) * 1000,
+        "max_ms": max(latencies) * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--min", type=int, default=8, help="Lowest cost to time")
+    parser.add_argument("--max", type=int, default=14, help="Highest cost to time")
+    parser.add_argument("--budget-ms", type=float, default=250.0, help="Target hash time")
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    best = None
+    for rounds in range(args.min, args.max + 1):
+        result = measure(rounds, args.repeats)
+        if result["p50_ms"] <= args.budget_ms:
+            best = rounds
+        current = " (current)" if rounds == settings.PASSWORD_BCRYPT_ROUNDS else ""
+        print(
+            f"rounds {rounds:2d}: p50 {result['p50_ms']:8.1f} ms, max {result['max_ms']:8.1f} ms, "
+            f"{1000 / result['p50_ms']:7.1f} hashes/s per core{current}"
+        )
+    if best is None:
+        print(f"No cost fits {args.budget_ms:.0f} ms; lower --min")
+    else:
+        print(f"Highest cost within {args.budget_ms:.0f} ms: PASSWORD_BCRYPT_ROUNDS={best}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Time spent in the logging call by the thread that logs.
+
+Logs N records through setup_logging to a rotating file and to a console
+stream that stalls now and then, as a log pipe under backpressure or a busy
+disk does, once writing synchronously and once through the background sink.
+Reports the latency of the logging call and records dropped when the queue
+overflowed. Formatting stays on the caller either way; stalled writes,
+rotation and compression move to the writer thread.
+
+    python -m benchmarks.log_sink
+    python -m benchmarks.log_sink --records 100000 --stall-every 500 --stall-ms 50 --json
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from loguru import logger
+
+from app.core import logging as app_logging
+from app.core.logging import setup_logging
+
+
+class StallingStream:
+    """Console stream discarding output that blocks on every n-th write."""
+
+    def __init__(self, every: int, stall: float):
+        self.every = every
+        self.stall = stall
+        self.writes = 0
+        self.devnull = open(os.devnull, "w")
+
+    def write(self, message: str) -> None:
+        self.writes += 1
+        if self.every and self.writes % self.every == 0:
+            time.sleep(self.stall)
+        self.devnull.write(message)
+
+    def flush(self) -> None:
+        pass
+
+
+def run(log_path: Path, records: int, background: bool, args: argparse.Namespace) -> dict:
+    """Log ``records`` records and report call latencies and drops."""
+    sys.stderr = StallingStream(args.stall_every, args.stall_ms / 1000)
+    setup_logging(
+        log_path=log_path,
+        rotation=args.rotation,
+        json=args.json,
+        background=background,
+        max_queue=args.queue,
+    )
+    latencies = []
+    for i in range(records):
+        started = time.perf_counter()
+        logger.info("donation {} confirmed", i)
+        latencies.append(time.perf_counter() - started)
+    dropped = app_logging.log_sink.dropped if background else 0
+    logger.remove()
+    if app_logging.log_sink is not None:
+        app_logging.log_sink.stop()
+        app_logging.log_sink = None
+    sys.stderr = sys.__stderr__
+    latencies.sort()
+    return {
+        "mean_us": statistics.fmean(latencies) * 1e6,
+        "p99_us": latencies[int(len(latencies) * 0.99)] * 1e6,
+        "p999_ms": latencies[int(len(latencies) * 0.999)] * 1e3,
+        "dropped": dropped,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--records", type=int, default=20_000)
+    parser.add_argument("--queue", type=int, default=10_000)
+    parser.add_argument("--rotation", default="1 MB", help="Log file rotation")
+    parser.add_argument("--stall-every", type=int, default=1000, help="Console writes per stall")
+    parser.add_argument("--stall-ms", type=float, default=20.0, help="Length of a stall")
+    parser.add_argument("--json", action="store_true", help="Use the JSON format")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, background in (("synchronous", False), ("background", True)):
+            result = run(Path(directory) / f"{name}.log", args.records, background, args)
+            print(
+                f"{name:>12}: mean {result['mean_us']:6.1f} us, p99 {result['p99_us']:6.1f} us, "
+                f"p99.9 {result['p999_ms']:5.1f} ms per call, {result['dropped']} dropped"
+            )
+
+
+if __name__ == "__main__":
+    main()
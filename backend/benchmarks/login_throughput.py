@@ -0,0 +1,87 @@
+"""
+Login throughput under mixed load: bcrypt on the event loop vs. worker pools.
+
+Concurrent clients log in repeatedly while a cheap "read" request ticks on
+the same event loop. Reports logins/s and how late the reads ran, which is
+how long every other request waits while a login holds the loop.
+
+    python -m benchmarks.login_throughput
+    python -m benchmarks.login_throughput --clients 32 --workers 4 --duration 10
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, Dict
+
+from app.core import security
+from app.core.hashing import PasswordHasher
+
+PASSWORD = "correct horse battery staple"
+READ_INTERVAL = 0.01
+
+
+async def run(verify: Callable[[], Awaitable[bool]], clients: int, duration: float) -> Dict[str, float]:
+    """Log in from ``clients`` coroutines for ``duration`` seconds while timing reads."""
+    deadline = time.perf_counter() + duration
+    logins = 0
+    lags = []
+
+    async def client() -> None:
+        nonlocal logins
+        while time.perf_counter() < deadline:
+            assert await verify()
+            logins += 1
+
+    async def reader() -> None:
+        while time.perf_counter() < deadline:
+            expected = time.perf_counter() + READ_INTERVAL
+            await asyncio.sleep(READ_INTERVAL)
+            lags.append(max(0.0, time.perf_counter() - expected))
+
+    started = time.perf_counter()
+    await asyncio.gather(reader(), *(client() for _ in range(clients)))
+    elapsed = time.perf_counter() - started
+    lags.sort()
+    return {
+        "logins_per_s": logins / elapsed,
+        "read_lag_p50_ms": statistics.median(lags) * 1000,
+        "read_lag_p99_ms": lags[int(len(lags) * 0.99)] * 1000,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent login loops")
+    parser.add_argument("--workers", type=int, default=2, help="Hashing worker processes")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per mode")
+    args = parser.parse_args()
+
+    hashed = security.get_password_hash(PASSWORD)
+    threads = PasswordHasher(workers=0)
+    processes = PasswordHasher(workers=args.workers)
+
+    async def inline() -> bool:
+        return security.verify_password(PASSWORD, hashed)
+
+    modes = {
+        "inline": inline,
+        "threads": lambda: threads.verify(PASSWORD, hashed),
+        f"processes({args.workers})": lambda: processes.verify(PASSWORD, hashed),
+    }
+    try:
+        # Start the worker processes before timing
+        asyncio.run(processes.verify(PASSWORD, hashed))
+        for name, verify in modes.items():
+            result = asyncio.run(run(verify, args.clients, args.duration))
+            print(
+                f"{name:>14}: {result['logins_per_s']:7.1f} logins/s, "
+                f"read lag p50 {result['read_lag_p50_ms']:7.1f} ms, "
+                f"p99 {result['read_lag_p99_ms']:7.1f} ms"
+            )
+    finally:
+        processes.shutdown()
+
+
+if __name__ == "__main__":
+    main()
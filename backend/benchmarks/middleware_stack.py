@@ -0,0 +1,129 @@
+"""
+Requests/s of a trivial route through the full middleware stack.
+
+Builds the main.py stack (CORS, security headers, rate limiting, trusted
+hosts) twice, once with the previous BaseHTTPMiddleware security headers
+and rate limiter and once with the plain ASGI ones, and calls each app
+in-process, without a server or network, so only middleware cost differs.
+
+    python -m benchmarks.middleware_stack
+    python -m benchmarks.middleware_stack --requests 20000 --concurrency 50
+"""
+import argparse
+import asyncio
+import time
+from typing import Callable
+
+from fastapi import FastAPI
+from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.trustedhost import TrustedHostMiddleware
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.core.rate_limit import (
+    RateLimitMiddleware,
+    RateLimitPolicies,
+    RateLimitPolicy,
+    rate_limit_headers,
+)
+from app.core.security_headers import SECURITY_HEADERS, SecurityHeadersMiddleware
+
+# Large enough that no benchmark request is limited
+POLICIES = [RateLimitPolicy("default", requests=10**9, window=60)]
+
+
+class BaseHTTPSecurityHeaders(BaseHTTPMiddleware):
+    """The previous security headers middleware."""
+
+    async def dispatch(self, request, call_next):
+        response = await call_next(request)
+        response.headers.update(SECURITY_HEADERS)
+        return response
+
+
+class BaseHTTPRateLimit(BaseHTTPMiddleware):
+    """The previous rate limit middleware, with the current policies."""
+
+    def __init__(self, app, policies):
+        super().__init__(app)
+        self.policies = policies
+
+    async def dispatch(self, request, call_next):
+        policy, cost = self.policies.match(request.method, request.url.path)
+        result = self.policies.hit(policy, request.client.host, cost)
+        response = await call_next(request)
+        response.raw_headers.extend(rate_limit_headers(policy, result))
+        return response
+
+
+def build(base_http: bool) -> FastAPI:
+    """The main.py middleware stack around one trivial route."""
+    app = FastAPI()
+
+    @app.get("/ping")
+    async def ping():
+        return {"ok": True}
+
+    app.add_middleware(CORSMiddleware, allow_origins=["*"], allow_methods=["*"], allow_headers=["*"])
+    policies = RateLimitPolicies(POLICIES)
+    if base_http:
+        app.add_middleware(BaseHTTPSecurityHeaders)
+        app.add_middleware(BaseHTTPRateLimit, policies=policies)
+    else:
+        app.add_middleware(SecurityHeadersMiddleware)
+        app.add_middleware(RateLimitMiddleware, policies=policies)
+    app.add_middleware(TrustedHostMiddleware, allowed_hosts=["*"])
+    return app
+
+
+async def call(app: Callable) -> None:
+    """Send one GET /ping through the app."""
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "path": "/ping",
+        "raw_path": b"/ping",
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver")],
+        "client": ("10.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    body_sent = asyncio.Event()
+
+    async def receive():
+        if body_sent.is_set():
+            await asyncio.Event().wait()
+        body_sent.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def run(app: Callable, requests: int, concurrency: int) -> float:
+    """Send ``requests`` requests, ``concurrency`` at a time; return requests/s."""
+    for _ in range(100):
+        await call(app)
+    started = time.perf_counter()
+    for offset in range(0, requests, concurrency):
+        await asyncio.gather(*(call(app) for _ in range(min(concurrency, requests - offset))))
+    return requests / (time.perf_counter() - started)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--requests", type=int, default=10_000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    args = parser.parse_args()
+
+    for name, base_http in (("BaseHTTPMiddleware", True), ("pure ASGI", False)):
+        rate = asyncio.run(run(build(base_http), args.requests, args.concurrency))
+        print(f"{name:>18}: {rate:8.0f} requests/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,44 +6,53 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
-from app.database.session import Base, get_db
+from app.database.base_class import Base
+from app.database.session import get_db
 from app.core.config import settings
 from app.models.user import User
-from app.models.npo import NonProfitOrg
+from app.models.npo import NPO as NonProfitOrg
 from app.models.campaign import Campaign
 from app.models.donation import Donation
 from app.core import security
 from app.services import user_service
 
 
-# Create a test database URL
-SQLALCHEMY_TEST_DATABASE_URL = "sqlite:///./test.db"
+@pytest.fixture
+def engine(tmp_path):
+    """
+    Engine on a fresh SQLite file with every table created.
+    """
+    engine = create_engine(
+        f"sqlite:///{tmp_path}/test.db",
+        connect_args={"check_same_thread": False, "timeout": 30},
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
 
-# Create test engine
-engine = create_engine(
-    SQLALCHEMY_TEST_DATABASE_URL, connect_args={"check_same_thread": False}
-)
 
-# Create test session
-TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+@pytest.fixture
+def session_factory(engine):
+    """
+    Session factory bound to the test database, for tests using several sessions.
+    """
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
 @pytest.fixture(scope="function")
-def db() -> Generator:
+def db(session_factory) -> Generator:
     """
     Create a fresh database on each test case.
     """
-    Base.metadata.create_all(bind=engine)  # Create the tables
-    db = TestSessionLocal()
+    db = session_factory()
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)  # Drop the tables
 
 
 @pytest.fixture(scope="function")
-def client(db: TestSessionLocal) -> Generator:
+def client(db) -> Generator:
     """
     Create a new FastAPI TestClient that uses the `db` fixture.
     """
@@ -59,7 +68,7 @@ def client(db: TestSessionLocal) -> Generator:
 
 
 @pytest.fixture(scope="function")
-def normal_user(db: TestSessionLocal) -> User:
+def normal_user(db) -> User:
     """
     Create a normal user for testing.
     """
@@ -74,7 +83,7 @@ def normal_user(db: TestSessionLocal) -> User:
 
 
 @pytest.fixture(scope="function")
-def admin_user(db: TestSessionLocal) -> User:
+def admin_user(db) -> User:
     """
     Create an admin user for testing.
     """
@@ -120,7 +129,7 @@ def _get_token_headers(client: TestClient, email: str, password: str) -> Dict[st
 
 
 @pytest.fixture(scope="function")
-def npo(db: TestSessionLocal, normal_user: User) -> NonProfitOrg:
+def npo(db, normal_user: User) -> NonProfitOrg:
     """
     Create a non-profit organization for testing.
     """
@@ -138,7 +147,7 @@ def npo(db: TestSessionLocal, normal_user: User) -> NonProfitOrg:
 
 
 @pytest.fixture(scope="function")
-def campaign(db: TestSessionLocal, npo: NonProfitOrg) -> Campaign:
+def campaign(db, npo: NonProfitOrg) -> Campaign:
     """
     Create a campaign for testing.
     """
@@ -159,7 +168,7 @@ def campaign(db: TestSessionLocal, npo: NonProfitOrg) -> Campaign:
 
 
 @pytest.fixture(scope="function")
-def donation(db: TestSessionLocal, normal_user: User, campaign: Campaign) -> Donation:
+def donation(db, normal_user: User, campaign: Campaign) -> Donation:
     """
     Create a donation for testing.
     """
@@ -0,0 +1,89 @@
+import pytest
+from datetime import timedelta
+from unittest.mock import patch
+from fastapi import HTTPException
+
+from app.api import auth, deps
+from app.core import security
+from app.core.cache import MemoryCache
+from app.core.config import settings
+from app.models.user import User
+from app.services import user_service
+
+
+@pytest.fixture(autouse=True)
+def memory_cache():
+    cache = MemoryCache(max_entries=100, ttl=30)
+    with patch("app.services.entity_cache.cache", cache):
+        yield cache
+
+
+@pytest.fixture
+def db(db):
+    db.add(User(id="u1", email="donor@example.com", hashed_password="x", is_active=True))
+    db.commit()
+    return db
+
+
+def _current_user(db, token):
+    db.expunge_all()
+    return deps.get_current_user(db=db, token=token)
+
+
+def test_identity_is_cached_per_token(db, memory_cache):
+    """Repeated requests with one token load the user once."""
+    token = security.create_access_token("u1")
+    with patch.object(user_service, "get_user", wraps=user_service.get_user) as get_user:
+        assert _current_user(db, token).email == "donor@example.com"
+        assert _current_user(db, token).email == "donor@example.com"
+        assert get_user.call_count == 1
+
+        _current_user(db, security.create_access_token("u1", expires_delta=timedelta(minutes=5)))
+        assert get_user.call_count == 2
+
+    cached = next(iter(memory_cache._entries.values()))[1]
+    assert "hashed_password" not in cached
+    assert _current_user(db, token).hashed_password == "x"
+
+
+def test_update_user_invalidates_identity(db):
+    """Deactivation is seen by the next request instead of after the TTL."""
+    token = security.create_access_token("u1")
+    user = _current_user(db, token)
+    user_service.update_user(db, db_obj=user, obj_in={"is_active": False})
+
+    with pytest.raises(HTTPException) as exc:
+        deps.get_current_active_user(current_user=_current_user(db, token))
+    assert exc.value.status_code == 400
+
+
+def test_identity_cache_can_be_disabled(db):
+    """A zero TTL queries the database on every request."""
+    token = security.create_access_token("u1")
+    with patch.object(settings, "IDENTITY_CACHE_TTL", 0), patch.object(
+        user_service, "get_user", wraps=user_service.get_user
+    ) as get_user:
+        _current_user(db, token)
+        _current_user(db, token)
+    assert get_user.call_count == 2
+
+
+def test_stateless_tokens_skip_the_lookup(db):
+    """Tokens carrying identity claims are trusted without a query."""
+    with patch.object(settings, "STATELESS_AUTH", True):
+        user = db.get(User, "u1")
+        token = auth.create_access_token(data={"sub": user.email, **security.identity_claims(user)})
+        with patch.object(user_service, "get_user", side_effect=AssertionError("queried")):
+            current = _current_user(db, token)
+
+    assert current.is_active is True
+    assert current.is_admin is False
+    assert current.is_superuser is False
+    assert current.email == "donor@example.com"
+
+
+def test_tokens_without_claims_fall_back_to_lookup(db):
+    """Tokens issued before stateless mode was enabled still work."""
+    token = security.create_access_token("u1")
+    with patch.object(settings, "STATELESS_AUTH", True):
+        assert _current_user(db, token).email == "donor@example.com"
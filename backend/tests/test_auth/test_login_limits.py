@@ -0,0 +1,72 @@
+import asyncio
+import pytest
+from types import SimpleNamespace
+from unittest.mock import patch
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api import auth
+from app.core.concurrency import ConcurrencyLimiter
+from app.models.user import User
+
+
+@pytest.fixture
+def db(db):
+    for i in range(3):
+        db.add(User(id=f"u{i}", email=f"donor{i}@example.com", hashed_password="pw"))
+    db.commit()
+    return db
+
+
+def _login(db, email, ip="10.0.0.1"):
+    request = Request({"type": "http", "headers": [], "client": (ip, 1234)})
+    form = SimpleNamespace(username=email, password="pw")
+    return auth.login(request=request, form_data=form, db=db)
+
+
+@pytest.fixture
+def slow_verify():
+    release = asyncio.Event()
+
+    async def verify(password, hashed_password):
+        await release.wait()
+        return password == hashed_password
+
+    with patch.object(auth.password_hasher, "verify", side_effect=verify), patch(
+        "app.services.user_service.password_needs_rehash", return_value=False
+    ):
+        yield release
+
+
+@pytest.mark.asyncio
+async def test_concurrent_logins_per_account_are_limited(db, slow_verify):
+    """A second login to the same account while one runs is rejected."""
+    with patch.object(auth, "login_account_limiter", ConcurrencyLimiter(1)):
+        first = asyncio.ensure_future(_login(db, "donor0@example.com"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc:
+            await _login(db, "DONOR0@example.com", ip="10.0.0.2")
+        assert exc.value.status_code == 429
+        assert exc.value.headers["Retry-After"] == "1"
+
+        slow_verify.set()
+        assert (await first)["token_type"] == "bearer"
+        assert (await _login(db, "donor0@example.com"))["token_type"] == "bearer"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_logins_per_ip_are_limited(db, slow_verify):
+    """One client cannot run more logins at once than its limit."""
+    with patch.object(auth, "login_ip_limiter", ConcurrencyLimiter(2)):
+        running = [asyncio.ensure_future(_login(db, f"donor{i}@example.com")) for i in range(2)]
+        await asyncio.sleep(0)
+
+        with pytest.raises(HTTPException) as exc:
+            await _login(db, "donor2@example.com")
+        assert exc.value.status_code == 429
+        other_client = asyncio.ensure_future(_login(db, "donor2@example.com", ip="10.0.0.9"))
+
+        slow_verify.set()
+        results = await asyncio.gather(other_client, *running)
+        assert all(result["token_type"] == "bearer" for result in results)
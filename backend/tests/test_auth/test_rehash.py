@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import patch
+
+from app.models.user import User
+from app.services import user_service
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    db = session_factory()
+    db.add(User(id="u1", email="donor@example.com", hashed_password="old-hash"))
+    db.commit()
+    db.close()
+    with patch("app.services.user_service.SessionLocal", session_factory), patch.object(
+        user_service.password_hasher, "hash_blocking", return_value="new-hash"
+    ):
+        yield session_factory
+
+
+def _drain():
+    user_service._rehash_executor.submit(lambda: None).result()
+
+
+def _stored_hash(session_factory):
+    db = session_factory()
+    try:
+        return db.get(User, "u1").hashed_password
+    finally:
+        db.close()
+
+
+@patch("app.services.user_service.verify_password", return_value=True)
+@patch("app.services.user_service.password_needs_rehash", return_value=True)
+def test_outdated_hash_is_upgraded_after_login(mock_needs_rehash, mock_verify, session_factory):
+    """A successful login with an outdated hash stores a new one afterwards."""
+    db = session_factory()
+    try:
+        assert user_service.authenticate(db, email="donor@example.com", password="pw").id == "u1"
+    finally:
+        db.close()
+    _drain()
+
+    assert _stored_hash(session_factory) == "new-hash"
+    user_service.password_hasher.hash_blocking.assert_called_once_with("pw")
+
+
+@patch("app.services.user_service.password_needs_rehash", return_value=False)
+def test_current_hash_is_left_alone(mock_needs_rehash, session_factory):
+    """Hashes made with the current cost are not rehashed."""
+    user = User(id="u1", hashed_password="old-hash")
+    assert user_service.schedule_rehash(user, "pw") is False
+
+
+@patch("app.services.user_service.password_needs_rehash", return_value=True)
+def test_rehash_does_not_overwrite_password_change(mock_needs_rehash, session_factory):
+    """A password changed before the rehash lands wins."""
+    db = session_factory()
+    try:
+        user = db.get(User, "u1")
+        user.hashed_password = "changed-hash"
+        db.commit()
+    finally:
+        db.close()
+
+    assert user_service.schedule_rehash(User(id="u1", hashed_password="old-hash"), "pw")
+    _drain()
+    assert _stored_hash(session_factory) == "changed-hash"
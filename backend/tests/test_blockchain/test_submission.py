@@ -0,0 +1,212 @@
+import asyncio
+import pytest
+from xrpl.core.binarycodec import decode
+from xrpl.models.requests import AccountInfo, Fee, Ledger, SubmitOnly, Tx
+from xrpl.models.response import Response, ResponseStatus
+from xrpl.models.transactions import Payment
+from xrpl.models.transactions.transaction import Transaction
+from xrpl.wallet import Wallet
+
+from app.blockchain.submission import SubmissionPipeline, SubmissionException
+
+
+def _ok(result: dict) -> Response:
+    return Response(status=ResponseStatus.SUCCESS, result=result)
+
+
+class FakeLedgerClient:
+    """In-memory ledger answering the requests the pipeline makes."""
+
+    def __init__(self, sequence: int = 10):
+        self.account_sequence = sequence
+        self.validated_index = 100
+        self.submitted = []
+        self.validated = {}
+        self.engine_results = []
+        self.auto_validate = True
+        self.account_info_calls = 0
+
+    async def request(self, request):
+        if isinstance(request, AccountInfo):
+            self.account_info_calls += 1
+            return _ok({"account_data": {"Sequence": self.account_sequence}})
+        if isinstance(request, Ledger):
+            return _ok({"ledger_index": self.validated_index})
+        if isinstance(request, Fee):
+            return _ok({"drops": {"open_ledger_fee": "12"}})
+        if isinstance(request, SubmitOnly):
+            tx = decode(request.tx_blob)
+            engine_result = self.engine_results.pop(0) if self.engine_results else "tesSUCCESS"
+            self.submitted.append((tx, engine_result))
+            if engine_result == "tesSUCCESS" and self.auto_validate:
+                self.account_sequence = max(self.account_sequence, tx["Sequence"] + 1)
+                self.validated[self._hash(request.tx_blob)] = "tesSUCCESS"
+            return _ok({"engine_result": engine_result})
+        if isinstance(request, Tx):
+            if request.transaction in self.validated:
+                return _ok({
+                    "validated": True,
+                    "ledger_index": self.validated_index,
+                    "meta": {"TransactionResult": self.validated[request.transaction]},
+                })
+            return Response(status=ResponseStatus.ERROR, result={"error": "txnNotFound"})
+        raise AssertionError(f"Unexpected request {request}")
+
+    @staticmethod
+    def _hash(tx_blob: str) -> str:
+        return Transaction.from_xrpl(decode(tx_blob)).get_hash()
+
+
+class TestSubmissionPipeline:
+    """Tests for pipelined submission with local sequence management."""
+
+    @pytest.fixture
+    def wallet(self):
+        return Wallet.create()
+
+    def _payment(self, wallet: Wallet) -> Payment:
+        return Payment(
+            account=wallet.classic_address,
+            destination="rPT1Sjq2YGrBMTttX4GZHjKu9dyfzbpAYe",
+            amount="1000000",
+        )
+
+    @pytest.mark.asyncio
+    async def test_back_to_back_submission(self, wallet):
+        """Concurrent submissions get consecutive sequences without waiting for validation."""
+        ledger = FakeLedgerClient(sequence=10)
+        ledger.auto_validate = False
+        pipeline = SubmissionPipeline(ledger, poll_interval=0.01)
+        try:
+            pending = await asyncio.gather(
+                *[pipeline.submit(self._payment(wallet), wallet) for _ in range(5)]
+            )
+            assert sorted(p.sequence for p in pending) == [10, 11, 12, 13, 14]
+            # Submission order on the wire follows sequence order
+            assert [tx["Sequence"] for tx, _ in ledger.submitted] == [10, 11, 12, 13, 14]
+            assert all(tx["LastLedgerSequence"] == 120 for tx, _ in ledger.submitted)
+            assert ledger.account_info_calls == 1
+            assert len(pipeline.outstanding()) == 5
+
+            # Validate them all and let the tracker pick it up
+            for p in pending:
+                ledger.validated[p.tx_hash] = "tesSUCCESS"
+            results = await asyncio.gather(*[pipeline.wait(p, timeout=2) for p in pending])
+            assert all(r["status"] == "completed" for r in results)
+            assert pipeline.outstanding() == []
+        finally:
+            await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_expired_transaction_is_resubmitted_then_gap_filled(self, wallet):
+        """Expired transactions are retried with the same sequence, then the gap is filled."""
+        ledger = FakeLedgerClient(sequence=10)
+        ledger.auto_validate = False
+        pipeline = SubmissionPipeline(ledger, ledger_offset=5, max_attempts=2, poll_interval=0.01)
+        try:
+            first = await pipeline.submit(self._payment(wallet), wallet)
+            second = await pipeline.submit(self._payment(wallet), wallet)
+            ledger.validated[second.tx_hash] = "tesSUCCESS"
+
+            # Move past LastLedgerSequence twice
+            ledger.validated_index = 106
+            await asyncio.sleep(0.1)
+            ledger.validated_index = 112
+            result = await pipeline.wait(first, timeout=2)
+
+            assert result["status"] == "failed"
+            assert result["error"] == "expired"
+            assert result["attempts"] == 2
+            sequences = [(tx["TransactionType"], tx["Sequence"]) for tx, _ in ledger.submitted]
+            assert sequences == [
+                ("Payment", 10),
+                ("Payment", 11),
+                ("Payment", 10),
+                ("AccountSet", 10),
+            ]
+        finally:
+            await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_sequence_is_resynced(self, wallet):
+        """tefPAST_SEQ reloads the sequence from the ledger and retries."""
+        ledger = FakeLedgerClient(sequence=10)
+        pipeline = SubmissionPipeline(ledger, poll_interval=0.01)
+        try:
+            await pipeline.sequences.reserve(wallet.classic_address)
+            await pipeline.sequences.release(wallet.classic_address, 10)
+            ledger.account_sequence = 15
+            ledger.engine_results = ["tefPAST_SEQ"]
+
+            pending = await pipeline.submit(self._payment(wallet), wallet)
+            assert pending.sequence == 15
+            assert (await pipeline.wait(pending, timeout=2))["status"] == "completed"
+        finally:
+            await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_rejected_transaction_releases_sequence(self, wallet):
+        """A malformed transaction gives its sequence back for the next one."""
+        ledger = FakeLedgerClient(sequence=10)
+        pipeline = SubmissionPipeline(ledger, poll_interval=0.01)
+        try:
+            ledger.engine_results = ["temBAD_AMOUNT"]
+            with pytest.raises(SubmissionException):
+                await pipeline.submit(self._payment(wallet), wallet)
+
+            pending = await pipeline.submit(self._payment(wallet), wallet)
+            assert pending.sequence == 10
+        finally:
+            await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_resubmission_reports_the_new_hash(self, wallet):
+        """Callers learn the hash of the resubmitted transaction and its outcome."""
+        ledger = FakeLedgerClient(sequence=10)
+        ledger.auto_validate = False
+        replaced, results = [], []
+
+        async def on_resubmit(tx_hash, new_tx_hash):
+            replaced.append((tx_hash, new_tx_hash))
+
+        async def on_result(outcome):
+            results.append(outcome)
+
+        pipeline = SubmissionPipeline(
+            ledger, ledger_offset=5, poll_interval=0.01,
+            on_resubmit=on_resubmit, on_result=on_result,
+        )
+        try:
+            pending = await pipeline.submit(self._payment(wallet), wallet)
+            original_hash = pending.tx_hash
+            ledger.validated_index = 106
+            await asyncio.sleep(0.1)
+
+            assert replaced == [(original_hash, pending.tx_hash)]
+            assert pending.tx_hash != original_hash
+            ledger.validated[pending.tx_hash] = "tesSUCCESS"
+            result = await pipeline.wait(pending, timeout=2)
+
+            assert result["status"] == "completed"
+            assert result["tx_hash"] == pending.tx_hash
+            assert results == [result]
+        finally:
+            await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_rejected_resubmission_is_not_tracked(self, wallet):
+        """A resubmission the node rejects fails the transaction instead of waiting on it."""
+        ledger = FakeLedgerClient(sequence=10)
+        ledger.auto_validate = False
+        pipeline = SubmissionPipeline(ledger, ledger_offset=5, max_attempts=3, poll_interval=0.01)
+        try:
+            pending = await pipeline.submit(self._payment(wallet), wallet)
+            ledger.engine_results = ["telINSUF_FEE_P"]
+            ledger.validated_index = 106
+            result = await pipeline.wait(pending, timeout=2)
+
+            assert result["status"] == "failed"
+            assert result["attempts"] == 1
+            assert pipeline.outstanding() == []
+        finally:
+            await pipeline.close()
@@ -0,0 +1,171 @@
+import json
+import asyncio
+
+import pytest
+import websockets
+
+from app.blockchain.subscriptions import (
+    LedgerSubscriptionService,
+    TransactionDispatcher,
+    parse_transaction_event,
+)
+
+
+def _transaction_message(tx_hash: str, ledger_index: int, result: str = "tesSUCCESS") -> dict:
+    return {
+        "type": "transaction",
+        "validated": True,
+        "ledger_index": ledger_index,
+        "engine_result": result,
+        "transaction": {
+            "hash": tx_hash,
+            "Account": "rDonor",
+            "Destination": "rNPO",
+        },
+        "meta": {"TransactionResult": result},
+    }
+
+
+class FakeLedger:
+    """Local WebSocket ledger that pushes transactions and records commands."""
+
+    def __init__(self):
+        self.commands = []
+        self.connections = []
+        self.history = {}
+        self.server = None
+        self.url = None
+
+    async def handler(self, ws) -> None:
+        self.connections.append(ws)
+        async for raw in ws:
+            command = json.loads(raw)
+            self.commands.append(command)
+            if command["command"] == "subscribe":
+                result = {"ledger_index": 100}
+            elif command["command"] == "account_tx":
+                result = {
+                    "transactions": [
+                        {
+                            "tx": {"hash": tx_hash, "Account": "rDonor", "Destination": "rNPO"},
+                            "meta": {"TransactionResult": "tesSUCCESS"},
+                            "validated": True,
+                            "ledger_index": ledger_index,
+                        }
+                        for tx_hash, ledger_index in self.history.items()
+                        if ledger_index >= command["ledger_index_min"]
+                    ]
+                }
+            else:
+                result = {}
+            await ws.send(json.dumps({"id": command["id"], "status": "success", "result": result}))
+
+    async def push(self, message: dict) -> None:
+        await self.connections[-1].send(json.dumps(message))
+
+    async def start(self) -> None:
+        self.server = await websockets.serve(self.handler, "127.0.0.1", 0)
+        port = next(iter(self.server.sockets)).getsockname()[1]
+        self.url = f"ws://127.0.0.1:{port}"
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+
+def test_parse_transaction_event():
+    """Stream and account_tx layouts normalize to the same event."""
+    event = parse_transaction_event(_transaction_message("HASH1", 101, "tecPATH_DRY"))
+    assert event["tx_hash"] == "HASH1"
+    assert event["status"] == "failed"
+    assert event["ledger_index"] == 101
+
+    assert parse_transaction_event({"validated": False, "hash": "HASH2"}) is None
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_deduplicates_and_wakes_waiters():
+    """Each transaction is delivered once and waiters receive its status."""
+    dispatcher = TransactionDispatcher()
+    seen = []
+    dispatcher.add_handler(lambda event: seen.append(event["tx_hash"]))
+
+    waiter = asyncio.create_task(dispatcher.wait_for("HASH1", timeout=1))
+    await asyncio.sleep(0)
+    event = parse_transaction_event(_transaction_message("HASH1", 101))
+    assert await dispatcher.dispatch(event)
+    assert not await dispatcher.dispatch(event)
+
+    assert await waiter == "completed"
+    assert seen == ["HASH1"]
+    assert dispatcher.get_status("HASH1") == "completed"
+
+
+@pytest.mark.asyncio
+async def test_subscription_reconnects_and_backfills():
+    """A dropped connection is re-established and missed transactions are replayed."""
+    ledger = FakeLedger()
+    await ledger.start()
+    dispatcher = TransactionDispatcher()
+    service = LedgerSubscriptionService(
+        ledger.url, dispatcher, accounts=["rNPO"], min_backoff=0.01, max_backoff=0.05
+    )
+    try:
+        await service.start()
+        await asyncio.wait_for(service.connected.wait(), timeout=2)
+        assert ledger.commands[0]["command"] == "subscribe"
+        assert ledger.commands[0]["accounts"] == ["rNPO"]
+
+        # Live transaction from the stream
+        await ledger.push(_transaction_message("HASH1", 101))
+        assert await dispatcher.wait_for("HASH1", timeout=2) == "completed"
+        await ledger.push({"type": "ledgerClosed", "ledger_index": 101})
+        await asyncio.sleep(0.05)
+        assert service.last_ledger_index == 101
+
+        # Transaction validated while the connection is down
+        ledger.history["HASH2"] = 102
+        await ledger.connections[-1].close()
+
+        assert await dispatcher.wait_for("HASH2", timeout=2) == "completed"
+        backfill = [c for c in ledger.commands if c["command"] == "account_tx"]
+        assert backfill[0]["account"] == "rNPO"
+        assert backfill[0]["ledger_index_min"] == 101
+        assert service.reconnects == 1
+        assert service.last_ledger_index == 102
+    finally:
+        await service.stop()
+        await ledger.stop()
+
+
+@pytest.mark.asyncio
+async def test_first_connection_backfills_and_new_accounts_are_subscribed():
+    """The first connection replays recent ledgers, and added accounts are subscribed live."""
+    ledger = FakeLedger()
+    ledger.history["HASH0"] = 95
+    await ledger.start()
+    dispatcher = TransactionDispatcher()
+    service = LedgerSubscriptionService(
+        ledger.url, dispatcher, accounts=["rNPO"], initial_backfill_ledgers=10
+    )
+    try:
+        assert not service.is_subscribed("rNPO")
+        await service.start()
+        await asyncio.wait_for(service.connected.wait(), timeout=2)
+
+        assert await dispatcher.wait_for("HASH0", timeout=2) == "completed"
+        backfill = [c for c in ledger.commands if c["command"] == "account_tx"]
+        assert backfill[0]["ledger_index_min"] == 90
+        assert service.is_subscribed("rNPO")
+        assert not service.is_subscribed("rOther")
+
+        await service.add_account("rOther")
+        assert ledger.commands[-2] == {
+            "id": ledger.commands[-2]["id"], "command": "subscribe", "accounts": ["rOther"]
+        }
+        assert ledger.commands[-1]["account"] == "rOther"
+        assert service.is_subscribed("rOther")
+    finally:
+        await service.stop()
+        await ledger.stop()
+    assert not service.is_subscribed("rNPO")
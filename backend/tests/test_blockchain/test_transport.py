@@ -0,0 +1,104 @@
+import asyncio
+
+import httpx
+import pytest
+from aiohttp import web
+from xrpl.models.requests import AccountInfo, Tx
+
+from app.blockchain.transport import PooledJsonRpcClient
+
+
+class FakeJsonRpcServer:
+    """Minimal local rippled stand-in answering JSON-RPC over keep-alive HTTP."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = []
+        self.runner = None
+        self.url = None
+
+    async def handle(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        self.requests.append(body)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if body["method"] == "account_info":
+            result = {
+                "account_data": {"Account": body["params"][0]["account"], "Sequence": 7},
+                "status": "success",
+            }
+        elif body["method"] == "tx":
+            result = {"meta": {"TransactionResult": "tesSUCCESS"}, "status": "success"}
+        else:
+            result = {"error": "unknownCmd", "status": "error"}
+        return web.json_response({"result": result})
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/", self.handle)
+        self.runner = web.AppRunner(app)
+        await self.runner.setup()
+        site = web.TCPSite(self.runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        self.url = f"http://127.0.0.1:{port}/"
+
+    async def stop(self) -> None:
+        await self.runner.cleanup()
+
+
+class TestPooledJsonRpcClient:
+    """Tests for the pooled keep-alive JSON-RPC transport."""
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self):
+        """Sequential requests should share one connection."""
+        server = FakeJsonRpcServer()
+        await server.start()
+        client = PooledJsonRpcClient(server.url, pool_size=2)
+        try:
+            for _ in range(5):
+                response = await client.request(AccountInfo(account="rTestAccount"))
+                assert response.is_successful()
+                assert response.result["account_data"]["Sequence"] == 7
+
+            stats = client.stats.as_dict()
+            assert stats["requests"] == 5
+            assert stats["connections_opened"] == 1
+            assert stats["connections_reused"] == 4
+            assert stats["in_flight"] == 0
+        finally:
+            await client.close()
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_pool_size_bounds_connections(self):
+        """Concurrent requests never open more connections than the pool size."""
+        server = FakeJsonRpcServer(delay=0.05)
+        await server.start()
+        client = PooledJsonRpcClient(server.url, pool_size=3)
+        try:
+            responses = await asyncio.gather(
+                *[client.request(Tx(transaction="A" * 64)) for _ in range(12)]
+            )
+            assert all(r.is_successful() for r in responses)
+            assert client.stats.connections_opened <= 3
+            assert len(server.requests) == 12
+        finally:
+            await client.close()
+            await server.stop()
+
+    @pytest.mark.asyncio
+    async def test_request_timeout(self):
+        """A slow node raises a timeout and is counted in the stats."""
+        server = FakeJsonRpcServer(delay=0.5)
+        await server.start()
+        client = PooledJsonRpcClient(server.url, timeout=0.05)
+        try:
+            with pytest.raises(httpx.TimeoutException):
+                await client.request(AccountInfo(account="rTestAccount"))
+            assert client.stats.timeouts == 1
+            assert client.stats.errors == 1
+        finally:
+            await client.close()
+            await server.stop()
@@ -0,0 +1,57 @@
+import asyncio
+import os
+import threading
+import time
+import pytest
+from unittest.mock import patch
+
+from app.core.concurrency import ConcurrencyLimiter, ConcurrencyLimitExceeded
+from app.core.hashing import PasswordHasher
+
+
+@pytest.mark.asyncio
+async def test_hashing_runs_in_worker_process():
+    """Work submitted to the hasher runs outside the API process."""
+    hasher = PasswordHasher(workers=1)
+    try:
+        assert await hasher._run(os.getpid) != os.getpid()
+    finally:
+        hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_pending_operations_are_bounded():
+    """No more than max_pending verifications reach the pool at once."""
+    running, peak = 0, 0
+    lock = threading.Lock()
+
+    def slow_verify(password, hashed_password):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.05)
+        with lock:
+            running -= 1
+        return password == hashed_password
+
+    hasher = PasswordHasher(workers=0, max_pending=2)
+    with patch("app.core.security.verify_password", side_effect=slow_verify):
+        results = await asyncio.gather(*(hasher.verify("pw", "pw") for _ in range(6)))
+
+    assert results == [True] * 6
+    assert peak == 2
+
+
+def test_concurrency_limiter_frees_slots():
+    """A key over its limit is rejected until a slot is released."""
+    limiter = ConcurrencyLimiter(limit=1)
+    with limiter.hold("a"):
+        with pytest.raises(ConcurrencyLimitExceeded):
+            with limiter.hold("a"):
+                pass
+        with limiter.hold("b"):
+            assert limiter.in_flight("b") == 1
+    assert limiter.in_flight("a") == 0
+    with limiter.hold("a"):
+        pass
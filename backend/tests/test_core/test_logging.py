@@ -0,0 +1,169 @@
+import asyncio
+import json
+import logging
+import sys
+import threading
+
+import pytest
+from fastapi import FastAPI
+from loguru import logger
+
+from app.core import logging as app_logging
+from app.core.logging import BackgroundSink, RequestContextMiddleware, set_log_user, setup_logging
+
+
+class GatedWriter:
+    """Writer that blocks until released, to fill the sink's queue."""
+
+    def __init__(self):
+        self.entered = threading.Event()
+        self.release = threading.Event()
+        self.written = []
+
+    def __call__(self, message):
+        self.entered.set()
+        self.release.wait(5)
+        self.written.append(message)
+
+
+@pytest.fixture
+def json_log(tmp_path):
+    """Background JSON logging to a file; yields a reader of its records."""
+    root_handlers = logging.root.handlers[:]
+    log_path = tmp_path / "app.log"
+    setup_logging(log_path=log_path, json=True, background=True, max_queue=100)
+
+    def read():
+        app_logging.log_sink.stop()
+        return [json.loads(line) for line in log_path.read_text().splitlines()]
+
+    yield read
+    logger.remove()
+    if app_logging.log_sink is not None:
+        app_logging.log_sink.stop()
+        app_logging.log_sink = None
+    logger.add(sys.stderr)
+    logging.root.handlers = root_handlers
+
+
+async def _request(app, path, headers=()):
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": "GET",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "headers": [(b"host", b"testserver"), *headers],
+        "client": ("10.0.0.1", 1234),
+        "server": ("testserver", 80),
+    }
+    body_sent = asyncio.Event()
+    messages = []
+
+    async def receive():
+        if body_sent.is_set():
+            await asyncio.Event().wait()
+        body_sent.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]["status"], dict(messages[0]["headers"])
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/campaigns/{campaign_id}")
+    def read_campaign(campaign_id: int):
+        set_log_user(7)
+        logger.info("reading campaign")
+        return {"id": campaign_id}
+
+    return RequestContextMiddleware(app)
+
+
+def test_drop_policy_counts_records_beyond_queue():
+    writer = GatedWriter()
+    sink = BackgroundSink(writer, max_queue=2, overflow="drop")
+    sink.write("first")
+    assert writer.entered.wait(5)
+
+    for i in range(5):
+        sink.write(f"record {i}")
+
+    assert sink.dropped == 3
+    assert sink.metrics()["queued"] == 2
+    writer.release.set()
+    sink.stop()
+    assert writer.written == ["first", "record 0", "record 1"]
+
+
+def test_block_policy_waits_for_the_writer():
+    writer = GatedWriter()
+    sink = BackgroundSink(writer, max_queue=1, overflow="block")
+    sink.write("first")
+    assert writer.entered.wait(5)
+    sink.write("queued")
+
+    blocked = threading.Thread(target=sink.write, args=("waiting",))
+    blocked.start()
+    blocked.join(0.1)
+    assert blocked.is_alive()
+
+    writer.release.set()
+    blocked.join(5)
+    sink.stop()
+    assert writer.written == ["first", "queued", "waiting"]
+    assert sink.dropped == 0
+
+
+def test_writes_after_stop_are_direct():
+    written = []
+    sink = BackgroundSink(written.append)
+    sink.stop()
+    sink.write("late")
+    assert written == ["late"]
+
+
+@pytest.mark.asyncio
+async def test_json_records_carry_request_context(json_log):
+    status, headers = await _request(_app(), "/campaigns/5")
+
+    assert status == 200
+    request_id = headers[b"x-request-id"].decode()
+    records = json_log()
+    handler, access = [record for record in records if record.get("request_id") == request_id]
+    assert handler["message"] == "reading campaign"
+    assert handler["route"] == "/campaigns/{campaign_id}"
+    assert handler["user_id"] == "7"
+    assert access["status"] == 200
+    assert access["latency_ms"] >= 0
+    assert access["route"] == "/campaigns/{campaign_id}"
+
+
+@pytest.mark.asyncio
+async def test_request_id_header_is_reused_only_when_well_formed(json_log):
+    _, headers = await _request(_app(), "/campaigns/5", [(b"x-request-id", b"abc-123")])
+    assert headers[b"x-request-id"] == b"abc-123"
+
+    _, headers = await _request(_app(), "/campaigns/5", [(b"x-request-id", b"bad id\n")])
+    assert headers[b"x-request-id"] != b"bad id\n"
+    assert len(headers[b"x-request-id"]) == 32
+
+
+def test_json_records_include_exceptions(json_log):
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        logger.exception("failed")
+
+    record = json_log()[-1]
+    assert record["level"] == "ERROR"
+    assert "ValueError: boom" in record["exception"]
+    assert "request_id" not in record
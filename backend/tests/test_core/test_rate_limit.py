@@ -0,0 +1,184 @@
+import multiprocessing
+import pytest
+
+from app.core.rate_limit import (
+    FallbackRateLimiter,
+    RateLimiter,
+    RedisRateLimiter,
+    SharedMemoryRateLimiter,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_bursts_then_refills():
+    """The full quota is available at once and refills at a steady rate."""
+    clock = FakeClock()
+    limiter = RateLimiter(10, 60, algorithm="token_bucket", clock=clock)
+
+    assert all(limiter.is_allowed("a") for _ in range(10))
+    assert not limiter.is_allowed("a")
+    assert limiter.is_allowed("b")
+
+    clock.now += 6
+    result = limiter.hit("a")
+    assert result.allowed and result.remaining == 0
+    assert not limiter.is_allowed("a")
+    assert limiter.hit("a").reset_after == pytest.approx(60)
+
+
+def test_sliding_window_weights_previous_window():
+    """Requests of the previous window count by how much it still overlaps."""
+    clock = FakeClock(now=600.0)
+    limiter = RateLimiter(10, 60, algorithm="sliding_window", clock=clock)
+
+    assert all(limiter.is_allowed("a") for _ in range(10))
+    assert not limiter.is_allowed("a")
+
+    # A quarter into the next window, 75% of the previous 10 still count
+    clock.now = 675.0
+    assert limiter.hit("a").remaining == 1
+    assert limiter.is_allowed("a")
+    assert not limiter.is_allowed("a")
+
+    # Two windows later nothing counts
+    clock.now = 800.0
+    assert limiter.hit("a").remaining == 9
+
+
+def test_cost_counts_several_units():
+    """An expensive request uses several units of the quota."""
+    limiter = RateLimiter(10, 60, clock=FakeClock())
+    assert limiter.hit("a", cost=8).allowed
+    assert not limiter.hit("a", cost=3).allowed
+    assert limiter.hit("a", cost=2).allowed
+
+
+@pytest.mark.parametrize("algorithm", ["token_bucket", "sliding_window"])
+def test_idle_and_excess_clients_are_evicted(algorithm):
+    """Idle clients are dropped and the number of clients is bounded."""
+    clock = FakeClock()
+    limiter = RateLimiter(10, 60, algorithm=algorithm, max_clients=3, clock=clock)
+    for client in "abcd":
+        limiter.hit(client)
+    assert list(limiter.clients) == ["b", "c", "d"]
+
+    clock.now += 121
+    limiter.hit("e")
+    assert list(limiter.clients) == ["e"]
+
+
+class FakeRedis:
+    """The slice of the redis.asyncio client used by RedisRateLimiter."""
+
+    def __init__(self):
+        self.data = {}
+        self.ttls = {}
+        self.down = False
+        self.scripts = []
+
+    def register_script(self, script):
+        self.scripts.append(script)
+        return FakeHitScript(self)
+
+
+class FakeHitScript:
+    """Runs the rate limit script's check and increment on FakeRedis."""
+
+    def __init__(self, client):
+        self.client = client
+
+    async def __call__(self, keys, args):
+        if self.client.down:
+            raise ConnectionError("Connection refused")
+        current, previous_key = keys
+        cost, limit, weight, ttl = int(args[0]), int(args[1]), float(args[2]), int(args[3])
+        count = self.client.data.get(current, 0)
+        previous = self.client.data.get(previous_key, 0)
+        if previous * weight + count + cost <= limit:
+            count = self.client.data[current] = count + cost
+            self.client.ttls[current] = ttl
+            return [1, count, previous]
+        return [0, count, previous]
+
+
+@pytest.mark.asyncio
+async def test_redis_limiter_shares_counts_between_instances():
+    """Limiters of several processes on one Redis share the quota."""
+    client = FakeRedis()
+    clock = FakeClock(now=600.0)
+    workers = [RedisRateLimiter(client, 10, 60, clock=clock) for _ in range(3)]
+
+    results = [(await workers[i % 3].hit("10.0.0.1")).allowed for i in range(15)]
+    assert results == [True] * 10 + [False] * 5
+    # Denied requests were never counted
+    assert client.data["ratelimit:10.0.0.1:10"] == 10
+    assert client.ttls["ratelimit:10.0.0.1:10"] == 120
+
+    clock.now = 675.0
+    result = await workers[0].hit("10.0.0.1")
+    assert result.allowed and result.remaining == 1
+    assert not (await workers[1].hit("10.0.0.1", cost=2)).allowed
+
+
+def _hit_shared_file(path, attempts, queue):
+    limiter = SharedMemoryRateLimiter(path, 100, 60, slots=64)
+    queue.put(sum(limiter.hit("10.0.0.1").allowed for _ in range(attempts)))
+    limiter.close()
+
+
+def test_shared_memory_limiter_counts_across_processes(tmp_path):
+    """Worker processes on one host draw from one quota."""
+    path = str(tmp_path / "ratelimit")
+    context = multiprocessing.get_context("fork")
+    queue = context.Queue()
+    processes = [context.Process(target=_hit_shared_file, args=(path, 50, queue)) for _ in range(4)]
+    for process in processes:
+        process.start()
+    allowed = sum(queue.get(timeout=30) for _ in processes)
+    for process in processes:
+        process.join()
+
+    assert allowed == 100
+
+
+def test_shared_memory_limiter_recycles_idle_slots(tmp_path):
+    """Clients beyond the slot count take over the least recently active slots."""
+    clock = FakeClock(now=600.0)
+    limiter = SharedMemoryRateLimiter(str(tmp_path / "ratelimit"), 1, 60, slots=8, clock=clock)
+    assert limiter.hit("old").allowed
+    clock.now = 700.0
+    for i in range(8):
+        assert limiter.hit(f"new-{i}").allowed
+    assert not limiter.hit("new-0").allowed
+    limiter.close()
+
+
+@pytest.mark.asyncio
+async def test_fallback_limits_locally_while_backend_is_down():
+    """An unreachable backend is retried after a pause and local limits apply meanwhile."""
+    client = FakeRedis()
+    clock = FakeClock()
+    limiter = FallbackRateLimiter(
+        RedisRateLimiter(client, 10, 60, clock=clock),
+        RateLimiter(2, 60, clock=clock),
+        retry_after=5,
+        clock=clock,
+    )
+    client.down = True
+    assert (await limiter.hit("a")).allowed
+    assert (await limiter.hit("a")).allowed
+    assert not (await limiter.hit("a")).allowed
+    assert limiter.degraded and limiter.failures == 1
+
+    client.down = False
+    clock.now += 5
+    assert (await limiter.hit("a")).allowed
+    assert not limiter.degraded
+    assert client.data
@@ -0,0 +1,131 @@
+import asyncio
+import pytest
+from datetime import timedelta
+from fastapi import FastAPI
+from unittest.mock import patch
+
+from app.api.rate_limits import create_policies
+from app.core import security
+from app.core.rate_limit import (
+    RateLimitPolicies,
+    RateLimitPolicy,
+    RateLimitRule,
+    add_rate_limit,
+)
+
+
+@pytest.fixture(autouse=True)
+def memory_backend():
+    with patch("app.core.rate_limit.settings.RATE_LIMIT_BACKEND", "memory"):
+        yield
+
+
+def _app(policies):
+    app = FastAPI()
+
+    @app.api_route("/{path:path}", methods=["GET", "POST"])
+    async def echo(path: str):
+        return {"path": path}
+
+    add_rate_limit(app, policies=policies)
+    return app
+
+
+async def _request(app, method, path, token=None, client="10.0.0.1"):
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    scope = {
+        "type": "http",
+        "http_version": "1.1",
+        "method": method,
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "scheme": "http",
+        "query_string": b"",
+        "headers": headers,
+        "client": (client, 1234),
+        "server": ("testserver", 80),
+    }
+    messages = []
+    body_sent = asyncio.Event()
+
+    async def receive():
+        if body_sent.is_set():
+            # The client stays connected until the response is sent
+            await asyncio.Event().wait()
+        body_sent.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    return start["status"], {k.decode().lower(): v.decode() for k, v in start["headers"]}
+
+
+def test_rules_match_routes_and_methods():
+    """The first matching rule chooses the policy and cost."""
+    policies = create_policies()
+    assert policies.match("POST", "/api/auth/login")[0].name == "login"
+    assert policies.match("POST", "/api/npos/npo-1/proof") == (policies.policies["default"], 10)
+    assert policies.match("GET", "/api/npos/npo-1/campaigns")[0].name == "browsing"
+    assert policies.match("PUT", "/api/npos/npo-1")[0].name == "default"
+    assert policies.match("GET", "/api/npossible")[0].name == "default"
+
+
+@pytest.mark.asyncio
+async def test_policies_count_separately_with_headers():
+    """Each policy has its own budget, reported in RateLimit headers."""
+    policies = RateLimitPolicies(
+        [RateLimitPolicy("default", 3, 60), RateLimitPolicy("login", 1, 60, key="ip")],
+        [RateLimitRule("/login", "login", frozenset({"POST"}))],
+    )
+    app = _app(policies)
+
+    status, headers = await _request(app, "POST", "/login")
+    assert status == 200
+    assert headers["ratelimit-policy"] == "1;w=60"
+    assert headers["ratelimit-remaining"] == "0"
+
+    status, headers = await _request(app, "POST", "/login")
+    assert status == 429
+    assert int(headers["retry-after"]) > 0
+
+    status, headers = await _request(app, "GET", "/npos")
+    assert status == 200
+    assert headers["ratelimit-limit"] == "3"
+    assert headers["ratelimit-remaining"] == "2"
+
+
+@pytest.mark.asyncio
+async def test_costly_routes_use_several_units():
+    """An expensive route draws its cost from the budget."""
+    policies = RateLimitPolicies(
+        [RateLimitPolicy("default", 10, 60)],
+        [RateLimitRule("/export", "default", cost=8)],
+    )
+    app = _app(policies)
+
+    _, headers = await _request(app, "GET", "/export")
+    assert headers["ratelimit-remaining"] == "2"
+    status, _ = await _request(app, "GET", "/export")
+    assert status == 429
+    status, _ = await _request(app, "GET", "/npos")
+    assert status == 200
+
+
+@pytest.mark.asyncio
+async def test_principal_keys_survive_token_rotation():
+    """Requests count per user id, not per token string or shared IP."""
+    app = _app(RateLimitPolicies([RateLimitPolicy("default", 2, 60)]))
+    first = security.create_access_token("u1")
+    rotated = security.create_access_token("u1", expires_delta=timedelta(minutes=5))
+
+    assert (await _request(app, "GET", "/me", first))[0] == 200
+    assert (await _request(app, "GET", "/me", rotated))[0] == 200
+    assert (await _request(app, "GET", "/me", rotated, client="10.0.0.2"))[0] == 429
+
+    # Another user behind the same IP has its own budget, invalid tokens count per IP
+    assert (await _request(app, "GET", "/me", security.create_access_token("u2")))[0] == 200
+    assert (await _request(app, "GET", "/me", "not-a-token", client="10.0.0.3"))[0] == 200
@@ -0,0 +1,48 @@
+import asyncio
+import pytest
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+from app.core.security_headers import SecurityHeadersMiddleware
+
+
+async def _call(app):
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": []}
+    messages = []
+    body_sent = asyncio.Event()
+
+    async def receive():
+        if body_sent.is_set():
+            # The client stays connected until the response is sent
+            await asyncio.Event().wait()
+        body_sent.set()
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        messages.append(message)
+
+    await SecurityHeadersMiddleware(app)(scope, receive, send)
+    return messages
+
+
+@pytest.mark.asyncio
+async def test_headers_replace_application_values():
+    """Security headers are added once, overriding the application's own."""
+    response = PlainTextResponse("ok", headers={"X-Frame-Options": "SAMEORIGIN"})
+    start = (await _call(response))[0]
+    headers = [(name.decode(), value.decode()) for name, value in start["headers"]]
+
+    assert headers.count(("x-frame-options", "DENY")) == 1
+    assert ("x-frame-options", "SAMEORIGIN") not in headers
+    assert ("x-content-type-options", "nosniff") in headers
+
+
+@pytest.mark.asyncio
+async def test_streamed_bodies_pass_through():
+    """Each chunk of a streamed response reaches the client as sent."""
+    async def chunks():
+        for chunk in (b"a", b"b", b"c"):
+            yield chunk
+
+    messages = await _call(StreamingResponse(chunks()))
+    bodies = [m["body"] for m in messages if m["type"] == "http.response.body" and m["body"]]
+    assert bodies == [b"a", b"b", b"c"]
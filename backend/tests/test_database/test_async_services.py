@@ -0,0 +1,87 @@
+import pytest
+from unittest.mock import patch
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database.async_session import get_async_database_url
+from app.database.base_class import Base
+from app.models.job import Job
+from app.models.user import User
+from app.services import job_service
+from app.services.aio import ThreadedService, run_sync
+from app.services.aio import npo_service, user_service
+
+
+@pytest_asyncio.fixture
+async def db(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/async.db")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    session = async_sessionmaker(engine, expire_on_commit=False)()
+    yield session
+    await session.close()
+    await engine.dispose()
+
+
+@pytest.mark.parametrize(
+    "url,expected",
+    [
+        ("postgresql://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("postgresql+psycopg2://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+        ("sqlite:///./app.db", "sqlite+aiosqlite:///./app.db"),
+        ("postgresql+asyncpg://u:p@db/app", "postgresql+asyncpg://u:p@db/app"),
+    ],
+)
+def test_async_database_url(url, expected):
+    """Sync URLs are mapped to their async driver, keeping credentials."""
+    assert get_async_database_url(url) == expected
+
+
+@pytest.mark.asyncio
+async def test_npo_crud(db):
+    """The async NPO service creates, filters and updates rows."""
+    npo = await npo_service.create_npo(
+        db, obj_in={"id": "npo-1", "name": "Clean Water", "is_verified": True}
+    )
+    await npo_service.create_npo(db, obj_in={"id": "npo-2", "name": "Pending"})
+
+    assert (await npo_service.get_npo(db, id="npo-1")).name == "Clean Water"
+    assert (await npo_service.get_npo_by_name(db, name="Pending")).id == "npo-2"
+    assert [n.id for n in await npo_service.get_npos(db)] == ["npo-1"]
+    assert len(await npo_service.get_npos(db, verified_only=False)) == 2
+
+    updated = await npo_service.update_npo(db, db_obj=npo, obj_in={"website": "https://cw.org"})
+    assert updated.website == "https://cw.org"
+
+
+@patch("app.core.hashing.password_hasher.workers", 0)
+@patch("app.services.user_service.password_needs_rehash", return_value=False)
+@patch("app.core.security.verify_password", side_effect=lambda p, h: p == h)
+@pytest.mark.asyncio
+async def test_authenticate(mock_verify, mock_needs_rehash, db):
+    """Authentication looks the user up and checks the password."""
+    db.add(User(id="u1", email="a@b.com", hashed_password="secret"))
+    await db.commit()
+
+    assert (await user_service.authenticate(db, email="a@b.com", password="secret")).id == "u1"
+    assert await user_service.authenticate(db, email="a@b.com", password="wrong") is None
+    assert await user_service.get_user_by_email(db, email="x@b.com") is None
+
+
+@pytest.mark.asyncio
+async def test_run_sync_with_async_session(db):
+    """Sync service functions run against an AsyncSession."""
+    job = await run_sync(db, job_service.enqueue, queue="test", payload={"n": 1})
+    assert (await db.get(Job, job.id)).queue == "test"
+
+
+@pytest.mark.asyncio
+async def test_threaded_service():
+    """The sync fallback awaits the wrapped module's functions."""
+    import types
+
+    module = types.ModuleType("fake_service")
+    module.double = lambda db, *, x: (db, x * 2)
+    service = ThreadedService(module)
+
+    assert await service.double("session", x=21) == ("session", 42)
@@ -0,0 +1,81 @@
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, inspect, text
+
+from app.core.config import settings
+from app.database.base_class import Base
+from app.models.npo import NPO
+from app.models.user import User
+
+ALEMBIC_DIR = Path(__file__).resolve().parents[2] / "alembic"
+
+NEW_TABLES = {"campaigns", "jobs", "counter_shards", "campaign_stats", "campaign_donors"}
+
+
+@pytest.fixture
+def migrate(tmp_path):
+    url = f"sqlite:///{tmp_path}/migrations.db"
+    config = Config()
+    config.set_main_option("script_location", str(ALEMBIC_DIR))
+
+    def run(command_name, revision):
+        with patch.object(settings, "SQLALCHEMY_DATABASE_URI", url):
+            getattr(command, command_name)(config, revision)
+
+    engine = create_engine(url)
+    run.head = ScriptDirectory.from_config(config).get_current_head()
+    yield engine, run
+    engine.dispose()
+
+
+def _baseline_schema(engine):
+    """Tables as created by create_all before donations had a status."""
+    Base.metadata.create_all(bind=engine, tables=[User.__table__, NPO.__table__])
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TABLE donations ("
+            "id VARCHAR PRIMARY KEY, amount FLOAT NOT NULL, "
+            "donor_id VARCHAR REFERENCES users(id), npo_id VARCHAR REFERENCES npos(id), "
+            "transaction_hash VARCHAR UNIQUE, created_at DATETIME DEFAULT CURRENT_TIMESTAMP)"
+        ))
+        conn.execute(text("INSERT INTO npos (id, name) VALUES ('npo-1', 'NPO')"))
+        conn.execute(text(
+            "INSERT INTO donations (id, amount, npo_id, transaction_hash) VALUES ('d1', 5, 'npo-1', 'HASH')"
+        ))
+
+
+def test_upgrade_from_baseline_schema(migrate):
+    """An existing database gets the new columns, tables and indexes."""
+    engine, run = migrate
+    _baseline_schema(engine)
+
+    run("upgrade", "head")
+
+    inspector = inspect(engine)
+    assert NEW_TABLES <= set(inspector.get_table_names())
+    assert {"status", "campaign_id"} <= {c["name"] for c in inspector.get_columns("donations")}
+    indexes = {index["name"] for index in inspector.get_indexes("donations")}
+    assert {"ix_donations_pending_tx_hash", "ix_donations_campaign_created_at_id"} <= indexes
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT status FROM donations")).scalar() == "completed"
+        assert conn.execute(text("SELECT created_at FROM donations")).scalar().endswith(".000000")
+
+    run("downgrade", "base")
+    assert not NEW_TABLES & set(inspect(engine).get_table_names())
+    assert "status" not in {c["name"] for c in inspect(engine).get_columns("donations")}
+    run("upgrade", "head")
+
+
+def test_upgrade_is_a_no_op_on_create_all_schema(migrate):
+    """Databases created from the current models upgrade without changes."""
+    engine, run = migrate
+    Base.metadata.create_all(bind=engine)
+
+    run("upgrade", "head")
+
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT version_num FROM alembic_version")).scalar() == run.head
@@ -0,0 +1,85 @@
+import threading
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.database.pool import InstrumentedQueuePool, get_engine_options, get_pool_metrics
+
+
+@pytest.fixture
+def engine(tmp_path):
+    with patch("app.database.pool.settings") as mock_settings:
+        mock_settings.DB_POOL_PRE_PING = "optimistic"
+        mock_settings.DB_POOL_SIZE = 1
+        mock_settings.DB_MAX_OVERFLOW = 1
+        mock_settings.DB_POOL_TIMEOUT = 0.2
+        mock_settings.DB_POOL_RECYCLE = -1
+        mock_settings.DB_STATEMENT_TIMEOUT_MS = 0
+        url = f"sqlite:///{tmp_path}/pool.db"
+        engine = create_engine(url, **get_engine_options(url))
+    yield engine
+    engine.dispose()
+
+
+def test_engine_options_from_settings():
+    """Pool settings and the statement timeout reach create_engine."""
+    with patch("app.database.pool.settings") as mock_settings:
+        mock_settings.DB_POOL_PRE_PING = "pessimistic"
+        mock_settings.DB_POOL_SIZE = 20
+        mock_settings.DB_MAX_OVERFLOW = 5
+        mock_settings.DB_POOL_TIMEOUT = 3
+        mock_settings.DB_POOL_RECYCLE = 600
+        mock_settings.DB_STATEMENT_TIMEOUT_MS = 5000
+
+        options = get_engine_options("postgresql://u:p@db/app")
+        assert options["pool_pre_ping"] is True
+        assert options["pool_size"] == 20
+        assert options["max_overflow"] == 5
+        assert options["pool_recycle"] == 600
+        assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+
+        options = get_engine_options("postgresql+asyncpg://u:p@db/app", is_async=True)
+        assert options["connect_args"] == {"server_settings": {"statement_timeout": "5000"}}
+
+        assert "poolclass" not in get_engine_options("sqlite://")
+
+
+def test_pool_telemetry(engine):
+    """Checkouts, overflow and timeouts show up in the pool metrics."""
+    assert isinstance(engine.pool, InstrumentedQueuePool)
+
+    first = engine.connect()
+    first.execute(text("SELECT 1"))
+    second = engine.connect()  # Overflow connection
+    with pytest.raises(PoolTimeoutError):
+        engine.connect()
+
+    metrics = get_pool_metrics(engine.pool)
+    assert metrics["in_use"] == 2
+    assert metrics["overflow"] == 1
+    assert metrics["checkouts"] == 2
+    assert metrics["overflow_opened"] == 1
+    assert metrics["timeouts"] == 1
+
+    second.close()
+    first.close()
+    metrics = get_pool_metrics(engine.pool)
+    assert metrics["in_use"] == 0
+    assert metrics["wait_histogram"]["+Inf"] == 2
+
+
+def test_wait_is_recorded(engine):
+    """A checkout blocked on an exhausted pool records its wait."""
+    held = [engine.connect(), engine.connect()]
+    released = threading.Timer(0.05, held[0].close)
+    released.start()
+
+    with engine.connect():
+        pass
+    released.join()
+    held[1].close()
+
+    metrics = get_pool_metrics(engine.pool)
+    assert metrics["wait_max_seconds"] >= 0.04
+    assert metrics["wait_histogram"]["0.01"] < metrics["wait_histogram"]["+Inf"]
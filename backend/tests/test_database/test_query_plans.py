@@ -0,0 +1,181 @@
+import json
+import os
+import re
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, event, insert, text
+from sqlalchemy.orm import sessionmaker
+
+from app.database.base_class import Base
+from app.models.campaign import Campaign
+from app.models.donation import Donation
+from app.models.npo import NPO
+from app.models.user import User
+from app.services import campaign_service, donation_service, pagination
+
+# Set to a PostgreSQL URL to check the plans of the production planner
+PLAN_DATABASE_URL = os.getenv("QUERY_PLAN_DATABASE_URL")
+
+DONATIONS = 20_000
+NPOS = 200
+CAMPAIGNS = 500
+DONORS = 2_000
+
+
+@pytest.fixture(scope="module")
+def engine(tmp_path_factory):
+    url = PLAN_DATABASE_URL or f"sqlite:///{tmp_path_factory.mktemp('plans')}/plans.db"
+    engine = create_engine(url)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    start = datetime(2024, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(User), [
+            {"id": f"u{i}", "email": f"u{i}@example.org", "hashed_password": "x"}
+            for i in range(DONORS)
+        ])
+        conn.execute(insert(NPO), [{"id": f"n{i}", "name": f"NPO {i}"} for i in range(NPOS)])
+        now = datetime.utcnow()
+        conn.execute(insert(Campaign), [
+            {
+                "id": i,
+                "title": f"Campaign {i}",
+                "goal_amount": 100.0,
+                "npo_id": f"n{i % NPOS}",
+                # Most campaigns ended long ago; a few are running now, and a
+                # few more have just ended but are still marked active
+                "start_date": now - timedelta(days=400 - i % 10),
+                "end_date": now + timedelta(days=30) if i % 100 == 0 else now - timedelta(days=300 - i % 200),
+                "is_active": i % 100 in (0, 1),
+                "created_at": start + timedelta(hours=i),
+            }
+            for i in range(CAMPAIGNS)
+        ])
+        conn.execute(insert(Donation), [
+            {
+                "id": f"d{i:06d}",
+                "amount": 1.0,
+                "npo_id": f"n{i % NPOS}",
+                "campaign_id": i % CAMPAIGNS,
+                "donor_id": f"u{i % DONORS}",
+                # A few recent donations are still waiting on the ledger
+                "status": "pending" if i % 50 == 0 else "completed",
+                "tx_hash": f"HASH{i}",
+                "created_at": start + timedelta(seconds=i),
+            }
+            for i in range(DONATIONS)
+        ])
+        conn.execute(text("ANALYZE"))
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    engine.dispose()
+
+
+def _capture(engine, call):
+    """Run a service call and return the SELECT statements it executed."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    db = sessionmaker(bind=engine)()
+    try:
+        call(db)
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+    assert statements
+    return statements
+
+
+def _plan(engine, statement, parameters):
+    """Get the plan of a statement as a list of node descriptions."""
+    with engine.connect() as conn:
+        if engine.dialect.name == "postgresql":
+            (plan,) = conn.exec_driver_sql(
+                f"EXPLAIN (FORMAT JSON) {statement}", parameters
+            ).one()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            nodes, stack = [], [plan[0]["Plan"]]
+            while stack:
+                node = stack.pop()
+                nodes.append(f"{node['Node Type']} {node.get('Relation Name', '')}".strip())
+                stack.extend(node.get("Plans", []))
+            return nodes
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+        return [row[-1] for row in rows]
+
+
+def _sequential_scans(nodes, seek):
+    """
+    Nodes reading a whole table. With ``seek``, walking a whole index to
+    filter rows counts as well, since a filtered query should seek.
+    """
+    full_scan = r"SCAN (TABLE )?\w+( USING (COVERING )?INDEX .*)?" if seek else r"SCAN (TABLE )?\w+"
+    return [node for node in nodes if node.startswith("Seq Scan") or re.fullmatch(full_scan, node)]
+
+
+def _cursor_after(row_index):
+    created_at = datetime(2024, 1, 1) + timedelta(seconds=row_index)
+    return pagination.encode_cursor(created_at, f"d{row_index:06d}")
+
+
+QUERIES = {
+    "donations_page": lambda db: donation_service.get_donations(db, limit=50),
+    "donations_deep_page": lambda db: donation_service.get_donations(
+        db, cursor=_cursor_after(DONATIONS // 2), limit=50
+    ),
+    "donations_by_npo": lambda db: donation_service.get_donations(
+        db, npo_id="n7", cursor=_cursor_after(DONATIONS // 2), limit=50
+    ),
+    "donations_by_campaign": lambda db: donation_service.get_donations(
+        db, campaign_id=42, limit=50
+    ),
+    "donations_by_donor": lambda db: donation_service.get_user_donations(
+        db, user_id="u3", limit=50
+    ),
+    "pending_ledger_page": lambda db: donation_service.get_pending_donations_page(
+        db, after_id="d001000", limit=100
+    ),
+    "donation_by_tx_hash": lambda db: donation_service.resolve_donation_by_tx_hash(
+        db, tx_hash="HASH1", status="completed"
+    ),
+    "expired_active_campaigns": campaign_service.check_campaign_status,
+    "running_campaigns": lambda db: campaign_service.get_campaigns(db, active_only=True, limit=50),
+}
+
+# Query -> index its filter has to seek
+CAMPAIGN_INDEXES = {
+    "expired_active_campaigns": "ix_campaigns_active_end_date",
+    "running_campaigns": "ix_campaigns_end_date_start_date",
+}
+
+
+@pytest.mark.parametrize("name", list(QUERIES))
+def test_no_sequential_scans(engine, name):
+    """Donation and campaign access paths are served by indexes, not table scans."""
+    for statement, parameters in _capture(engine, QUERIES[name]):
+        nodes = _plan(engine, statement, parameters)
+        # The first page of the unfiltered list is a plain walk down the index
+        assert not _sequential_scans(nodes, seek=name != "donations_page"), f"{name}: {nodes}"
+
+
+@pytest.mark.parametrize("name", [name for name in QUERIES if name.startswith("donations")])
+def test_pages_read_in_index_order(engine, name):
+    """Paged lists come out of the index already sorted."""
+    for statement, parameters in _capture(engine, QUERIES[name]):
+        nodes = _plan(engine, statement, parameters)
+        assert not any("TEMP B-TREE" in node or node.startswith("Sort") for node in nodes), (
+            f"{name}: {nodes}"
+        )
+
+
+@pytest.mark.parametrize("name", list(CAMPAIGN_INDEXES))
+def test_campaign_filters_use_their_index(engine, name):
+    """Campaign status checks and running-campaign lists seek their date index."""
+    statement, parameters = _capture(engine, QUERIES[name])[0]
+    nodes = _plan(engine, statement, parameters)
+    assert any(CAMPAIGN_INDEXES[name] in node for node in nodes), f"{name}: {nodes}"
@@ -0,0 +1,87 @@
+import pytest
+
+from app.models.campaign_stats import CampaignDonor, CampaignStats
+from app.models.donation import Donation
+from app.models.npo import NPO
+from app.services import campaign_stats_service, donation_service
+
+
+@pytest.fixture
+def db(db):
+    db.add(NPO(id="npo-1", name="NPO", total_received=0.0))
+    db.commit()
+    return db
+
+
+def _donate(db, id, campaign_id, donor_id):
+    """Insert a donation and count it the way create_donation does."""
+    db.add(Donation(id=id, amount=1.0, npo_id="npo-1", campaign_id=campaign_id, donor_id=donor_id))
+    campaign_stats_service.record_donation_created(db, campaign_id=campaign_id, donor_id=donor_id)
+    db.commit()
+
+
+def _stats(db, campaign_id):
+    stats = db.get(CampaignStats, campaign_id)
+    db.refresh(stats)
+    return stats.total_donations, stats.completed_donations, stats.total_donors
+
+
+def test_incremental_stats_match_rebuild(db):
+    """Maintained counts equal the ones recomputed from donations."""
+    _donate(db, "d1", 1, "alice")
+    _donate(db, "d2", 1, "alice")
+    _donate(db, "d3", 1, "bob")
+    _donate(db, "d4", 1, None)
+    _donate(db, "d5", 2, "bob")
+    donation_service.process_donation_completion(db, donation_id="d1")
+    donation_service.process_donation_completion(db, donation_id="d1")
+
+    assert _stats(db, 1) == (4, 1, 2)
+    npo = db.get(NPO, "npo-1")
+    db.refresh(npo)
+    assert npo.total_received == 1.0
+    assert _stats(db, 2) == (1, 0, 1)
+
+    assert campaign_stats_service.rebuild(db) == 2
+    assert _stats(db, 1) == (4, 1, 2)
+    assert _stats(db, 2) == (1, 0, 1)
+    assert db.get(CampaignDonor, (1, "alice")).donations == 2
+
+
+def test_delete_drops_donor_after_last_donation(db):
+    """A donor stops counting once their last donation is deleted."""
+    _donate(db, "d1", 1, "alice")
+    _donate(db, "d2", 1, "alice")
+    _donate(db, "d3", 1, "bob")
+
+    donation_service.delete_donation(db, id="d3")
+    assert _stats(db, 1) == (2, 0, 1)
+
+    donation_service.delete_donation(db, id="d1")
+    assert _stats(db, 1) == (1, 0, 1)
+    assert db.get(CampaignDonor, (1, "alice")).donations == 1
+
+
+def test_rebuild_single_campaign(db):
+    """Rebuilding one campaign leaves the others alone."""
+    _donate(db, "d1", 1, "alice")
+    _donate(db, "d2", 2, "bob")
+    db.get(CampaignStats, 2).total_donations = 99
+    db.get(CampaignStats, 1).total_donations = 99
+    db.commit()
+
+    assert campaign_stats_service.rebuild(db, campaign_id=1) == 1
+    assert _stats(db, 1) == (1, 0, 1)
+    assert _stats(db, 2)[0] == 99
+
+
+def test_batch_counts_match_single_records(db):
+    """Counting a batch at once gives the same stats as one by one."""
+    _donate(db, "d1", 1, "alice")
+    campaign_stats_service.record_donations_created(
+        db, campaign_id=1, donors={"alice": 2, "bob": 1, None: 3}, completed=4
+    )
+    db.commit()
+
+    assert _stats(db, 1) == (7, 4, 2)
+    assert db.get(CampaignDonor, (1, "alice")).donations == 3
@@ -0,0 +1,124 @@
+import pytest
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from app.models.campaign import Campaign
+from app.models.campaign_stats import CampaignStats
+from app.models.donation import Donation
+from app.models.npo import NPO
+from app.services import campaign_service, donation_service
+
+DONATIONS = 48
+AMOUNT = 2.5
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    db = session_factory()
+    db.add(NPO(id="npo-1", name="Hot NPO", total_received=0.0, total_campaigns=0))
+    db.add(Campaign(id=1, title="Hot", goal_amount=1000.0, start_date=datetime(2024, 1, 1), npo_id="npo-1"))
+    db.add_all(
+        Donation(id=f"d{i}", amount=AMOUNT, npo_id="npo-1") for i in range(DONATIONS)
+    )
+    db.commit()
+    db.close()
+    return session_factory
+
+
+def _run_parallel(session_factory, work, count):
+    def run(i):
+        db = session_factory()
+        try:
+            work(db, i)
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(run, range(count)))
+
+
+def test_parallel_completions_keep_npo_total(session_factory):
+    """Completing donations concurrently credits every one of them."""
+    _run_parallel(
+        session_factory,
+        lambda db, i: donation_service.process_donation_completion(db, donation_id=f"d{i}"),
+        DONATIONS,
+    )
+
+    db = session_factory()
+    try:
+        assert db.get(NPO, "npo-1").total_received == pytest.approx(DONATIONS * AMOUNT)
+    finally:
+        db.close()
+
+
+def test_repeated_completions_credit_once(session_factory):
+    """Resolving one donation from many sessions at once credits the NPO once."""
+    _run_parallel(
+        session_factory,
+        lambda db, i: donation_service.process_donation_completion(db, donation_id="d0"),
+        16,
+    )
+
+    db = session_factory()
+    try:
+        assert db.get(NPO, "npo-1").total_received == pytest.approx(AMOUNT)
+        assert db.get(Donation, "d0").status == "completed"
+    finally:
+        db.close()
+
+
+def test_resubmitted_transaction_resolves_donation(session_factory):
+    """A donation follows its resubmitted transaction and resolves from the new hash."""
+    db = session_factory()
+    try:
+        db.get(Donation, "d0").tx_hash = "EXPIRED"
+        db.commit()
+
+        assert donation_service.replace_tx_hash(db, tx_hash="EXPIRED", new_tx_hash="RESUBMITTED")
+        assert donation_service.resolve_donation_by_tx_hash(db, tx_hash="EXPIRED", status="failed") is None
+        donation = donation_service.resolve_donation_by_tx_hash(
+            db, tx_hash="RESUBMITTED", status="completed"
+        )
+
+        assert donation.status == "completed"
+        assert db.get(NPO, "npo-1").total_received == pytest.approx(AMOUNT)
+        assert not donation_service.replace_tx_hash(db, tx_hash="RESUBMITTED", new_tx_hash="LATER")
+    finally:
+        db.close()
+
+
+def test_parallel_donations_keep_campaign_total(session_factory):
+    """Concurrent create_donation calls on one campaign all count."""
+    _run_parallel(
+        session_factory,
+        lambda db, i: donation_service.create_donation(
+            db,
+            obj_in={"id": f"new{i}", "amount": AMOUNT, "npo_id": "npo-1", "campaign_id": 1},
+            donor_id=f"u{i % 4}",
+        ),
+        DONATIONS,
+    )
+
+    db = session_factory()
+    try:
+        assert db.get(Campaign, 1).current_amount == pytest.approx(DONATIONS * AMOUNT)
+        assert db.get(CampaignStats, 1).total_donations == DONATIONS
+        assert db.get(CampaignStats, 1).total_donors == 4
+    finally:
+        db.close()
+
+
+def test_parallel_campaign_counts(session_factory):
+    """Campaign count increments from many sessions all land."""
+    def add_campaign(db, i):
+        db.execute(campaign_service.add_to_npo_campaigns("npo-1", 1))
+        db.commit()
+
+    _run_parallel(session_factory, add_campaign, DONATIONS)
+
+    db = session_factory()
+    try:
+        assert db.get(NPO, "npo-1").total_campaigns == DONATIONS
+    finally:
+        db.close()
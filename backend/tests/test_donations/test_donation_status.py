@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+from unittest.mock import MagicMock, patch
+
+from fastapi import HTTPException
+
+from app.api.api_v1.endpoints import donations as donation_endpoints
+from app.models.donation import Donation
+from app.models.job import Job
+from app.models.npo import NPO
+from app.services import donation_service
+from app.workers.donation_submitter import enqueue_donation_submission
+
+
+@pytest.fixture
+def db(db):
+    db.add(NPO(id="npo-1", name="NPO", xrpl_address="rNPO", total_received=0.0))
+    db.add(Donation(id="mine", amount=5.0, npo_id="npo-1", donor_id="donor"))
+    db.add(Donation(id="anonymous", amount=5.0, npo_id="npo-1", donor_id=None))
+    db.commit()
+    return db
+
+
+def _user(user_id="someone", is_admin=False, owned_npo=None):
+    return MagicMock(id=user_id, is_admin=is_admin, owned_npo=owned_npo)
+
+
+async def _status(db, donation_id, user, wait=0):
+    return await donation_endpoints.get_donation_status(
+        donation_id=donation_id, db=db, current_user=user, wait=wait
+    )
+
+
+@pytest.mark.asyncio
+async def test_status_follows_the_donation_access_rule(db):
+    """Anonymous donations, the donor and the receiving NPO's owner can read the status."""
+    assert (await _status(db, "anonymous", _user()))["status"] == "pending"
+    assert (await _status(db, "mine", _user("donor")))["status"] == "pending"
+    assert (await _status(db, "mine", _user(owned_npo=MagicMock(id="npo-1"))))["donation_id"] == "mine"
+
+    with pytest.raises(HTTPException) as error:
+        await _status(db, "mine", _user())
+    assert error.value.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_wait_releases_the_connection_between_refreshes(db, session_factory):
+    """The long poll holds no transaction while sleeping and sees another session's update."""
+    sleep = asyncio.sleep
+    in_transaction = []
+
+    async def resolve_while_sleeping(delay):
+        in_transaction.append(db.in_transaction())
+        other = session_factory()
+        try:
+            donation_service.resolve_donation(other, donation_id="mine", status="completed")
+        finally:
+            other.close()
+        await sleep(0)
+
+    with patch.object(donation_endpoints.asyncio, "sleep", resolve_while_sleeping):
+        result = await _status(db, "mine", _user("donor"), wait=5)
+
+    assert result["status"] == "completed"
+    assert in_transaction == [False]
+
+
+def test_donation_and_submission_job_commit_together(db, session_factory):
+    """A donation created without committing is stored only once its job is queued."""
+    donation = donation_service.create_donation(
+        db, obj_in={"id": "queued", "amount": 5.0, "npo_id": "npo-1"}, donor_id="donor", commit=False
+    )
+
+    other = session_factory()
+    try:
+        assert other.get(Donation, "queued") is None
+        enqueue_donation_submission(
+            db, donation_id=donation.id, from_address="rDonor", to_address="rNPO", amount=5.0
+        )
+        assert other.get(Donation, "queued") is not None
+        assert other.query(Job).count() == 1
+    finally:
+        other.close()
@@ -0,0 +1,90 @@
+import pytest
+from unittest.mock import patch, MagicMock
+
+from app.services import job_service
+from app.workers.donation_submitter import (
+    DONATION_SUBMISSION_QUEUE,
+    enqueue_donation_submission,
+)
+from app.workers.runtime import JobWorker
+
+
+def _enqueue(session_factory, donation_id: int = 1) -> int:
+    db = session_factory()
+    try:
+        job = enqueue_donation_submission(
+            db,
+            donation_id=donation_id,
+            from_address="rDonor",
+            to_address="rNPO",
+            amount=25.0,
+        )
+        return job.id
+    finally:
+        db.close()
+
+
+def test_claim_next_is_exclusive(session_factory):
+    """A queued job is handed to exactly one claimer."""
+    job_id = _enqueue(session_factory)
+
+    first, second = session_factory(), session_factory()
+    try:
+        claimed = job_service.claim_next(first, queue=DONATION_SUBMISSION_QUEUE)
+        assert claimed.id == job_id
+        assert claimed.status == "running"
+        assert claimed.attempts == 1
+        assert job_service.claim_next(second, queue=DONATION_SUBMISSION_QUEUE) is None
+    finally:
+        first.close()
+        second.close()
+
+
+@patch("app.workers.donation_submitter.donation_service")
+@patch("app.workers.donation_submitter.blockchain_service.initiate_xrp_payment")
+@pytest.mark.asyncio
+async def test_worker_records_transaction(mock_payment, mock_donations, session_factory):
+    """The worker submits the payment and stores the tx hash on the donation."""
+    job_id = _enqueue(session_factory, donation_id=7)
+    donation = MagicMock(id=7)
+    mock_donations.get_donation.return_value = donation
+    mock_payment.return_value = {"tx_hash": "HASH7", "status": "complete"}
+
+    worker = JobWorker(queues=[DONATION_SUBMISSION_QUEUE], session_factory=session_factory)
+    assert await worker.run_once()
+    assert not await worker.run_once()
+
+    mock_payment.assert_awaited_once_with(
+        from_address="rDonor", to_address="rNPO", amount=25.0, use_escrow=False
+    )
+    update = mock_donations.update_donation.call_args.kwargs["obj_in"]
+    assert update["tx_hash"] == "HASH7"
+    assert update["status"] == "pending"
+
+    db = session_factory()
+    try:
+        assert job_service.get_job(db, id=job_id).status == "done"
+    finally:
+        db.close()
+
+
+@patch("app.workers.donation_submitter.donation_service")
+@patch("app.workers.donation_submitter.blockchain_service.initiate_xrp_payment")
+@pytest.mark.asyncio
+async def test_worker_marks_failed_submission(mock_payment, mock_donations, session_factory):
+    """A ledger error fails both the job and the donation, without a retry."""
+    job_id = _enqueue(session_factory)
+    mock_donations.get_donation.return_value = MagicMock(id=1)
+    mock_payment.side_effect = Exception("node unavailable")
+
+    worker = JobWorker(queues=[DONATION_SUBMISSION_QUEUE], session_factory=session_factory)
+    assert await worker.run_once()
+
+    assert mock_donations.update_donation.call_args.kwargs["obj_in"] == {"status": "failed"}
+    db = session_factory()
+    try:
+        job = job_service.get_job(db, id=job_id)
+        assert job.status == "failed"
+        assert job.last_error == "node unavailable"
+    finally:
+        db.close()
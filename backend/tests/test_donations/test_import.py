@@ -0,0 +1,77 @@
+import pytest
+from types import SimpleNamespace
+from sqlalchemy import event
+
+from app.api.api_v1.endpoints import donations as donations_endpoint
+from app.models.donation import Donation
+from app.models.npo import NPO
+from app.models.user import User
+from app.services import donation_service
+
+
+@pytest.fixture
+def db(db):
+    db.add_all([
+        NPO(id="npo-1", name="One", total_received=1.0),
+        NPO(id="npo-2", name="Two", total_received=0.0),
+        User(id="u1", email="u1@example.org", hashed_password="x"),
+    ])
+    db.add(Donation(id="old", amount=1.0, npo_id="npo-1", status="completed", tx_hash="SEEN"))
+    db.commit()
+    return db
+
+
+def test_batch_is_inserted_with_per_row_errors(db):
+    """Bad references are reported per row and the rest of the batch lands."""
+    rows = [
+        {"amount": 2.0, "npo_id": "npo-1", "donor_id": "u1", "xrpl_transaction_hash": "A"},
+        {"amount": 3.0, "npo_id": "npo-missing"},
+        {"amount": 4.0, "npo_id": "npo-2", "donor_id": "ghost"},
+        {"amount": 5.0, "npo_id": "npo-2", "xrpl_transaction_hash": "SEEN"},
+        {"amount": 6.0, "npo_id": "npo-2", "xrpl_transaction_hash": "A"},
+        {"amount": 7.0, "npo_id": "npo-2", "status": "pending"},
+        {"amount": 8.0, "npo_id": "npo-2"},
+    ]
+    result = donation_service.import_donations(db, rows=rows)
+
+    assert len(result["ids"]) == 3
+    assert result["errors"] == [
+        {"index": 1, "error": "NPO not found"},
+        {"index": 2, "error": "Donor not found"},
+        {"index": 3, "error": "Duplicate transaction hash"},
+        {"index": 4, "error": "Duplicate transaction hash"},
+    ]
+    db.expunge_all()
+    # Only completed donations are credited to their NPO
+    assert db.get(NPO, "npo-1").total_received == pytest.approx(3.0)
+    assert db.get(NPO, "npo-2").total_received == pytest.approx(8.0)
+    assert db.query(Donation).filter(Donation.status == "pending").count() == 1
+
+
+def test_statement_count_does_not_grow_with_batch(engine, db):
+    """A batch costs a fixed number of statements, whatever its size."""
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    rows = [{"amount": 1.0, "npo_id": f"npo-{1 + i % 2}", "donor_id": "u1"} for i in range(500)]
+    result = donation_service.import_donations(db, rows=rows)
+
+    assert len(result["ids"]) == 500
+    assert len(statements) < 10
+    assert db.query(Donation).count() == 501
+
+
+def test_endpoint_reports_invalid_rows_by_position(db):
+    """Schema errors and reference errors keep the row's position in the batch."""
+    rows = [
+        {"amount": -1, "npo_id": "npo-1"},
+        {"amount": 1.0, "npo_id": "npo-missing"},
+        {"amount": 1.0, "npo_id": "npo-1"},
+    ]
+    result = donations_endpoint.import_donations(
+        rows=rows, db=db, current_user=SimpleNamespace(id="admin")
+    )
+
+    assert result["created"] == 1
+    assert [error["index"] for error in result["errors"]] == [0, 1]
+    assert result["errors"][1]["error"] == "NPO not found"
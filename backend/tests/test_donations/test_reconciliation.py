@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch, MagicMock
+
+from app.models.donation import Donation
+from app.models.npo import NPO
+from app.workers.reconciliation import ReconciliationWorker
+
+
+def _pending(donation_id: int) -> MagicMock:
+    donation = MagicMock()
+    donation.id = donation_id
+    donation.tx_hash = f"HASH{donation_id}"
+    donation.created_at = datetime.utcnow() - timedelta(minutes=donation_id)
+    return donation
+
+
+class TestReconciliationWorker:
+    """Tests for the pending donation reconciliation worker."""
+
+    @patch("app.workers.reconciliation.donation_service.apply_donation_statuses")
+    @patch("app.workers.reconciliation.donation_service.get_pending_donations_page")
+    @pytest.mark.asyncio
+    async def test_run_once(self, mock_page, mock_apply):
+        """Pages are checked concurrently and applied once per page."""
+        donations = [_pending(i) for i in range(1, 6)]
+
+        def page(db, after_id=None, limit=100):
+            remaining = [d for d in donations if after_id is None or d.id > after_id]
+            return remaining[:limit]
+
+        mock_page.side_effect = page
+        mock_apply.side_effect = lambda db, statuses: list(statuses)
+
+        in_flight = 0
+        max_in_flight = 0
+
+        async def check_status(tx_hash: str) -> str:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if tx_hash == "HASH2":
+                return "failed"
+            if tx_hash == "HASH3":
+                return "pending"
+            return "completed"
+
+        worker = ReconciliationWorker(
+            session_factory=MagicMock,
+            check_status=check_status,
+            page_size=2,
+            concurrency=2,
+        )
+        checked = await worker.run_once()
+
+        assert checked == 5
+        assert max_in_flight <= 2
+        # Three pages: [1, 2], [3, 4], [5]
+        assert mock_page.call_count == 3
+        applied = [call.kwargs["statuses"] for call in mock_apply.call_args_list]
+        assert applied == [
+            {1: "completed", 2: "failed"},
+            {4: "completed"},
+            {5: "completed"},
+        ]
+
+        stats = worker.stats.as_dict()
+        assert stats["checked"] == 5
+        assert stats["resolved"] == 4
+        assert stats["pages"] == 3
+        assert stats["lag_seconds"] >= 5 * 60 - 1
+
+    @patch("app.workers.reconciliation.donation_service.apply_donation_statuses")
+    @patch("app.workers.reconciliation.donation_service.get_pending_donations_page")
+    @pytest.mark.asyncio
+    async def test_lookup_errors_leave_donation_pending(self, mock_page, mock_apply):
+        """A failed ledger lookup is counted and does not change the donation."""
+        mock_page.side_effect = [[_pending(1)], []]
+
+        async def check_status(tx_hash: str) -> str:
+            raise ConnectionError("ledger unavailable")
+
+        worker = ReconciliationWorker(session_factory=MagicMock, check_status=check_status)
+        await worker.run_once()
+
+        mock_apply.assert_not_called()
+        assert worker.stats.errors == 1
+        assert worker.stats.resolved == 0
+
+    @pytest.mark.asyncio
+    async def test_run_once_against_database(self, session_factory):
+        """A pass over real rows resolves pending ledger donations and credits the NPO."""
+        db = session_factory()
+        db.add(NPO(id="npo-1", name="NPO", total_received=0.0))
+        db.add_all([
+            Donation(id="d1", amount=2.0, npo_id="npo-1", tx_hash="HASH1"),
+            Donation(id="d2", amount=3.0, npo_id="npo-1", tx_hash="HASH2"),
+            Donation(id="d3", amount=4.0, npo_id="npo-1", tx_hash="HASH3"),
+            Donation(id="d4", amount=5.0, npo_id="npo-1"),
+            Donation(id="d5", amount=6.0, npo_id="npo-1", tx_hash="HASH5", status="completed"),
+        ])
+        db.commit()
+
+        ledger = {"HASH1": "completed", "HASH2": "failed", "HASH3": "pending"}
+
+        async def check_status(tx_hash: str) -> str:
+            return ledger[tx_hash]
+
+        worker = ReconciliationWorker(
+            session_factory=session_factory, check_status=check_status, page_size=2
+        )
+        assert await worker.run_once() == 3
+
+        db.expire_all()
+        statuses = {donation.id: donation.status for donation in db.query(Donation)}
+        assert statuses == {
+            "d1": "completed", "d2": "failed", "d3": "pending", "d4": "pending", "d5": "completed",
+        }
+        assert db.get(NPO, "npo-1").total_received == 2.0
+        assert worker.stats.resolved == 2
+        db.close()
@@ -0,0 +1,171 @@
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+from app.models.campaign import Campaign
+from app.models.counter_shard import CounterShard
+from app.models.donation import Donation
+from app.models.npo import NPO
+from app.services import campaign_service, counter_service, donation_service, npo_service
+
+DONATIONS = 40
+AMOUNT = 2.5
+
+
+@pytest.fixture(autouse=True)
+def sharded_settings():
+    with patch("app.services.counter_service.settings") as mock_settings:
+        mock_settings.SHARDED_COUNTERS_ENABLED = True
+        mock_settings.COUNTER_SHARDS = 8
+        yield mock_settings
+
+
+@pytest.fixture
+def session_factory(session_factory):
+    db = session_factory()
+    db.add(NPO(id="npo-1", name="Viral", total_received=10.0))
+    db.add(NPO(id="npo-2", name="Quiet", total_received=0.0))
+    db.add_all(
+        Donation(id=f"d{i}", amount=AMOUNT, npo_id="npo-1") for i in range(DONATIONS)
+    )
+    db.add(Donation(id="quiet", amount=AMOUNT, npo_id="npo-2"))
+    db.add(Campaign(id=7, title="Viral", goal_amount=1.0, start_date=datetime(2024, 1, 1), npo_id="npo-1"))
+    db.commit()
+    counter_service.enable_sharding(db, campaign=SimpleNamespace(id=7, npo_id="npo-1"))
+    db.close()
+    return session_factory
+
+
+def _complete_all(session_factory):
+    def complete(i):
+        db = session_factory()
+        try:
+            donation_service.process_donation_completion(db, donation_id=f"d{i}")
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        list(pool.map(complete, range(DONATIONS)))
+
+
+def test_sharded_increments_spread_and_sum(session_factory):
+    """Completions land on several shards and reads add them to the row."""
+    _complete_all(session_factory)
+
+    db = session_factory()
+    try:
+        shards = db.query(CounterShard).filter(CounterShard.owner_id == "npo-1").all()
+        assert len(shards) == 8
+        assert sum(1 for shard in shards if shard.value) > 1
+        assert db.get(NPO, "npo-1").total_received == 10.0
+
+        db.expunge_all()
+        total = 10.0 + DONATIONS * AMOUNT
+        assert npo_service.get_npo(db, id="npo-1").received_amount == pytest.approx(total)
+    finally:
+        db.close()
+
+
+def test_repeated_reads_do_not_add_shards_twice(session_factory):
+    """Reading the same rows again in one session shows the same totals."""
+    _complete_all(session_factory)
+
+    db = session_factory()
+    try:
+        total = 10.0 + DONATIONS * AMOUNT
+        first = npo_service.get_npo(db, id="npo-1")
+        again = npo_service.get_npo(db, id="npo-1")
+        assert again is first
+        assert again.received_amount == pytest.approx(total)
+        npos = {npo.id: npo for npo in npo_service.get_npos(db, verified_only=False)}
+        assert npos["npo-1"] is first
+        assert npos["npo-1"].received_amount == pytest.approx(total)
+        assert first.total_received == 10.0
+    finally:
+        db.close()
+
+
+def test_updates_keep_pending_shards(session_factory):
+    """Rows refreshed by an update still show their pending shard values."""
+    db = session_factory()
+    try:
+        for i in range(4):
+            counter_service.add(db, owner_type=counter_service.CAMPAIGN, owner_id=7, amount=AMOUNT, key=i)
+            counter_service.add(db, owner_type=counter_service.NPO_OWNER, owner_id="npo-1", amount=AMOUNT, key=i)
+        db.commit()
+
+        npo = npo_service.update_npo(db, db_obj=npo_service.get_npo(db, id="npo-1"), obj_in={"name": "Renamed"})
+        assert npo.received_amount == pytest.approx(10.0 + 4 * AMOUNT)
+
+        campaign = campaign_service.get_campaign(db, id=7)
+        campaign = campaign_service.update_campaign(db, db_obj=campaign, obj_in={"title": "Renamed campaign"})
+        assert campaign.raised_amount == pytest.approx(4 * AMOUNT)
+        assert campaign_service.get_campaign(db, id=7).raised_amount == pytest.approx(4 * AMOUNT)
+    finally:
+        db.close()
+
+
+def test_compaction_folds_shards(session_factory):
+    """Compaction moves shard values into the row and keeps the total."""
+    _complete_all(session_factory)
+
+    db = session_factory()
+    try:
+        assert counter_service.compact(db) == 1
+        assert counter_service.compact(db) == 0
+
+        db.expunge_all()
+        total = 10.0 + DONATIONS * AMOUNT
+        assert db.get(NPO, "npo-1").total_received == pytest.approx(total)
+        assert all(shard.value == 0 for shard in db.query(CounterShard).all())
+        assert npo_service.get_npo(db, id="npo-1").received_amount == pytest.approx(total)
+    finally:
+        db.close()
+
+
+def test_unsharded_owner_is_updated_in_place(session_factory):
+    """Owners without shard rows keep the single-row increment."""
+    db = session_factory()
+    try:
+        donation_service.process_donation_completion(db, donation_id="quiet")
+        db.expunge_all()
+        assert db.get(NPO, "npo-2").total_received == AMOUNT
+        assert db.query(CounterShard).filter(CounterShard.owner_id == "npo-2").count() == 0
+    finally:
+        db.close()
+
+
+def test_disabling_keeps_increments_landing_meanwhile(session_factory):
+    """Campaign increments racing disable_sharding all end up on the row."""
+    def donate(i):
+        db = session_factory()
+        try:
+            counter_service.add(
+                db, owner_type=counter_service.CAMPAIGN, owner_id=7, amount=AMOUNT, key=i
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def disable():
+        db = session_factory()
+        try:
+            counter_service.disable_sharding(db, campaign=SimpleNamespace(id=7, npo_id="npo-1"))
+        finally:
+            db.close()
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        futures = [pool.submit(donate, i) for i in range(DONATIONS // 2)]
+        futures.append(pool.submit(disable))
+        futures += [pool.submit(donate, i) for i in range(DONATIONS // 2, DONATIONS)]
+        for future in futures:
+            future.result()
+
+    db = session_factory()
+    try:
+        assert db.get(Campaign, 7).current_amount == pytest.approx(DONATIONS * AMOUNT)
+        assert db.query(CounterShard).filter(CounterShard.owner_type == "campaign").count() == 0
+    finally:
+        db.close()
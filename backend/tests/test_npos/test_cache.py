@@ -0,0 +1,137 @@
+import fnmatch
+import pytest
+from datetime import datetime
+from unittest.mock import patch
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from app.core.cache import MemoryCache, RedisCache
+from app.database.base_class import Base
+from app.models.npo import NPO
+from app.services import npo_service
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeRedis:
+    """The slice of the redis-py client used by RedisCache."""
+
+    def __init__(self, clock):
+        self.clock = clock
+        self.data = {}
+
+    def get(self, name):
+        value, expires = self.data.get(name, (None, None))
+        if value is None or expires <= self.clock():
+            return None
+        return value
+
+    def set(self, name, value, ex):
+        self.data[name] = (value.encode(), self.clock() + ex)
+
+    def delete(self, *names):
+        for name in names:
+            self.data.pop(name, None)
+
+    def scan_iter(self, match):
+        return [name for name in list(self.data) if fnmatch.fnmatch(name, match)]
+
+
+def test_memory_cache_expires_and_evicts():
+    """Entries expire after their TTL and the least recently used goes first."""
+    clock = FakeClock()
+    cache = MemoryCache(max_entries=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    clock.now += 11
+    assert cache.get("a") is None
+    assert cache.metrics()["evictions"] == 1
+    assert cache.metrics()["hits"] == 2
+    assert cache.metrics()["misses"] == 2
+
+
+def test_redis_cache_round_trips_rows():
+    """The Redis backend stores JSON, datetimes included, under its prefix."""
+    clock = FakeClock()
+    client = FakeRedis(clock)
+    cache = RedisCache(client, prefix="test:", ttl=5)
+    row = {"id": "npo-1", "total_received": 1.5, "created_at": datetime(2024, 1, 2, 3, 4, 5)}
+
+    cache.set("npos:id:npo-1", row)
+    assert list(client.data) == ["test:npos:id:npo-1"]
+    assert cache.get("npos:id:npo-1") == row
+
+    cache.delete("npos:id:npo-1")
+    assert cache.get("npos:id:npo-1") is None
+    cache.set("npos:id:npo-1", row)
+    clock.now += 6
+    assert cache.get("npos:id:npo-1") is None
+    assert cache.metrics()["hits"] == 1
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_delete_prefix_drops_matching_keys(backend):
+    """Prefix deletes drop every matching key and nothing else."""
+    cache = MemoryCache() if backend == "memory" else RedisCache(FakeRedis(FakeClock()))
+    for key in ("users:token:u1:a", "users:token:u1:b", "users:token:u10:a"):
+        cache.set(key, {"id": key})
+
+    cache.delete_prefix("users:token:u1:")
+    assert cache.get("users:token:u1:a") is None
+    assert cache.get("users:token:u1:b") is None
+    assert cache.get("users:token:u10:a") == {"id": "users:token:u10:a"}
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path}/cache.db")
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    db.add(NPO(id="npo-1", name="Cached", total_received=5.0, created_at=datetime(2024, 1, 1)))
+    db.commit()
+    db.close()
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("backend", ["memory", "redis"])
+def test_npo_reads_through_cache_and_updates_invalidate(engine, backend):
+    """Repeat lookups skip the database; updates are visible right away."""
+    cache = MemoryCache() if backend == "memory" else RedisCache(FakeRedis(FakeClock()))
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    with patch("app.services.entity_cache.cache", cache):
+        db = factory()
+        assert npo_service.get_npo(db, id="npo-1").name == "Cached"
+        assert npo_service.get_npo_by_name(db, name="Cached").id == "npo-1"
+        db.close()
+
+        statements.clear()
+        db = factory()
+        npo = npo_service.get_npo(db, id="npo-1")
+        assert npo_service.get_npo_by_name(db, name="Cached") is npo
+        assert (npo.total_received, npo.created_at) == (5.0, datetime(2024, 1, 1))
+        assert statements == []
+
+        # The cached row is attached to the session and updates as usual
+        npo_service.update_npo(db, db_obj=npo, obj_in={"name": "Renamed"})
+        db.close()
+
+        db = factory()
+        assert npo_service.get_npo(db, id="npo-1").name == "Renamed"
+        assert npo_service.get_npo_by_name(db, name="Cached") is None
+        db.close()
+    assert cache.metrics()["invalidations"] >= 2
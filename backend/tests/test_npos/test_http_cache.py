@@ -0,0 +1,73 @@
+import pytest
+from datetime import datetime
+from fastapi import Response
+from starlette.requests import Request
+
+from app.api import http_cache
+from app.api.api_v1.endpoints import npos as npos_endpoint
+from app.api.pagination import PageParams
+from app.models.npo import NPO
+from app.services import npo_service
+
+
+@pytest.fixture
+def db(db):
+    db.add_all([
+        NPO(id="npo-1", name="One", is_verified=True, total_received=1.0,
+            created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 3, 1, 12, 0, 0, 500)),
+        NPO(id="npo-2", name="Two", is_verified=True, total_received=2.0,
+            created_at=datetime(2024, 2, 1)),
+    ])
+    db.commit()
+    return db
+
+
+def _read_npos(db, **headers):
+    request = Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+    response = Response()
+    page = PageParams(cursor=None, skip=None, limit=100)
+    return npos_endpoint.read_npos(request=request, response=response, db=db, page=page), response
+
+
+def test_listing_sets_validators_and_cache_policy(db):
+    """Public listings carry an ETag and a shared cache policy, and no Last-Modified."""
+    result, response = _read_npos(db)
+
+    assert [npo.id for npo in result] == ["npo-2", "npo-1"]
+    assert response.headers["etag"].startswith('W/"')
+    assert response.headers["cache-control"] == http_cache.PUBLIC_LISTING
+    assert "public" in response.headers["cache-control"]
+    assert "last-modified" not in response.headers
+
+
+def test_if_none_match_returns_304_until_rows_change(db):
+    """A matching ETag gets a 304; any change to a listed row gets a new ETag."""
+    _, response = _read_npos(db)
+    etag = response.headers["etag"]
+
+    result, _ = _read_npos(db, if_none_match=f'"other", {etag}')
+    assert isinstance(result, Response)
+    assert result.status_code == 304
+    assert result.headers["etag"] == etag
+
+    # A new total changes the tag of the page listing the NPO
+    npo_service.update_npo(db, db_obj=db.get(NPO, "npo-2"), obj_in={"total_received": 3.0})
+    result, response = _read_npos(db, if_none_match=etag)
+    assert isinstance(result, list)
+    assert response.headers["etag"] != etag
+
+
+def test_if_modified_since_is_not_a_validator(db):
+    """A deleted row leaves the newest update time as it was, so only the ETag decides."""
+    _, response = _read_npos(db)
+    etag = response.headers["etag"]
+    npo_service.remove_npo(db, id="npo-2")
+
+    result, response = _read_npos(db, if_modified_since="Fri, 01 Mar 2024 13:00:00 GMT")
+    assert [npo.id for npo in result] == ["npo-1"]
+
+    result, _ = _read_npos(db, if_none_match=etag)
+    assert isinstance(result, list)
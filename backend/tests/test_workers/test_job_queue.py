@@ -0,0 +1,201 @@
+import asyncio
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app.services import job_service
+from app.workers.runtime import JobWorker, handlers
+from app.workers.tasks import CAMPAIGN_STATUS_QUEUE, schedule_campaign_status
+
+
+@pytest.fixture
+def handler():
+    calls = []
+
+    def record(db, payload):
+        calls.append(payload)
+        if payload.get("fail"):
+            raise RuntimeError("boom")
+
+    handlers["test"] = record
+    yield calls
+    handlers.pop("test", None)
+
+
+def test_claim_order_follows_priority(db):
+    """Higher priority jobs are claimed first, then older ones."""
+    low = job_service.enqueue(db, queue="test", payload={"n": 1})
+    high = job_service.enqueue(db, queue="test", payload={"n": 2}, priority=10)
+    later = job_service.enqueue(db, queue="test", payload={"n": 3})
+
+    claimed = [job_service.claim_next(db, queue="test").id for _ in range(3)]
+    assert claimed == [high.id, low.id, later.id]
+    assert job_service.claim_next(db, queue="test") is None
+
+
+def test_delayed_job_is_not_claimed_early(db):
+    """A job is invisible until its run_at."""
+    job_service.enqueue(db, queue="test", payload={}, delay=60)
+    assert job_service.claim_next(db, queue="test") is None
+
+
+def test_visibility_timeout_releases_abandoned_job(db):
+    """A running job whose lock expired is handed to another worker."""
+    job = job_service.enqueue(db, queue="test", payload={})
+    claimed = job_service.claim_next(db, queue="test", worker_id="a", visibility_timeout=60)
+    assert job_service.claim_next(db, queue="test", worker_id="b") is None
+
+    claimed.locked_until = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    reclaimed = job_service.claim_next(db, queue="test", worker_id="b")
+    assert reclaimed.id == job.id
+    assert reclaimed.locked_by == "b"
+    assert reclaimed.attempts == 2
+
+
+def test_reclaimed_job_ignores_the_late_worker(db, session_factory):
+    """A worker whose lock lapsed cannot complete, fail or requeue the job."""
+    job_service.enqueue(db, queue="test", payload={})
+    claimed = job_service.claim_next(db, queue="test", worker_id="a", visibility_timeout=60)
+    claimed.locked_until = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    other = session_factory()
+    try:
+        reclaimed = job_service.claim_next(other, queue="test", worker_id="b")
+        assert job_service.complete_job(db, job=claimed, worker_id="a") is None
+        assert job_service.fail_job(db, job=claimed, worker_id="a", error="late") is None
+        assert job_service.retry_job(db, job=claimed, worker_id="a", error="late") is None
+
+        other.refresh(reclaimed)
+        assert (reclaimed.status, reclaimed.locked_by, reclaimed.last_error) == ("running", "b", None)
+        assert job_service.complete_job(other, job=reclaimed, worker_id="b").status == "done"
+    finally:
+        other.close()
+
+
+def test_expired_job_without_attempts_left_is_failed(db):
+    """A job whose last attempt lost its lock is failed instead of run again."""
+    job = job_service.enqueue(db, queue="test", payload={}, max_attempts=1)
+    claimed = job_service.claim_next(db, queue="test", worker_id="a")
+    claimed.locked_until = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    assert job_service.claim_next(db, queue="test", worker_id="b") is None
+    db.refresh(job)
+    assert job.status == "failed"
+    assert job.attempts == 1
+    assert not job_service.has_pending(db, queue="test")
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_keeps_long_job_locked(db, session_factory):
+    """A handler outliving the visibility timeout is not reclaimed mid-run."""
+    reclaimed = []
+
+    async def slow(handler_db, payload):
+        await asyncio.sleep(0.5)
+        other = session_factory()
+        try:
+            reclaimed.append(job_service.claim_next(other, queue="test", worker_id="b"))
+        finally:
+            other.close()
+
+    handlers["test"] = slow
+    try:
+        job = job_service.enqueue(db, queue="test", payload={})
+        worker = JobWorker(queues=["test"], session_factory=session_factory, visibility_timeout=0.3)
+        assert await worker.run_once()
+    finally:
+        handlers.pop("test", None)
+
+    assert reclaimed == [None]
+    db.refresh(job)
+    assert job.status == "done"
+    assert job.attempts == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_then_fails(db, session_factory, handler):
+    """A failing job is requeued with backoff and failed after max_attempts."""
+    job = job_service.enqueue(db, queue="test", payload={"fail": True}, max_attempts=2)
+    worker = JobWorker(queues=["test"], session_factory=session_factory)
+
+    assert await worker.run_once()
+    db.refresh(job)
+    assert job.status == "queued"
+    assert job.last_error == "boom"
+    assert job.run_at > datetime.utcnow()
+
+    # Backoff not elapsed yet
+    assert not await worker.run_once()
+
+    job.run_at = datetime.utcnow()
+    db.commit()
+    assert await worker.run_once()
+    db.refresh(job)
+    assert job.status == "failed"
+    assert job.attempts == 2
+    assert len(handler) == 2
+
+    stats = worker.metrics()["queues"]["test"]
+    assert stats["retried"] == 1
+    assert stats["failed"] == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_completes_job(db, session_factory, handler):
+    """A successful job is marked done and counted."""
+    job = job_service.enqueue(db, queue="test", payload={"n": 1})
+    worker = JobWorker(queues=["test"], session_factory=session_factory)
+
+    assert await worker.run_once()
+    db.refresh(job)
+    assert job.status == "done"
+    assert handler == [{"n": 1}]
+    assert worker.metrics()["queues"]["test"]["processed"] == 1
+
+
+def test_queue_metrics(db):
+    """Metrics report ready depth and lag per queue."""
+    job_service.enqueue(db, queue="test", payload={})
+    job_service.enqueue(db, queue="test", payload={}, delay=60)
+    job_service.enqueue(db, queue="other", payload={})
+    job_service.claim_next(db, queue="other")
+
+    metrics = {entry["queue"]: entry for entry in job_service.get_queue_metrics(db)}
+    assert metrics["test"]["depth"] == 1
+    assert metrics["test"]["queued"] == 2
+    assert metrics["other"]["depth"] == 0
+    assert metrics["other"]["running"] == 1
+
+
+@patch("app.workers.tasks.campaign_service")
+@pytest.mark.asyncio
+async def test_campaign_status_reschedules_itself(mock_campaigns, db, session_factory):
+    """The campaign status job runs the check and queues the next one."""
+    assert schedule_campaign_status(db) is not None
+    assert schedule_campaign_status(db) is None
+
+    worker = JobWorker(queues=[CAMPAIGN_STATUS_QUEUE], session_factory=session_factory)
+    assert await worker.run_once()
+
+    mock_campaigns.check_campaign_status.assert_called_once()
+    assert job_service.has_pending(db, queue=CAMPAIGN_STATUS_QUEUE)
+    assert not await worker.run_once()
+
+
+@patch("app.workers.tasks.campaign_service")
+@pytest.mark.asyncio
+async def test_campaign_status_reschedules_after_failure(mock_campaigns, db, session_factory):
+    """A failed campaign status check is not retried but still queues the next one."""
+    mock_campaigns.check_campaign_status.side_effect = RuntimeError("database is down")
+    first = schedule_campaign_status(db)
+
+    worker = JobWorker(queues=[CAMPAIGN_STATUS_QUEUE], session_factory=session_factory)
+    assert await worker.run_once()
+
+    db.refresh(first)
+    assert first.status == "failed"
+    assert job_service.has_pending(db, queue=CAMPAIGN_STATUS_QUEUE)